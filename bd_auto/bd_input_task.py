@@ -1,46 +1,62 @@
 import sqlite3
 import os
+import db_pool
 from datetime import datetime
 
-def get_db_connection(db_name='sales_data_task.db'):
-    """데이터베이스 연결을 생성하고 커넥션과 커서 객체를 반환합니다."""
-    # 현재 스크립트 파일의 디렉토리를 가져옵니다.
+# 활동 추가/수정/삭제에 사용하는 SQL (벤치마크 등 다른 모듈에서도 재사용합니다)
+INSERT_TASK_SQL = '''
+INSERT INTO tasks (task_date, company_name, contact_person, contact_email, contact_phone, task_description, current_status, due_date, assignee)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+UPDATE_TASK_SQL = '''
+UPDATE tasks SET
+    task_date = ?, company_name = ?, contact_person = ?,
+    contact_email = ?, contact_phone = ?, task_description = ?,
+    current_status = ?, due_date = ?, assignee = ?,
+    updated_at = ?
+WHERE id = ?
+'''
+DELETE_TASK_SQL = "DELETE FROM tasks WHERE id = ?"
+# setup_database가 만드는 스키마 버전 (PRAGMA user_version에 기록). 스키마를 바꾸면 올립니다.
+SCHEMA_VERSION = 1
+
+def db_connection(db_name='sales_data_task.db'):
+    """스크립트 폴더 기준 경로의 공유 커넥션 풀에서 커넥션을 빌려주는 컨텍스트 매니저를 반환합니다."""
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    db_path = os.path.join(current_dir, db_name)
-    conn = sqlite3.connect(db_path)
-    # 딕셔너리 형태로 결과를 받기 위해 row_factory 설정
-    conn.row_factory = sqlite3.Row 
-    cursor = conn.cursor()
-    return conn, cursor
-
-def setup_database():
-    """'tasks' 테이블을 생성합니다. current_status의 기본값을 'To Do'로 변경합니다."""
+    return db_pool.db_connection(os.path.join(current_dir, db_name))
+
+def setup_database(db_name='sales_data_task.db'):
+    """'tasks' 테이블을 생성합니다. current_status의 기본값을 'To Do'로 변경합니다. (이미 최신이면 바로 돌아갑니다)"""
     try:
-        conn, cursor = get_db_connection()
-        # 'IF NOT EXISTS'를 추가하여 테이블이 이미 있을 경우 오류를 방지합니다.
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            task_date TEXT NOT NULL,
-            company_name TEXT NOT NULL,
-            contact_person TEXT NOT NULL,
-            contact_email TEXT,
-            contact_phone TEXT,
-            task_description TEXT NOT NULL,
-            current_status TEXT NOT NULL DEFAULT 'To Do',
-            due_date TEXT,
-            assignee TEXT NOT NULL,
-            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        conn.commit()
-        print("데이터베이스와 테이블이 준비되었습니다.")
+        with db_connection(db_name) as conn:
+            cursor = conn.cursor()
+            if cursor.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                return
+            # 'IF NOT EXISTS'를 추가하여 테이블이 이미 있을 경우 오류를 방지합니다.
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_date TEXT NOT NULL,
+                company_name TEXT NOT NULL,
+                contact_person TEXT NOT NULL,
+                contact_email TEXT,
+                contact_phone TEXT,
+                task_description TEXT NOT NULL,
+                current_status TEXT NOT NULL DEFAULT 'To Do',
+                due_date TEXT,
+                assignee TEXT NOT NULL,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            # 최신순 목록(keyset 페이지네이션)과 담당자별 목록을 위한 인덱스
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created_at_id ON tasks (created_at, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_assignee_created_at ON tasks (assignee, created_at, id)")
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+            print("데이터베이스와 테이블이 준비되었습니다.")
     except sqlite3.Error as e:
         print(f"데이터베이스 오류: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 def get_user_input(prompt_text, default_value="", required=True):
     """사용자로부터 입력을 받고, 필수 값인 경우 비어있지 않은지 확인합니다."""
@@ -89,48 +105,128 @@ def insert_task():
     assignee = get_user_input("담당 직원 (필수)")
 
     try:
-        conn, cursor = get_db_connection()
-        sql = '''
-        INSERT INTO tasks (task_date, company_name, contact_person, contact_email, contact_phone, task_description, current_status, due_date, assignee)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        '''
-        task_data = (task_date, company_name, contact_person, contact_email, contact_phone, task_description, current_status, due_date, assignee)
-        cursor.execute(sql, task_data)
-        conn.commit()
-        print("\n✅ 데이터가 성공적으로 추가되었습니다!")
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            task_data = (task_date, company_name, contact_person, contact_email, contact_phone, task_description, current_status, due_date, assignee)
+            cursor.execute(INSERT_TASK_SQL, task_data)
+            conn.commit()
+            print("\n✅ 데이터가 성공적으로 추가되었습니다!")
     except sqlite3.Error as e:
         print(f"\n❌ 데이터 삽입 중 오류 발생: {e}")
-    finally:
-        if conn:
-            conn.close()
+
+TASKS_PAGE_SIZE = 10
+
+def _task_filter_clause(status=None, assignee=None, due_from=None, due_to=None):
+    """필터 조건을 SQL WHERE 절 조각과 파라미터 목록으로 변환합니다."""
+    clauses, params = [], []
+    if status:
+        clauses.append("current_status = ?")
+        params.append(status)
+    if assignee:
+        clauses.append("assignee = ?")
+        params.append(assignee)
+    if due_from or due_to:
+        # 마감일이 비어 있는('') 활동은 마감일 범위 검색에서 제외합니다.
+        clauses.append("due_date IS NOT NULL AND due_date != ''")
+    if due_from:
+        clauses.append("due_date >= ?")
+        params.append(due_from)
+    if due_to:
+        clauses.append("due_date <= ?")
+        params.append(due_to)
+    return clauses, params
+
+def fetch_task_page(page_size=TASKS_PAGE_SIZE, after=None, before=None, db_name='sales_data_task.db', **filters):
+    """
+    최신순(created_at, id 내림차순)으로 한 페이지의 활동을 조회합니다.
+    - after: 이 (created_at, id)보다 오래된 행부터 조회합니다 (다음 페이지).
+    - before: 이 (created_at, id)보다 최신인 행을 조회합니다 (이전 페이지).
+    - db_name: 스크립트 폴더 기준 데이터베이스 파일 (절대 경로도 가능)
+    - filters: status, assignee, due_from, due_to (SQL WHERE 절로 처리)
+    OFFSET 없이 마지막으로 본 키를 기준으로 조회하므로 몇 번째 페이지든 비용이 같습니다.
+    """
+    clauses, params = _task_filter_clause(**filters)
+    order = "DESC"
+    if after is not None:
+        clauses.append("(created_at, id) < (?, ?)")
+        params.extend(after)
+    elif before is not None:
+        clauses.append("(created_at, id) > (?, ?)")
+        params.extend(before)
+        order = "ASC"
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT * FROM tasks {where} ORDER BY created_at {order}, id {order} LIMIT ?"
+
+    with db_connection(db_name) as conn:
+        rows = conn.execute(sql, params + [page_size]).fetchall()
+    # 이전 페이지는 오름차순으로 가져왔으므로 다시 최신순으로 뒤집습니다.
+    return rows[::-1] if order == "ASC" else rows
+
+def iter_tasks(page_size=100, **filters):
+    """조건에 맞는 활동을 최신순으로 한 행씩 돌려주는 제너레이터입니다. 메모리에는 한 페이지만 유지합니다."""
+    after = None
+    while True:
+        rows = fetch_task_page(page_size=page_size, after=after, **filters)
+        yield from rows
+        if len(rows) < page_size:
+            return
+        after = (rows[-1]['created_at'], rows[-1]['id'])
+
+def print_task(task):
+    """활동 한 건을 출력합니다."""
+    print("-" * 20)
+    print(f"ID: {task['id']}")
+    print(f"  - 날짜: {task['task_date']}, 마감일: {task['due_date'] or 'N/A'}")
+    print(f"  - 회사: {task['company_name']} ({task['contact_person']})")
+    print(f"  - 연락처: {task['contact_phone'] or 'N/A'}, 이메일: {task['contact_email'] or 'N/A'}")
+    print(f"  - 내용: {task['task_description']}")
+    print(f"  - 상태: {task['current_status']}, 담당: {task['assignee']}")
+    print(f"  - 생성: {task['created_at']}, 최종 수정: {task['updated_at']}")
 
 def view_tasks():
-    """'tasks' 테이블의 모든 레코드를 조회하여 출력합니다."""
+    """조건에 맞는 활동을 한 페이지씩 조회하여 출력합니다. (n: 다음, p: 이전, q: 종료)"""
     print("\n=== [2] 전체 영업 활동 조회 ===")
+    print("검색 조건을 입력하세요. (없으면 Enter)")
+    filters = {
+        'status': get_user_input("진행 상태", default_value="", required=False).title(),
+        'assignee': get_user_input("담당 직원", default_value="", required=False),
+        'due_from': get_user_input("마감일 시작 (YYYY-MM-DD)", default_value="", required=False),
+        'due_to': get_user_input("마감일 끝 (YYYY-MM-DD)", default_value="", required=False),
+    }
+
     try:
-        conn, cursor = get_db_connection()
-        cursor.execute("SELECT * FROM tasks ORDER BY created_at DESC")
-        tasks = cursor.fetchall()
+        page_no = 1
+        tasks = fetch_task_page(**filters)
         if not tasks:
             print("조회할 데이터가 없습니다.")
             return
-        
-        for task in tasks:
+
+        while True:
+            print(f"\n[{page_no} 페이지]")
+            for task in tasks:
+                print_task(task)
             print("-" * 20)
-            print(f"ID: {task['id']}")
-            print(f"  - 날짜: {task['task_date']}, 마감일: {task['due_date'] or 'N/A'}")
-            print(f"  - 회사: {task['company_name']} ({task['contact_person']})")
-            print(f"  - 연락처: {task['contact_phone'] or 'N/A'}, 이메일: {task['contact_email'] or 'N/A'}")
-            print(f"  - 내용: {task['task_description']}")
-            print(f"  - 상태: {task['current_status']}, 담당: {task['assignee']}")
-            print(f"  - 생성: {task['created_at']}, 최종 수정: {task['updated_at']}")
-        print("-" * 20)
+
+            choice = input("n: 다음 페이지, p: 이전 페이지, q: 종료: ").strip().lower()
+            if choice == 'n':
+                next_tasks = fetch_task_page(after=(tasks[-1]['created_at'], tasks[-1]['id']), **filters)
+                if not next_tasks:
+                    print("마지막 페이지입니다.")
+                    continue
+                tasks, page_no = next_tasks, page_no + 1
+            elif choice == 'p':
+                if page_no == 1:
+                    print("첫 페이지입니다.")
+                    continue
+                tasks = fetch_task_page(before=(tasks[0]['created_at'], tasks[0]['id']), **filters)
+                page_no -= 1
+            elif choice == 'q':
+                return
+            else:
+                print("n, p, q 중 하나를 입력하세요.")
 
     except sqlite3.Error as e:
         print(f"\n❌ 데이터 조회 중 오류 발생: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 def update_task():
     """기존 레코드를 ID로 찾아 모든 필드를 수정합니다. `updated_at`을 여기서 갱신합니다."""
@@ -141,49 +237,39 @@ def update_task():
         return
 
     try:
-        conn, cursor = get_db_connection()
-        cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
-        task = cursor.fetchone()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
+            task = cursor.fetchone()
 
-        if not task:
-            print(f"ID {task_id}에 해당하는 활동을 찾을 수 없습니다.")
-            return
+            if not task:
+                print(f"ID {task_id}에 해당하는 활동을 찾을 수 없습니다.")
+                return
 
-        print("\n--- 기존 데이터를 불러왔습니다. 수정할 내용을 입력하세요. (변경 없으면 Enter) ---")
-        task_date = get_user_input("날짜", default_value=task['task_date'])
-        company_name = get_user_input("회사명", default_value=task['company_name'])
-        contact_person = get_user_input("담당자", default_value=task['contact_person'])
-        contact_email = get_user_input("이메일", default_value=task['contact_email'], required=False)
-        contact_phone = get_user_input("연락처", default_value=task['contact_phone'], required=False)
-        task_description = get_user_input("주요 내용", default_value=task['task_description'])
-        current_status = get_status_input(default_value=task['current_status'])
-        due_date = get_user_input("마감일 (YYYY-MM-DD)", default_value=task['due_date'], required=False)
-        assignee = get_user_input("담당 직원", default_value=task['assignee'])
+            print("\n--- 기존 데이터를 불러왔습니다. 수정할 내용을 입력하세요. (변경 없으면 Enter) ---")
+            task_date = get_user_input("날짜", default_value=task['task_date'])
+            company_name = get_user_input("회사명", default_value=task['company_name'])
+            contact_person = get_user_input("담당자", default_value=task['contact_person'])
+            contact_email = get_user_input("이메일", default_value=task['contact_email'], required=False)
+            contact_phone = get_user_input("연락처", default_value=task['contact_phone'], required=False)
+            task_description = get_user_input("주요 내용", default_value=task['task_description'])
+            current_status = get_status_input(default_value=task['current_status'])
+            due_date = get_user_input("마감일 (YYYY-MM-DD)", default_value=task['due_date'], required=False)
+            assignee = get_user_input("담당 직원", default_value=task['assignee'])
         
-        # 여기서 updated_at 값을 직접 설정합니다.
-        updated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-        sql = '''
-        UPDATE tasks SET
-            task_date = ?, company_name = ?, contact_person = ?,
-            contact_email = ?, contact_phone = ?, task_description = ?,
-            current_status = ?, due_date = ?, assignee = ?,
-            updated_at = ?
-        WHERE id = ?
-        '''
-        update_data = (
-            task_date, company_name, contact_person, contact_email, contact_phone, 
-            task_description, current_status, due_date, assignee, updated_at, task_id
-        )
-        cursor.execute(sql, update_data)
-        conn.commit()
-        print(f"\n✅ ID {task_id} 활동이 성공적으로 수정되었습니다!")
+            # 여기서 updated_at 값을 직접 설정합니다.
+            updated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+            update_data = (
+                task_date, company_name, contact_person, contact_email, contact_phone, 
+                task_description, current_status, due_date, assignee, updated_at, task_id
+            )
+            cursor.execute(UPDATE_TASK_SQL, update_data)
+            conn.commit()
+            print(f"\n✅ ID {task_id} 활동이 성공적으로 수정되었습니다!")
 
     except sqlite3.Error as e:
         print(f"\n❌ 데이터 수정 중 오류 발생: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 def delete_task():
     """기존 레코드를 ID로 찾아 삭제합니다."""
@@ -194,29 +280,27 @@ def delete_task():
         return
 
     try:
-        conn, cursor = get_db_connection()
-        # 삭제 전에 해당 데이터가 있는지 확인합니다.
-        cursor.execute("SELECT id, company_name FROM tasks WHERE id = ?", (task_id,))
-        task = cursor.fetchone()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            # 삭제 전에 해당 데이터가 있는지 확인합니다.
+            cursor.execute("SELECT id, company_name FROM tasks WHERE id = ?", (task_id,))
+            task = cursor.fetchone()
 
-        if not task:
-            print(f"ID {task_id}에 해당하는 활동을 찾을 수 없습니다.")
-            return
+            if not task:
+                print(f"ID {task_id}에 해당하는 활동을 찾을 수 없습니다.")
+                return
 
-        # 사용자에게 정말 삭제할 것인지 다시 한번 확인합니다.
-        confirm = input(f"ID {task['id']} ({task['company_name']}) 활동을 정말로 삭제하시겠습니까? (y/n): ").strip().lower()
-        if confirm == 'y':
-            cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-            conn.commit()
-            print(f"\n✅ ID {task_id} 활동이 성공적으로 삭제되었습니다!")
-        else:
-            print("삭제를 취소했습니다.")
+            # 사용자에게 정말 삭제할 것인지 다시 한번 확인합니다.
+            confirm = input(f"ID {task['id']} ({task['company_name']}) 활동을 정말로 삭제하시겠습니까? (y/n): ").strip().lower()
+            if confirm == 'y':
+                cursor.execute(DELETE_TASK_SQL, (task_id,))
+                conn.commit()
+                print(f"\n✅ ID {task_id} 활동이 성공적으로 삭제되었습니다!")
+            else:
+                print("삭제를 취소했습니다.")
 
     except sqlite3.Error as e:
         print(f"\n❌ 데이터 삭제 중 오류 발생: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 
 # 메인 실행 블록
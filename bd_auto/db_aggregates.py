@@ -0,0 +1,149 @@
+import sqlite3
+import os
+import time
+import random
+import tempfile
+import argparse
+from db_setup import db_connection, setup_database
+from db_migrations import TASK_AGGREGATES, aggregate_rebuild_statements, aggregate_keys
+
+BENCHMARK_STATUSES = ['To Do', 'In Progress', 'Done', 'Pending']
+BENCHMARK_ASSIGNEES = ['김민수', '이서연', '박지훈', '최유진', '정하늘']
+AGGREGATE_TRIGGERS = ['tasks_agg_ai', 'tasks_agg_ad', 'tasks_agg_au']
+
+def rebuild_aggregates(db_name='sales_mobi_2025.db'):
+    """트리거를 거치지 않은 변경(직접 수정, 트리거 추가 전 데이터 등)으로 어긋난 집계 테이블을 다시 계산합니다."""
+    started = time.perf_counter()
+    with db_connection(db_name) as conn:
+        try:
+            conn.execute("BEGIN")
+            for sql in aggregate_rebuild_statements():
+                conn.execute(sql)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+    return time.perf_counter() - started
+
+def check_aggregates(db_name='sales_mobi_2025.db'):
+    """
+    집계 테이블을 tasks의 GROUP BY 결과와 비교해 어긋난 항목을 반환합니다.
+    각 항목: (집계 테이블, 키 튜플, 집계 테이블의 값, 실제 값)
+    """
+    drift = []
+    with db_connection(db_name) as conn:
+        for table in TASK_AGGREGATES:
+            keys = aggregate_keys(table, 'tasks')
+            columns = ", ".join(c for c, _ in keys)
+            group_by = ", ".join(str(i) for i in range(1, len(keys) + 1))
+            stored = {tuple(row[:-1]): row[-1] for row in
+                      conn.execute(f"SELECT {columns}, task_count FROM {table}")}
+            actual = {tuple(row[:-1]): row[-1] for row in
+                      conn.execute(f"SELECT {', '.join(e for _, e in keys)}, COUNT(*) FROM tasks GROUP BY {group_by}")}
+            for key in sorted(stored.keys() | actual.keys(), key=repr):
+                if stored.get(key, 0) != actual.get(key, 0):
+                    drift.append((table, key, stored.get(key, 0), actual.get(key, 0)))
+    return drift
+
+# --- 벤치마크: 트리거가 쓰기 한 건당 더하는 비용 ---
+def _random_task(rng, i):
+    return (f"벤치 업무 {i}", rng.choice(BENCHMARK_STATUSES),
+            f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", rng.choice(BENCHMARK_ASSIGNEES))
+
+def _benchmark_writes(db_name, n_writes, base_rows, seed):
+    """
+    base_rows건을 채운 뒤 추가/상태 변경/삭제를 n_writes건씩 실행하고 작업별 건당 평균 시간(마이크로초)을 반환합니다.
+    fsync 비용이 트리거 비용을 가리지 않도록 작업마다 한 트랜잭션으로 측정합니다.
+    """
+    rng = random.Random(seed)
+    insert_sql = ("INSERT INTO tasks (task_date, task_description, current_status, due_date, assignee) "
+                  "VALUES ('2025-01-01', ?, ?, ?, ?)")
+    results = {}
+    with db_connection(db_name) as conn:
+        conn.executemany(insert_sql, (_random_task(rng, i) for i in range(base_rows)))
+        conn.commit()
+
+        def timed(name, sql, params):
+            started = time.perf_counter()
+            for p in params:
+                conn.execute(sql, p)
+            conn.commit()
+            results[name] = (time.perf_counter() - started) / len(params) * 1e6
+
+        timed('insert', insert_sql, [_random_task(rng, base_rows + i) for i in range(n_writes)])
+        ids = [row[0] for row in conn.execute("SELECT id FROM tasks")]
+        timed('update_status', "UPDATE tasks SET current_status = ? WHERE id = ?",
+              [(rng.choice(BENCHMARK_STATUSES), task_id) for task_id in rng.sample(ids, n_writes)])
+        timed('delete', "DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in rng.sample(ids, n_writes)])
+    return results
+
+def benchmark_write_cost(n_writes=2000, base_rows=100000, seed=42, work_dir=None, verbose=True):
+    """
+    집계 트리거가 있는 DB와 트리거를 뺀 DB에서 같은 쓰기 작업을 실행해 건당 추가 비용을 비교하고,
+    대시보드 조회(집계 테이블 vs GROUP BY)의 시간도 함께 측정합니다.
+    """
+    work_dir = work_dir or tempfile.mkdtemp(prefix='bench_aggregates_')
+    report = {}
+    for label, keep_triggers in (('with_triggers', True), ('without_triggers', False)):
+        db_name = os.path.join(work_dir, f"{label}.db")
+        if os.path.exists(db_name):
+            os.remove(db_name)
+        setup_database(db_name=db_name)
+        if not keep_triggers:
+            with db_connection(db_name) as conn:
+                for trigger in AGGREGATE_TRIGGERS:
+                    conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                conn.commit()
+        report[label] = _benchmark_writes(db_name, n_writes, base_rows, seed)
+
+    # 조회 비용: 같은 업무 데이터에서 상태×담당자 집계를 집계 테이블과 GROUP BY로 비교
+    db_name = os.path.join(work_dir, "with_triggers.db")
+    with db_connection(db_name) as conn:
+        def read_cost(sql, repeat=20):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(sql).fetchall()
+            return (time.perf_counter() - started) / repeat * 1e6
+        report['read_us'] = {
+            'aggregate_table': read_cost("SELECT current_status, assignee, task_count FROM task_counts_by_status_assignee"),
+            'group_by': read_cost("SELECT current_status, assignee, COUNT(*) FROM tasks GROUP BY 1, 2"),
+        }
+
+    if verbose:
+        print(f"\n=== 집계 트리거 쓰기 비용 (기존 업무 {base_rows}건, 작업별 {n_writes}건, 건당 마이크로초) ===")
+        print(f"{'작업':<15}{'트리거 없음':>14}{'트리거 있음':>14}{'추가 비용':>12}")
+        for op in report['with_triggers']:
+            without, with_ = report['without_triggers'][op], report['with_triggers'][op]
+            print(f"{op:<15}{without:>14.1f}{with_:>14.1f}{with_ - without:>+12.1f}")
+        print(f"대시보드 조회: 집계 테이블 {report['read_us']['aggregate_table']:.1f}µs, "
+              f"GROUP BY {report['read_us']['group_by']:.1f}µs")
+    return report
+
+
+# --- CLI 실행 블록 ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="업무 집계 테이블 재계산/검증 및 쓰기 비용 벤치마크")
+    parser.add_argument('--db', default='sales_mobi_2025.db', help="대상 데이터베이스 파일")
+    parser.add_argument('--rebuild', action='store_true', help="집계 테이블을 tasks 기준으로 다시 계산")
+    parser.add_argument('--check', action='store_true', help="집계 테이블과 실제 값이 어긋난 항목 출력")
+    parser.add_argument('--benchmark', type=int, metavar='N', help="임시 DB에서 작업별 N건으로 트리거 쓰기 비용 측정")
+    parser.add_argument('--base-rows', type=int, default=100000, help="벤치마크 전에 채울 업무 수")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark_write_cost(args.benchmark, base_rows=args.base_rows)
+        return 0
+
+    setup_database(db_name=args.db)
+    if args.check or not args.rebuild:
+        drift = check_aggregates(args.db)
+        for table, key, stored, actual in drift:
+            print(f"  {table} {key}: 집계 {stored} / 실제 {actual}")
+        print(f"어긋난 집계 항목: {len(drift)}개")
+    if args.rebuild:
+        elapsed = rebuild_aggregates(args.db)
+        print(f"✅ 집계 테이블을 다시 계산했습니다. ({elapsed:.3f}초)")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
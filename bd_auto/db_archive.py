@@ -0,0 +1,313 @@
+import sqlite3
+import os
+import re
+import time
+import argparse
+import statistics
+from contextlib import contextmanager
+from db_setup import db_connection, setup_database
+from db_migrations import CDC_TABLES
+from db_manager import DONE_STATUS, query_tasks
+
+# 완료(Done) 후 이 일수가 지난 업무를 보관 DB로 옮깁니다.
+# (updated_at 기준. 스키마 v9부터 트리거가 상태 변경 시각을 기록하며, 그 전에 완료된 업무는 등록 시각 기준입니다)
+DEFAULT_OLDER_THAN_DAYS = 180
+# 한 트랜잭션에서 옮길 업무 수. 배치 사이에는 잠금이 풀리므로 대화형 쓰기 작업이 끼어들 수 있습니다.
+DEFAULT_BATCH_SIZE = 500
+# PRAGMA incremental_vacuum 한 번에 돌려줄 최대 페이지 수
+DEFAULT_VACUUM_PAGES = 1000
+# 이번 배치 업무와 그 업무들의 프로젝트
+_BATCH_TASKS = "SELECT id FROM temp.archive_batch"
+_BATCH_PROJECTS = f"SELECT project_id FROM main.tasks WHERE id IN ({_BATCH_TASKS})"
+# 업무와 함께 보관 DB로 복사하는 참조 행: 테이블 -> 복사할 행 ID를 고르는 서브쿼리 (외래 키 순서대로)
+RELATED_TABLES = {
+    'categories': f"SELECT category_id FROM main.tasks WHERE id IN ({_BATCH_TASKS})",
+    'projects': _BATCH_PROJECTS,
+    'contacts': f"""SELECT contact_id FROM main.tasks WHERE id IN ({_BATCH_TASKS})
+                    UNION SELECT contact_id FROM main.project_participants WHERE project_id IN ({_BATCH_PROJECTS})""",
+    'technologies': f"SELECT technology_id FROM main.project_technologies WHERE project_id IN ({_BATCH_PROJECTS})",
+}
+# 프로젝트와 함께 복사하는 연결 행 (프로젝트 단위로 운영 DB의 현재 목록으로 바꿉니다)
+LINK_TABLES = ['project_participants', 'project_technologies']
+# 보관 DB에서 UNIQUE 제약을 없애는 컬럼: 테이블 -> 컬럼
+# 운영 DB에서 프로젝트 이름을 바꾸고 옛 이름으로 새 프로젝트를 만들면, 보관 DB에는 옛 이름의 행이 남아 있어
+# 새 프로젝트를 복사할 때 UNIQUE 제약에 걸립니다. 보관 DB는 과거 기록이므로 중복을 허용하고, id로만 구분합니다.
+ARCHIVE_RELAXED_UNIQUE = {'contacts': 'email', 'categories': 'name', 'projects': 'name',
+                          'technologies': 'normalized_name'}
+# 보관 전후로 응답 시간을 재는 대표 쿼리 (설명, SQL)
+LATENCY_QUERIES = [
+    ("상태별 업무 목록", "SELECT * FROM tasks WHERE current_status = 'To Do' ORDER BY due_date LIMIT 50"),
+    ("담당자별 미완료 업무 수", "SELECT assignee, COUNT(*) FROM tasks WHERE current_status != 'Done' GROUP BY assignee"),
+    ("업무 내용 LIKE 검색(전체 스캔)", "SELECT COUNT(*) FROM tasks WHERE task_description LIKE '%계약%'"),
+]
+
+
+def default_archive_name(db_name):
+    """sales_mobi_2025.db -> sales_mobi_2025_archive.db"""
+    root, ext = os.path.splitext(db_name)
+    return f"{root}_archive{ext or '.db'}"
+
+def prepare_archive_database(archive_name):
+    """
+    보관 DB를 운영 DB와 같은 스키마로 준비합니다. (검색 색인, 집계 테이블 포함)
+    보관 DB는 동기화 대상이 아니므로 변경 기록(CDC) 트리거는 지웁니다.
+    """
+    setup_database(db_name=archive_name)
+    with db_connection(archive_name) as conn:
+        for table in CDC_TABLES:
+            for op in ('i', 'u', 'd'):
+                conn.execute(f"DROP TRIGGER IF EXISTS {table}_cdc_{op}")
+        conn.commit()
+    conn = _connect(archive_name)
+    try:
+        # 테이블을 다시 만드는 동안 DROP TABLE이 ON DELETE 동작(SET NULL/CASCADE)을 일으키지 않도록 끕니다.
+        conn.execute("PRAGMA foreign_keys = OFF")
+        for table, column in ARCHIVE_RELAXED_UNIQUE.items():
+            _drop_unique_constraint(conn, table, column)
+    finally:
+        conn.close()
+
+def _drop_unique_constraint(conn, table, column):
+    """
+    table.column의 UNIQUE 제약을 없앤 테이블로 다시 만듭니다. (SQLite는 ALTER TABLE로 제약을 지울 수 없음)
+    이미 없으면 아무것도 하지 않습니다. 테이블에 딸린 인덱스와 트리거(검색 색인 등)는 다시 만듭니다.
+    """
+    table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()[0]
+    pattern = re.compile(rf"(\b{column}\s+TEXT\b[^,]*?)\s+UNIQUE\b", re.IGNORECASE)
+    if not pattern.search(table_sql):
+        return
+    rebuilt = f"{table}_rebuild"
+    new_sql = re.sub(rf"\b{table}\b", rebuilt, pattern.sub(r"\1", table_sql), count=1)
+    dependents = [row[0] for row in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (table,))]
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(new_sql)
+        conn.execute(f"INSERT INTO {rebuilt} SELECT * FROM {table}")
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {rebuilt} RENAME TO {table}")
+        for sql in dependents:
+            conn.execute(sql)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+def _connect(db_name):
+    """보관 작업 전용 커넥션입니다. ATTACH/PRAGMA를 바꾸므로 공유 커넥션 풀과 섞지 않습니다."""
+    conn = sqlite3.connect(db_name, timeout=30.0)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+def _columns(conn, schema, table):
+    return [row['name'] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+# --- 보관(아카이브) ---
+def _archive_batch(conn, cutoff_days, batch_size):
+    """한 배치를 한 트랜잭션으로 옮기고 옮긴 업무 수를 반환합니다."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM temp.archive_batch")
+        conn.execute(f"""INSERT INTO temp.archive_batch (id)
+                         SELECT id FROM main.tasks
+                         WHERE current_status = ? AND updated_at < datetime('now', ?)
+                         ORDER BY id LIMIT ?""", (DONE_STATUS, f"-{int(cutoff_days)} days", batch_size))
+        count = conn.execute("SELECT COUNT(*) FROM temp.archive_batch").fetchone()[0]
+        if count:
+            # 보관된 업무가 보관 DB 안에서도 연락처/프로젝트/카테고리(프로젝트의 참가자와 기술 포함)를
+            # 참조할 수 있도록 참조 행을 먼저 복사합니다. (운영 DB의 참조 행은 다른 업무가 쓰고 있을 수 있으므로 지우지 않습니다)
+            # REPLACE는 기존 행을 지우면서 이미 보관된 업무의 외래 키를 NULL로 만들므로 UPSERT로 갱신합니다.
+            for table, ids in RELATED_TABLES.items():
+                columns = _columns(conn, 'main', table)
+                updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != 'id')
+                conn.execute(f"""INSERT INTO archive.{table} ({", ".join(columns)})
+                                 SELECT {", ".join(columns)} FROM main.{table} WHERE id IN ({ids})
+                                 ON CONFLICT (id) DO UPDATE SET {updates}""")
+            for table in LINK_TABLES:
+                conn.execute(f"DELETE FROM archive.{table} WHERE project_id IN ({_BATCH_PROJECTS})")
+                conn.execute(f"""INSERT INTO archive.{table}
+                                 SELECT * FROM main.{table} WHERE project_id IN ({_BATCH_PROJECTS})""")
+            columns = ", ".join(_columns(conn, 'main', 'tasks'))
+            conn.execute(f"""INSERT OR REPLACE INTO archive.tasks ({columns})
+                             SELECT {columns} FROM main.tasks WHERE id IN (SELECT id FROM temp.archive_batch)""")
+            conn.execute("DELETE FROM main.tasks WHERE id IN (SELECT id FROM temp.archive_batch)")
+        conn.commit()
+        return count
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+def archive_done_tasks(db_name='sales_mobi_2025.db', archive_name=None, older_than_days=DEFAULT_OLDER_THAN_DAYS,
+                       batch_size=DEFAULT_BATCH_SIZE, pause=0.0, max_batches=None):
+    """
+    완료 후 older_than_days일이 지난 업무를 참조 행(연락처/프로젝트/카테고리, 프로젝트 참가자/기술)과 함께 보관 DB로 옮깁니다.
+    - batch_size건씩 각각 한 트랜잭션(보관 DB 입력 + 운영 DB 삭제)으로 처리하고, 배치 사이에 pause초 쉽니다.
+    - 운영 DB의 삭제는 트리거를 거치므로 검색 색인, 집계 테이블, 변경 기록도 함께 갱신됩니다.
+    결과 통계 딕셔너리를 반환합니다.
+    """
+    archive_name = archive_name or default_archive_name(db_name)
+    prepare_archive_database(archive_name)
+    stats = {'archive': archive_name, 'moved': 0, 'batches': 0, 'max_batch_ms': 0.0}
+    started = time.perf_counter()
+    conn = _connect(db_name)
+    try:
+        conn.execute("ATTACH DATABASE ? AS archive", (archive_name,))
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+        while max_batches is None or stats['batches'] < max_batches:
+            batch_started = time.perf_counter()
+            moved = _archive_batch(conn, older_than_days, batch_size)
+            if not moved:
+                break
+            stats['moved'] += moved
+            stats['batches'] += 1
+            stats['max_batch_ms'] = max(stats['max_batch_ms'], (time.perf_counter() - batch_started) * 1000)
+            if pause:
+                time.sleep(pause)
+        if stats['moved']:
+            # 외부 콘텐츠 FTS 색인은 삭제를 별도 기록으로 쌓아 두므로, 세그먼트를 합쳐 실제로 지워야 빈 페이지가 생깁니다.
+            conn.execute("INSERT INTO main.tasks_fts (tasks_fts) VALUES ('optimize')")
+            conn.commit()
+    finally:
+        conn.close()
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
+
+
+# --- 공간 회수 (incremental vacuum) ---
+def enable_incremental_vacuum(db_name='sales_mobi_2025.db'):
+    """
+    auto_vacuum을 INCREMENTAL로 바꿉니다. 이미 만들어진 DB는 한 번 VACUUM으로 파일 전체를 다시 써야 적용됩니다.
+    바꿨으면 True, 이미 INCREMENTAL이면 False를 반환합니다.
+    """
+    conn = _connect(db_name)
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+    finally:
+        conn.close()
+
+def incremental_vacuum(db_name='sales_mobi_2025.db', pages_per_step=DEFAULT_VACUUM_PAGES, pause=0.0):
+    """
+    빈 페이지(freelist)를 pages_per_step개씩 파일에서 잘라내고, 회수한 페이지 수를 반환합니다.
+    한 단계는 짧은 쓰기 트랜잭션이므로 VACUUM처럼 DB 전체를 오래 잠그지 않습니다.
+    """
+    conn = _connect(db_name)
+    freed = 0
+    try:
+        while True:
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if not free_pages:
+                return freed
+            # 결과 행을 모두 읽어야 요청한 페이지가 전부 회수됩니다.
+            conn.execute(f"PRAGMA incremental_vacuum({int(pages_per_step)})").fetchall()
+            freed += free_pages - conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if pause:
+                time.sleep(pause)
+    finally:
+        conn.close()
+
+def measure(db_name='sales_mobi_2025.db', repeat=5):
+    """파일 크기, 페이지 수, 빈 페이지 수, 업무 수와 대표 쿼리의 응답 시간(중앙값, ms)을 반환합니다."""
+    conn = _connect(db_name)
+    try:
+        latency = {}
+        for label, sql in LATENCY_QUERIES:
+            times = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                conn.execute(sql).fetchall()
+                times.append((time.perf_counter() - started) * 1000)
+            latency[label] = statistics.median(times)
+        return {
+            'file_bytes': os.path.getsize(db_name),
+            'pages': conn.execute("PRAGMA page_count").fetchone()[0],
+            'free_pages': conn.execute("PRAGMA freelist_count").fetchone()[0],
+            'tasks': conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0],
+            'latency_ms': latency,
+        }
+    finally:
+        conn.close()
+
+def print_report(before, after):
+    print("\n=== 보관 전후 비교 ===")
+    print(f"{'항목':<28}{'전':>14}{'후':>14}")
+    print(f"{'파일 크기(KB)':<28}{before['file_bytes'] / 1024:>14.1f}{after['file_bytes'] / 1024:>14.1f}")
+    for key, label in (('pages', '페이지 수'), ('free_pages', '빈 페이지 수'), ('tasks', '업무 수')):
+        print(f"{label:<28}{before[key]:>14}{after[key]:>14}")
+    for label in before['latency_ms']:
+        print(f"{label + '(ms)':<28}{before['latency_ms'][label]:>14.2f}{after['latency_ms'][label]:>14.2f}")
+
+
+# --- 운영 + 보관 DB 통합 조회 ---
+@contextmanager
+def combined_connection(db_name='sales_mobi_2025.db', archive_name=None):
+    """
+    보관 DB를 ATTACH하고 tasks와 참조/연결 테이블을 운영+보관 데이터를 합친 임시 뷰로 가린
+    읽기 전용 커넥션을 빌려줍니다. 임시(temp) 뷰는 같은 이름의 테이블보다 먼저 찾아지므로,
+    db_manager.query_tasks 같은 기존 조회 함수를 고치지 않고 그대로 쓸 수 있습니다.
+    참조 행은 운영 DB의 최신 값을 우선하고, 운영 DB에서 지워진 행만 보관 DB에서 가져옵니다.
+    연결 행도 같은 방식으로, 운영 DB에서 지워진 프로젝트의 참가자/기술만 보관 DB에서 가져옵니다.
+    """
+    archive_name = archive_name or default_archive_name(db_name)
+    conn = _connect(db_name)
+    try:
+        if os.path.exists(archive_name):
+            conn.execute("ATTACH DATABASE ? AS archive", (archive_name,))
+            conn.execute("""CREATE TEMP VIEW tasks AS
+                            SELECT * FROM main.tasks UNION ALL SELECT * FROM archive.tasks""")
+            for table in RELATED_TABLES:
+                conn.execute(f"""CREATE TEMP VIEW {table} AS SELECT * FROM main.{table} UNION ALL
+                                 SELECT * FROM archive.{table} WHERE id NOT IN (SELECT id FROM main.{table})""")
+            for table in LINK_TABLES:
+                conn.execute(f"""CREATE TEMP VIEW {table} AS SELECT * FROM main.{table} UNION ALL
+                                 SELECT * FROM archive.{table} WHERE project_id NOT IN (SELECT id FROM main.projects)""")
+        conn.execute("PRAGMA query_only = ON")
+        yield conn
+    finally:
+        conn.close()
+
+def get_tasks_with_archive(status=None, assignee=None, limit=None, offset=0,
+                           db_name='sales_mobi_2025.db', archive_name=None):
+    """보관된 업무까지 포함한 업무 목록을 반환합니다. (db_manager.query_tasks와 같은 형식)"""
+    with combined_connection(db_name, archive_name) as conn:
+        return query_tasks(conn, status, assignee, limit, offset)
+
+
+# --- CLI 실행 블록 ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오래된 완료 업무를 보관 DB로 옮기고 빈 공간을 회수합니다.")
+    parser.add_argument('--db', default='sales_mobi_2025.db', help="운영 데이터베이스 파일")
+    parser.add_argument('--archive', help="보관 데이터베이스 파일 (기본값: <운영 DB>_archive.db)")
+    parser.add_argument('--days', type=int, default=DEFAULT_OLDER_THAN_DAYS, help="완료 후 이 일수가 지난 업무를 보관")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="한 트랜잭션에서 옮길 업무 수")
+    parser.add_argument('--pause', type=float, default=0.0, help="배치 사이에 쉬는 시간(초)")
+    parser.add_argument('--vacuum-pages', type=int, default=DEFAULT_VACUUM_PAGES, help="incremental_vacuum 한 번에 회수할 페이지 수")
+    parser.add_argument('--no-vacuum', action='store_true', help="보관만 하고 공간 회수는 하지 않음")
+    args = parser.parse_args(argv)
+
+    setup_database(db_name=args.db)
+    try:
+        before = measure(args.db)
+        if not args.no_vacuum and enable_incremental_vacuum(args.db):
+            print("✅ auto_vacuum을 INCREMENTAL로 바꿨습니다. (VACUUM 1회 실행)")
+        stats = archive_done_tasks(args.db, args.archive, args.days, args.batch_size, args.pause)
+        print(f"✅ 완료 업무 {stats['moved']}건을 {stats['batches']}개 배치로 {stats['archive']}에 보관했습니다. "
+              f"({stats['elapsed']:.2f}초, 배치 최대 {stats['max_batch_ms']:.1f}ms)")
+        if not args.no_vacuum:
+            freed = incremental_vacuum(args.db, args.vacuum_pages, args.pause)
+            print(f"✅ 빈 페이지 {freed}개를 회수했습니다.")
+        after = measure(args.db)
+    except (OSError, sqlite3.Error) as e:
+        print(f"❌ 보관 작업 중 오류 발생: {e}")
+        return 1
+    print_report(before, after)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,227 @@
+import sqlite3
+import os
+import queue
+import asyncio
+import pathlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import db_manager
+
+# 한 번의 커밋으로 묶을 최대 쓰기 작업 수
+DEFAULT_GROUP_COMMIT_SIZE = 64
+# 처리 대기 중인 요청의 최대 개수 (넘으면 호출한 코루틴이 기다립니다)
+DEFAULT_MAX_PENDING_WRITES = 256
+DEFAULT_MAX_PENDING_READS = 64
+
+_STOP = object()
+
+
+class AsyncDatabase:
+    """
+    db_manager의 조회/추가 함수를 asyncio에서 사용할 수 있게 감싼 클래스입니다.
+    - 쓰기: 전용 스레드 하나가 쓰기 커넥션을 소유하고, 대기 중인 작업을 모아 한 번에 커밋합니다(group commit).
+      작업마다 SAVEPOINT를 두어 한 작업이 실패해도 같은 묶음의 다른 작업은 커밋됩니다.
+    - 읽기: WAL 모드에서 읽기 전용 커넥션을 가진 스레드 풀로 분산합니다.
+    - 대기 중인 요청 수를 제한해, 요청이 몰려도 'database is locked' 대신 호출 쪽이 기다리게 합니다.
+
+    사용 예:
+        async with AsyncDatabase('sales_mobi_2025.db') as db:
+            contacts = await db.get_all_contacts()
+    """
+
+    def __init__(self, db_name='sales_mobi_2025.db', readers=4,
+                 group_commit_size=DEFAULT_GROUP_COMMIT_SIZE,
+                 max_pending_writes=DEFAULT_MAX_PENDING_WRITES,
+                 max_pending_reads=DEFAULT_MAX_PENDING_READS,
+                 busy_timeout=10.0):
+        self.db_path = os.path.abspath(db_name)
+        self.readers = readers
+        self.group_commit_size = group_commit_size
+        self.busy_timeout = busy_timeout
+        self.max_pending_writes = max_pending_writes
+        self.max_pending_reads = max_pending_reads
+
+        self._write_queue = queue.Queue(maxsize=max_pending_writes)
+        self._writer = None
+        self._writer_ready = threading.Event()
+        self._writer_error = None
+        self._reader_pool = None
+        self._reader_local = threading.local()
+        self._reader_conns = []
+        self._reader_lock = threading.Lock()
+        self._write_slots = None
+        self._read_slots = None
+        self.stats = {'writes': 0, 'commits': 0, 'write_errors': 0, 'reads': 0}
+
+    # --- 시작/종료 ---
+    async def start(self):
+        self._write_slots = asyncio.Semaphore(self.max_pending_writes)
+        self._read_slots = asyncio.Semaphore(self.max_pending_reads)
+        self._writer = threading.Thread(target=self._writer_loop, name="db-writer", daemon=True)
+        self._writer.start()
+        # 쓰기 커넥션이 WAL 모드로 전환된 뒤에 읽기 커넥션을 열어야 합니다.
+        await asyncio.get_running_loop().run_in_executor(None, self._writer_ready.wait)
+        if self._writer_error is not None:
+            raise self._writer_error
+        self._reader_pool = ThreadPoolExecutor(max_workers=self.readers, thread_name_prefix="db-reader")
+        return self
+
+    async def close(self):
+        """대기 중인 쓰기를 모두 커밋한 뒤 스레드와 커넥션을 정리합니다."""
+        loop = asyncio.get_running_loop()
+        if self._writer is not None:
+            await loop.run_in_executor(None, self._write_queue.put, _STOP)
+            await loop.run_in_executor(None, self._writer.join)
+            self._writer = None
+        if self._reader_pool is not None:
+            self._reader_pool.shutdown(wait=True)
+            self._reader_pool = None
+        with self._reader_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    # --- 쓰기 스레드 ---
+    def _open_writer(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False,
+                               isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        # WAL 모드에서는 NORMAL로도 커밋된 데이터가 DB 손상 없이 유지됩니다.
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def _writer_loop(self):
+        try:
+            conn = self._open_writer()
+        except sqlite3.Error as e:
+            self._writer_error = e
+            self._writer_ready.set()
+            return
+        self._writer_ready.set()
+
+        stopping = False
+        while not stopping:
+            job = self._write_queue.get()
+            if job is _STOP:
+                break
+            batch = [job]
+            # 이미 쌓여 있는 작업을 최대 group_commit_size개까지 함께 처리합니다.
+            while len(batch) < self.group_commit_size:
+                try:
+                    job = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is _STOP:
+                    stopping = True
+                    break
+                batch.append(job)
+            try:
+                self._run_batch(conn, batch)
+            except Exception as e:
+                # 예상하지 못한 오류로 쓰기 스레드가 죽으면 이후 쓰기가 영원히 기다리므로, 이 묶음만 실패 처리합니다.
+                if conn.in_transaction:
+                    conn.rollback()
+                for _, _, future in batch:
+                    if not future.done():
+                        self.stats['write_errors'] += 1
+                        future.set_exception(e)
+        conn.close()
+
+    def _run_batch(self, conn, batch):
+        # 기다리다 취소된(시간 초과 등) 작업은 실행하지 않습니다.
+        batch = [job for job in batch if job[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for func, args, future in batch:
+                conn.execute("SAVEPOINT job")
+                try:
+                    result = func(conn.cursor(), *args)
+                    conn.execute("RELEASE job")
+                    results.append((future, result, None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+                    results.append((future, None, e))
+            conn.execute("COMMIT")
+            self.stats['commits'] += 1
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # 커밋 자체가 실패하면 묶음 안의 모든 작업이 실패한 것입니다.
+            results = [(future, None, e) for _, _, future in batch]
+
+        for future, result, error in results:
+            if error is None:
+                self.stats['writes'] += 1
+                future.set_result(result)
+            else:
+                self.stats['write_errors'] += 1
+                future.set_exception(error)
+
+    async def _write(self, func, *args):
+        if self._writer is None:
+            raise RuntimeError("AsyncDatabase.start()를 먼저 호출해야 합니다.")
+        async with self._write_slots:
+            future = Future()
+            try:
+                self._write_queue.put_nowait((func, args, future))
+            except queue.Full:
+                # 세마포어가 대기 수를 제한하므로 거의 발생하지 않지만, 혹시 가득 차면 스레드에서 기다립니다.
+                await asyncio.get_running_loop().run_in_executor(None, self._write_queue.put, (func, args, future))
+            return await asyncio.wrap_future(future)
+
+    # --- 읽기 스레드 풀 ---
+    def _reader_connection(self):
+        conn = getattr(self._reader_local, 'conn', None)
+        if conn is None:
+            uri = pathlib.Path(self.db_path).as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=self.busy_timeout, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only = ON")
+            self._reader_local.conn = conn
+            with self._reader_lock:
+                self._reader_conns.append(conn)
+        return conn
+
+    def _run_read(self, func, args):
+        conn = self._reader_connection()
+        try:
+            return func(conn, *args)
+        finally:
+            # 읽기 트랜잭션을 열어둔 채로 두면 WAL 체크포인트가 막히므로 바로 끝냅니다.
+            if conn.in_transaction:
+                conn.rollback()
+
+    async def _read(self, func, *args):
+        if self._reader_pool is None:
+            raise RuntimeError("AsyncDatabase.start()를 먼저 호출해야 합니다.")
+        async with self._read_slots:
+            self.stats['reads'] += 1
+            return await asyncio.get_running_loop().run_in_executor(self._reader_pool, self._run_read, func, args)
+
+    # --- db_manager와 같은 이름의 공개 API ---
+    async def get_all_contacts(self):
+        return await self._read(db_manager.query_contacts)
+
+    async def get_all_projects_with_details(self, limit=None, offset=0):
+        return await self._read(db_manager.query_projects_with_details, limit, offset)
+
+    async def add_contact(self, details):
+        """연락처를 추가하고 새 ID를 반환합니다. 이메일 중복 등은 sqlite3.IntegrityError로 전달됩니다."""
+        return await self._write(db_manager.insert_contact, details)
+
+    async def add_project(self, details):
+        """프로젝트와 참가자/기술 정보를 하나의 단위로 추가하고 새 프로젝트 ID를 반환합니다."""
+        return await self._write(db_manager.insert_project, details)
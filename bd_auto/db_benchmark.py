@@ -0,0 +1,333 @@
+import sqlite3
+import os
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+import statistics
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+try:
+    import resource  # 유닉스 계열에서만 사용 가능
+except ImportError:
+    resource = None
+
+import db_setup
+import db_migrations
+import db_manager
+import db_pool
+import bd_input_task
+
+# 업무(tasks) 수 기준의 규모 프리셋
+SCALES = {
+    '10k': 10_000,
+    '1m': 1_000_000,
+    '10m': 10_000_000,
+}
+
+# 업무 수 대비 다른 테이블의 비율과 연결 테이블의 팬아웃 (실제 CRM 데이터 분포를 흉내 냅니다)
+CONTACTS_PER_TASK = 0.1
+PROJECTS_PER_TASK = 0.01
+PARTICIPANTS_PER_PROJECT = (1, 8)
+TECHNOLOGIES_PER_PROJECT = (1, 5)
+
+COMPANIES = ["삼성전자", "LG전자", "SK하이닉스", "현대자동차", "네이버", "카카오", "KT", "포스코",
+             "Samsung SDS", "CJ올리브네트웍스", "롯데정보통신", "한화시스템"]
+TECHNOLOGIES = ["Kubernetes", "Docker", "Python", "Java", "Go", "Rust", "PostgreSQL", "SQLite", "Kafka",
+                "Spark", "Airflow", "TensorFlow", "PyTorch", "React", "Vue", "AWS", "Azure", "GCP",
+                "Terraform", "Ansible", "Redis", "Elasticsearch", "MongoDB", "GraphQL", "gRPC"]
+ASSIGNEES = ["김민수", "이서연", "박지훈", "최유진", "정하늘", "강도현", "조은비", "윤재원"]
+STATUSES = ['To Do', 'In Progress', 'Done', 'Pending']
+SEED_BATCH_SIZE = 50_000
+
+
+# --- 데이터 생성 ---
+def _random_date(rng, start=datetime(2023, 1, 1), days=1000):
+    return (start + timedelta(days=rng.randrange(days))).strftime('%Y-%m-%d')
+
+def _batched_insert(conn, sql, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= SEED_BATCH_SIZE:
+            conn.executemany(sql, batch)
+            batch.clear()
+    if batch:
+        conn.executemany(sql, batch)
+
+def seed_crm_database(db_name, n_tasks, seed=42):
+    """db_setup 스키마로 데이터베이스를 만들고 n_tasks 규모의 합성 데이터를 채웁니다."""
+    rng = random.Random(seed)
+    n_contacts = max(1, int(n_tasks * CONTACTS_PER_TASK))
+    n_projects = max(1, int(n_tasks * PROJECTS_PER_TASK))
+
+    with redirect_stdout(io.StringIO()):
+        db_setup.setup_database(db_name=db_name)
+    conn = sqlite3.connect(db_name)
+    # 시드 작업은 다시 만들 수 있으므로 내구성보다 속도를 우선합니다.
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA journal_mode = MEMORY")
+
+    _batched_insert(conn, '''INSERT INTO contacts
+        (person_name, company_name, email, phone, age, department, position, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', (
+        (f"담당자{i}", rng.choice(COMPANIES), f"user{i}@example.com", f"010-{i % 10000:04d}-{rng.randrange(10000):04d}",
+         rng.randrange(25, 60), "영업팀", "과장", f"메모 {i}")
+        for i in range(n_contacts)))
+    conn.executemany("INSERT INTO categories (name) VALUES (?)", [("미팅",), ("제안",), ("계약",), ("기술지원",)])
+    _batched_insert(conn, "INSERT INTO projects (name, start_date, end_date) VALUES (?, ?, ?)", (
+        (f"프로젝트{i}", _random_date(rng), _random_date(rng) if rng.random() < 0.5 else None)
+        for i in range(n_projects)))
+    _batched_insert(conn, "INSERT INTO project_participants (project_id, contact_id) VALUES (?, ?)", (
+        (pid, cid)
+        for pid in range(1, n_projects + 1)
+        for cid in set(rng.randrange(1, n_contacts + 1) for _ in range(rng.randint(*PARTICIPANTS_PER_PROJECT)))))
+    conn.executemany("INSERT INTO technologies (id, name, normalized_name) VALUES (?, ?, ?)",
+                     [(i, tech, db_migrations.normalize_technology_name(tech)) for i, tech in enumerate(TECHNOLOGIES, 1)])
+    _batched_insert(conn, "INSERT INTO project_technologies (project_id, technology_id) VALUES (?, ?)", (
+        (pid, tech_id)
+        for pid in range(1, n_projects + 1)
+        for tech_id in rng.sample(range(1, len(TECHNOLOGIES) + 1), rng.randint(*TECHNOLOGIES_PER_PROJECT))))
+    _batched_insert(conn, '''INSERT INTO tasks
+        (task_date, task_description, current_status, due_date, assignee, contact_id, category_id, project_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', (
+        (_random_date(rng), f"영업 활동 {i}", rng.choice(STATUSES), _random_date(rng) if rng.random() < 0.8 else '',
+         rng.choice(ASSIGNEES), rng.randrange(1, n_contacts + 1), rng.randrange(1, 5), rng.randrange(1, n_projects + 1))
+        for i in range(n_tasks)))
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    return {'tasks': n_tasks, 'contacts': n_contacts, 'projects': n_projects}
+
+def seed_task_database(db_name, n_tasks, seed=42):
+    """bd_input_task 스키마(비정규화된 tasks 테이블)로 데이터베이스를 만들고 합성 데이터를 채웁니다."""
+    rng = random.Random(seed)
+    with redirect_stdout(io.StringIO()):
+        bd_input_task.setup_database(db_name=db_name)
+    conn = sqlite3.connect(db_name)
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA journal_mode = MEMORY")
+    start = datetime(2023, 1, 1)
+    _batched_insert(conn, '''INSERT INTO tasks
+        (task_date, company_name, contact_person, contact_email, contact_phone, task_description,
+         current_status, due_date, assignee, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', (
+        (_random_date(rng), rng.choice(COMPANIES), f"담당자{i % 5000}", f"user{i % 5000}@example.com", "",
+         f"영업 활동 {i}", rng.choice(STATUSES), _random_date(rng), rng.choice(ASSIGNEES),
+         (start + timedelta(seconds=i * 37)).strftime('%Y-%m-%d %H:%M:%S'),
+         (start + timedelta(seconds=i * 37)).strftime('%Y-%m-%d %H:%M:%S'))
+        for i in range(n_tasks)))
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+# --- 측정 ---
+def peak_rss_kb():
+    """현재 프로세스의 최대 RSS(KB)를 반환합니다. 측정할 수 없으면 None을 반환합니다."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB 단위로 돌려줍니다.
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def _percentile(sorted_values, pct):
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+def measure(name, func, iterations):
+    """
+    func를 iterations번 호출해 지연 시간 분포를 구합니다.
+    func는 처리한 행 수를 반환해야 하며, 이를 바탕으로 rows/sec를 계산합니다.
+    """
+    latencies, total_rows = [], 0
+    with redirect_stdout(io.StringIO()):
+        for i in range(iterations):
+            started = time.perf_counter()
+            rows = func(i)
+            latencies.append(time.perf_counter() - started)
+            total_rows += rows or 0
+    latencies.sort()
+    total_time = sum(latencies)
+    return {
+        'name': name,
+        'iterations': iterations,
+        'p50_ms': _percentile(latencies, 50) * 1000,
+        'p95_ms': _percentile(latencies, 95) * 1000,
+        'p99_ms': _percentile(latencies, 99) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000,
+        'rows_per_sec': total_rows / total_time if total_time else 0.0,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+# --- 벤치마크 대상 작업 ---
+def crm_operations(sizes, rng):
+    """db_manager의 공개 함수들을 (이름, 함수, 반복 비율) 목록으로 반환합니다."""
+    run_id = int(time.time() * 1000)
+
+    def add_contact(i):
+        db_manager.add_contact({
+            'person_name': f"벤치{i}", 'company_name': rng.choice(COMPANIES),
+            'email': f"bench{run_id}_{i}@example.com", 'phone': "", 'age': None,
+            'department': "", 'position': "", 'notes': ""})
+        return 1
+
+    def add_project(i):
+        participants = [rng.randrange(1, sizes['contacts'] + 1) for _ in range(rng.randint(*PARTICIPANTS_PER_PROJECT))]
+        db_manager.add_project({
+            'name': f"벤치프로젝트{run_id}_{i}", 'start_date': "2025-01-01", 'end_date': "",
+            'participant_ids': sorted(set(participants)),
+            'technologies': rng.sample(TECHNOLOGIES, rng.randint(*TECHNOLOGIES_PER_PROJECT))})
+        return 1
+
+    def projects_page(i):
+        offset = rng.randrange(max(1, sizes['projects'] - 20))
+        return len(db_manager.get_all_projects_with_details(limit=20, offset=offset))
+
+    return [
+        ('db_manager.get_all_contacts', lambda i: len(db_manager.get_all_contacts()), 0.1),
+        ('db_manager.get_all_projects_with_details(all)',
+         lambda i: len(db_manager.get_all_projects_with_details()), 0.1),
+        ('db_manager.get_all_projects_with_details(page)', projects_page, 1.0),
+        ('db_manager.add_contact', add_contact, 1.0),
+        ('db_manager.add_project', add_project, 1.0),
+    ]
+
+def task_operations(task_db, n_tasks, rng):
+    """bd_input_task의 CRUD 작업을 (이름, 함수, 반복 비율) 목록으로 반환합니다."""
+    def insert(i):
+        with bd_input_task.db_connection(task_db) as conn:
+            conn.execute(bd_input_task.INSERT_TASK_SQL, (
+                "2025-01-01", rng.choice(COMPANIES), "벤치", "", "", f"벤치 활동 {i}", "To Do", "", rng.choice(ASSIGNEES)))
+            conn.commit()
+        return 1
+
+    def first_page(i):
+        return len(bd_input_task.fetch_task_page(db_name=task_db))
+
+    def deep_page(i):
+        # 중간 지점의 키로 바로 이동해도 OFFSET 없이 같은 비용으로 조회되는지 확인합니다.
+        with bd_input_task.db_connection(task_db) as conn:
+            key = conn.execute("SELECT created_at, id FROM tasks WHERE id = ?",
+                               (rng.randrange(1, n_tasks + 1),)).fetchone()
+        if key is None:
+            return 0
+        return len(bd_input_task.fetch_task_page(after=(key['created_at'], key['id']), db_name=task_db))
+
+    def filtered_page(i):
+        return len(bd_input_task.fetch_task_page(db_name=task_db, status='Done', assignee=rng.choice(ASSIGNEES)))
+
+    def update(i):
+        with bd_input_task.db_connection(task_db) as conn:
+            conn.execute(bd_input_task.UPDATE_TASK_SQL, (
+                "2025-01-02", "벤치회사", "벤치", "", "", "수정된 활동", "In Progress", "2025-02-01", "김민수",
+                datetime.now().strftime('%Y-%m-%d %H:%M:%S'), rng.randrange(1, n_tasks + 1)))
+            conn.commit()
+        return 1
+
+    def delete(i):
+        with bd_input_task.db_connection(task_db) as conn:
+            conn.execute(bd_input_task.DELETE_TASK_SQL, (rng.randrange(1, n_tasks + 1),))
+            conn.commit()
+        return 1
+
+    return [
+        ('bd_input_task.insert', insert, 1.0),
+        ('bd_input_task.fetch_task_page(first)', first_page, 1.0),
+        ('bd_input_task.fetch_task_page(deep)', deep_page, 1.0),
+        ('bd_input_task.fetch_task_page(filtered)', filtered_page, 1.0),
+        ('bd_input_task.update', update, 1.0),
+        ('bd_input_task.delete', delete, 1.0),
+    ]
+
+
+# --- 실행 ---
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(work_dir, n_tasks, iterations=100, seed=42, reuse=False):
+    """
+    work_dir에 합성 데이터베이스를 만들고 모든 작업의 지연 시간을 측정한 결과를 반환합니다.
+    db_manager는 현재 폴더의 'sales_mobi_2025.db'를 사용하므로 측정하는 동안 work_dir로 이동합니다.
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    crm_db = os.path.join(work_dir, 'sales_mobi_2025.db')
+    task_db = os.path.abspath(os.path.join(work_dir, 'sales_data_task.db'))
+    if not reuse:
+        for path in (crm_db, task_db):
+            if os.path.exists(path):
+                os.remove(path)
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    if reuse and os.path.exists(crm_db):
+        conn = sqlite3.connect(crm_db)
+        sizes = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ('tasks', 'contacts', 'projects')}
+        conn.close()
+    else:
+        sizes = seed_crm_database(crm_db, n_tasks, seed)
+    if not (reuse and os.path.exists(task_db)):
+        seed_task_database(task_db, n_tasks, seed)
+    seed_seconds = time.perf_counter() - started
+
+    previous_dir = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        results = []
+        operations = crm_operations(sizes, rng) + task_operations(task_db, n_tasks, rng)
+        for name, func, ratio in operations:
+            result = measure(name, func, max(1, int(iterations * ratio)))
+            results.append(result)
+            print(f"  {name:<48} p50 {result['p50_ms']:8.3f}ms  p95 {result['p95_ms']:8.3f}ms  "
+                  f"p99 {result['p99_ms']:8.3f}ms  {result['rows_per_sec']:12.0f} rows/sec")
+    finally:
+        os.chdir(previous_dir)
+        db_pool.close_all_pools()
+
+    return {
+        'commit': _git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'scale': sizes,
+        'iterations': iterations,
+        'seed_seconds': seed_seconds,
+        'peak_rss_kb': peak_rss_kb(),
+        'results': results,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="sales_mobi 스키마 합성 데이터 벤치마크")
+    parser.add_argument('--scale', default='10k', help=f"업무 수 프리셋({', '.join(SCALES)}) 또는 숫자")
+    parser.add_argument('--iterations', type=int, default=100, help="작업별 반복 횟수")
+    parser.add_argument('--work-dir', default='bench_data', help="합성 데이터베이스를 만들 폴더")
+    parser.add_argument('--output', help="결과 JSON 파일 경로 (기본값: bench_<규모>_<커밋>.json)")
+    parser.add_argument('--reuse', action='store_true', help="이미 만든 합성 데이터베이스를 재사용")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    n_tasks = SCALES.get(args.scale.lower()) or int(args.scale)
+    print(f"=== 벤치마크: 업무 {n_tasks:,}건, 작업별 {args.iterations}회 ===")
+    report = run_benchmark(args.work_dir, n_tasks, iterations=args.iterations, seed=args.seed, reuse=args.reuse)
+    output = args.output or f"bench_{args.scale.lower()}_{report['commit'] or 'local'}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ 결과를 '{output}'에 저장했습니다. (데이터 생성 {report['seed_seconds']:.1f}초, "
+          f"최대 RSS {report['peak_rss_kb']} KB)")
+
+if __name__ == '__main__':
+    main()
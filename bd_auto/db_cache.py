@@ -0,0 +1,112 @@
+import sqlite3
+import os
+import threading
+
+class ContactCache:
+    """
+    contacts 테이블의 프로세스 내 캐시입니다.
+    - ID로 O(1) 조회/검증하고, 이름과 회사명(소문자 기준)으로도 찾을 수 있습니다.
+    - 변경 감지는 캐시 전용 커넥션의 PRAGMA data_version으로 합니다.
+      이 값은 '다른' 커넥션(풀의 다른 커넥션, 다른 프로세스 포함)이 커밋할 때만 바뀌므로,
+      캐시 전용 커넥션은 읽기만 하고 절대 쓰지 않습니다.
+    - 데이터가 바뀌지 않았다면 목록을 다시 읽지 않습니다.
+    """
+
+    def __init__(self, db_name='sales_mobi_2025.db'):
+        self.db_path = os.path.abspath(db_name)
+        self._conn = None
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._contacts = []       # person_name 순으로 정렬된 목록
+        self._by_id = {}
+        self._by_name = {}
+        self._by_company = {}
+        self.stats = {'hits': 0, 'misses': 0, 'reloads': 0}
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+        return self._conn
+
+    def _reload(self, conn):
+        contacts = conn.execute("SELECT * FROM contacts ORDER BY person_name").fetchall()
+        by_id, by_name, by_company = {}, {}, {}
+        for c in contacts:
+            by_id[c['id']] = c
+            by_name.setdefault(c['person_name'].strip().lower(), []).append(c)
+            by_company.setdefault(c['company_name'].strip().lower(), []).append(c)
+        self._contacts, self._by_id, self._by_name, self._by_company = contacts, by_id, by_name, by_company
+        self.stats['reloads'] += 1
+
+    def _refresh(self):
+        """데이터가 바뀌었을 때만 다시 읽습니다. 호출 전에 _lock을 잡고 있어야 합니다."""
+        conn = self._connection()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            self.stats['hits'] += 1
+            return
+        self.stats['misses'] += 1
+        self._reload(conn)
+        self._data_version = version
+
+    # --- 공개 API ---
+    def all(self):
+        """이름순 전체 연락처 목록 (get_all_contacts와 같은 결과)을 반환합니다."""
+        with self._lock:
+            self._refresh()
+            return self._contacts
+
+    def get(self, contact_id):
+        with self._lock:
+            self._refresh()
+            return self._by_id.get(contact_id)
+
+    def has_ids(self, contact_ids):
+        """모든 ID가 실제로 존재하는지 확인합니다. (ID당 O(1))"""
+        with self._lock:
+            self._refresh()
+            return all(cid in self._by_id for cid in contact_ids)
+
+    def find_by_name(self, person_name):
+        with self._lock:
+            self._refresh()
+            return list(self._by_name.get(person_name.strip().lower(), []))
+
+    def find_by_company(self, company_name):
+        with self._lock:
+            self._refresh()
+            return list(self._by_company.get(company_name.strip().lower(), []))
+
+    def invalidate(self):
+        """다음 조회 때 무조건 다시 읽도록 합니다."""
+        with self._lock:
+            self._data_version = None
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._by_id)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._data_version = None
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_contact_cache(db_name='sales_mobi_2025.db'):
+    """db_name 파일에 대한 공유 연락처 캐시를 반환합니다."""
+    path = os.path.abspath(db_name)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = ContactCache(path)
+        return cache
@@ -0,0 +1,189 @@
+import argparse
+from db_setup import db_connection, setup_database
+from db_migrations import CDC_TABLES
+
+# changes_since()가 한 번에 돌려주는 최대 변경 기록 수
+DEFAULT_BATCH_SIZE = 1000
+# IN (...) 조회 한 번에 넣을 최대 키 수
+LOOKUP_BATCH_SIZE = 500
+
+# 변경 기록 사용 방법
+# - 각 기록은 "이 행이 바뀌었다"는 사실(테이블, 키, 마지막 작업 I/U/D, seq)만 담습니다.
+#   소비자는 fetch_rows()로 행의 현재 상태를 읽고, 없으면 삭제된 것으로 처리합니다.
+# - 처리가 끝나면 acknowledge()로 마지막 seq를 기록합니다. 모든 소비자가 확인한 기록은 truncate_log()로 지웁니다.
+# - compact_log()는 같은 행의 기록 중 마지막 것만 남깁니다. (위 사용 방법을 따르면 결과가 같습니다)
+
+def _key(row):
+    return (row['row_id'],) if row['row_id2'] is None else (row['row_id'], row['row_id2'])
+
+def query_last_seq(conn):
+    """지금까지 발급된 가장 큰 seq (기록을 지운 뒤에도 유지됩니다)."""
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    return row[0] if row else 0
+
+def query_changes(conn, since_seq=0, limit=DEFAULT_BATCH_SIZE, tables=None):
+    """since_seq 다음부터 최대 limit개의 변경 기록을 seq 순으로 반환합니다. (seq 기본 키 범위 조회)"""
+    sql = "SELECT seq, table_name, op, row_id, row_id2, changed_at FROM change_log WHERE seq > ?"
+    params = [since_seq]
+    if tables:
+        sql += f" AND table_name IN ({', '.join('?' for _ in tables)})"
+        params.extend(tables)
+    sql += " ORDER BY seq LIMIT ?"
+    params.append(limit)
+    return [{'seq': row['seq'], 'table': row['table_name'], 'op': row['op'], 'key': _key(row),
+             'changed_at': row['changed_at']}
+            for row in conn.execute(sql, params)]
+
+def fetch_rows(conn, table, keys):
+    """키 목록에 해당하는 행의 현재 상태를 {키 튜플: 행}으로 반환합니다. 결과에 없는 키는 삭제된 행입니다."""
+    columns = CDC_TABLES[table]
+    keys = list(dict.fromkeys(keys))
+    found = {}
+    if len(columns) == 1:
+        for i in range(0, len(keys), LOOKUP_BATCH_SIZE):
+            batch = keys[i:i + LOOKUP_BATCH_SIZE]
+            sql = f"SELECT * FROM {table} WHERE {columns[0]} IN ({', '.join('?' for _ in batch)})"
+            for row in conn.execute(sql, [k[0] for k in batch]):
+                found[(row[columns[0]],)] = row
+    else:
+        # 복합 키의 (a, b) IN (VALUES ...)는 인덱스를 쓰지 못하므로 기본 키로 한 건씩 찾습니다.
+        sql = f"SELECT * FROM {table} WHERE {columns[0]} = ? AND {columns[1]} = ?"
+        for key in keys:
+            row = conn.execute(sql, key).fetchone()
+            if row is not None:
+                found[key] = row
+    return found
+
+
+# --- 공개 API ---
+def get_last_seq(db_name='sales_mobi_2025.db'):
+    with db_connection(db_name) as conn:
+        return query_last_seq(conn)
+
+def changes_since(since_seq=0, limit=DEFAULT_BATCH_SIZE, tables=None, with_rows=False, db_name='sales_mobi_2025.db'):
+    """
+    since_seq 이후의 변경 기록을 최대 limit개 반환합니다. 다음 호출에는 마지막 기록의 seq를 넘기면 됩니다.
+    with_rows=True면 각 기록에 행의 현재 상태('row', 삭제되었으면 None)를 함께 담습니다.
+    비용은 테이블 크기가 아니라 돌려주는 기록 수에 비례합니다.
+    """
+    with db_connection(db_name) as conn:
+        # 변경 기록과 행 상태를 같은 시점에서 읽습니다.
+        conn.execute("BEGIN")
+        try:
+            changes = query_changes(conn, since_seq, limit, tables)
+            if with_rows:
+                by_table = {}
+                for change in changes:
+                    by_table.setdefault(change['table'], []).append(change['key'])
+                rows = {table: fetch_rows(conn, table, keys) for table, keys in by_table.items()}
+                for change in changes:
+                    change['row'] = rows[change['table']].get(change['key'])
+        finally:
+            conn.rollback()
+    return changes
+
+def iter_changes(since_seq=0, batch_size=DEFAULT_BATCH_SIZE, tables=None, with_rows=False,
+                 db_name='sales_mobi_2025.db'):
+    """since_seq 이후의 변경 기록을 batch_size개씩 묶어 끝까지 돌려주는 제너레이터입니다."""
+    while True:
+        changes = changes_since(since_seq, batch_size, tables, with_rows, db_name)
+        if not changes:
+            return
+        yield changes
+        since_seq = changes[-1]['seq']
+
+def register_consumer(name, from_seq=None, db_name='sales_mobi_2025.db'):
+    """
+    소비자를 등록하고 시작 seq를 반환합니다. 이미 등록되어 있으면 확인한 위치를 그대로 돌려줍니다.
+    from_seq를 생략하면 현재 위치부터 시작합니다. (전체 데이터는 db_export 등으로 먼저 받아야 합니다)
+    """
+    with db_connection(db_name) as conn:
+        start = query_last_seq(conn) if from_seq is None else from_seq
+        conn.execute("INSERT OR IGNORE INTO change_consumers (name, acked_seq) VALUES (?, ?)", (name, start))
+        conn.commit()
+        return conn.execute("SELECT acked_seq FROM change_consumers WHERE name = ?", (name,)).fetchone()[0]
+
+def get_consumer_seq(name, db_name='sales_mobi_2025.db'):
+    with db_connection(db_name) as conn:
+        row = conn.execute("SELECT acked_seq FROM change_consumers WHERE name = ?", (name,)).fetchone()
+    if row is None:
+        raise ValueError(f"등록되지 않은 소비자입니다: {name}")
+    return row[0]
+
+def acknowledge(name, seq, db_name='sales_mobi_2025.db'):
+    """소비자가 seq까지 처리했음을 기록합니다. (뒤로 되돌리지는 않습니다)"""
+    with db_connection(db_name) as conn:
+        cursor = conn.execute("""UPDATE change_consumers SET acked_seq = MAX(acked_seq, ?), updated_at = CURRENT_TIMESTAMP
+                                 WHERE name = ?""", (seq, name))
+        if cursor.rowcount == 0:
+            conn.rollback()
+            raise ValueError(f"등록되지 않은 소비자입니다: {name}")
+        conn.commit()
+
+def remove_consumer(name, db_name='sales_mobi_2025.db'):
+    """더 이상 쓰지 않는 소비자를 지웁니다. (남겨두면 truncate_log()가 기록을 지우지 못합니다)"""
+    with db_connection(db_name) as conn:
+        conn.execute("DELETE FROM change_consumers WHERE name = ?", (name,))
+        conn.commit()
+
+def truncate_log(db_name='sales_mobi_2025.db'):
+    """모든 소비자가 확인한 변경 기록을 지우고 지운 개수를 반환합니다. 소비자가 없으면 지우지 않습니다."""
+    with db_connection(db_name) as conn:
+        min_acked = conn.execute("SELECT MIN(acked_seq) FROM change_consumers").fetchone()[0]
+        if min_acked is None:
+            return 0
+        deleted = conn.execute("DELETE FROM change_log WHERE seq <= ?", (min_acked,)).rowcount
+        conn.commit()
+        return deleted
+
+def compact_log(db_name='sales_mobi_2025.db'):
+    """같은 행에 대한 기록 중 마지막 것만 남기고 지운 개수를 반환합니다."""
+    with db_connection(db_name) as conn:
+        deleted = conn.execute("""
+            DELETE FROM change_log WHERE seq < (
+                SELECT MAX(c.seq) FROM change_log c
+                WHERE c.table_name = change_log.table_name AND c.row_id = change_log.row_id
+                  AND c.row_id2 IS change_log.row_id2
+            )""").rowcount
+        conn.commit()
+        return deleted
+
+def get_status(db_name='sales_mobi_2025.db'):
+    """변경 기록 개수/범위와 소비자별 지연(확인하지 않은 기록 수)을 반환합니다."""
+    with db_connection(db_name) as conn:
+        count, min_seq = conn.execute("SELECT COUNT(*), MIN(seq) FROM change_log").fetchone()
+        last_seq = query_last_seq(conn)
+        consumers = [
+            {'name': row['name'], 'acked_seq': row['acked_seq'], 'updated_at': row['updated_at'],
+             'pending': conn.execute("SELECT COUNT(*) FROM change_log WHERE seq > ?", (row['acked_seq'],)).fetchone()[0]}
+            for row in conn.execute("SELECT * FROM change_consumers ORDER BY name").fetchall()
+        ]
+    return {'entries': count, 'min_seq': min_seq, 'last_seq': last_seq, 'consumers': consumers}
+
+
+# --- CLI 실행 블록 ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="변경 기록(CDC) 조회 및 정리")
+    parser.add_argument('command', choices=['status', 'changes', 'truncate', 'compact'], help="실행할 작업")
+    parser.add_argument('--db', default='sales_mobi_2025.db', help="대상 데이터베이스 파일")
+    parser.add_argument('--since', type=int, default=0, help="changes: 이 seq 다음부터 조회")
+    parser.add_argument('--limit', type=int, default=20, help="changes: 최대 조회 개수")
+    args = parser.parse_args(argv)
+
+    setup_database(db_name=args.db)
+    if args.command == 'status':
+        status = get_status(args.db)
+        print(f"변경 기록 {status['entries']}건 (seq {status['min_seq']}~{status['last_seq']})")
+        for c in status['consumers']:
+            print(f"  소비자 {c['name']}: {c['acked_seq']}까지 확인, 남은 기록 {c['pending']}건 ({c['updated_at']})")
+    elif args.command == 'changes':
+        for change in changes_since(args.since, args.limit, db_name=args.db):
+            print(f"  #{change['seq']} {change['op']} {change['table']}{change['key']} ({change['changed_at']})")
+    elif args.command == 'truncate':
+        print(f"✅ 모든 소비자가 확인한 기록 {truncate_log(args.db)}건을 지웠습니다.")
+    elif args.command == 'compact':
+        print(f"✅ 중복된 행 기록 {compact_log(args.db)}건을 지웠습니다.")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,308 @@
+import sqlite3
+import os
+import re
+import json
+import time
+import argparse
+import unicodedata
+from datetime import datetime
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+from db_setup import db_connection, setup_database
+
+# 이 점수(0~1, difflib 유사도) 이상인 회사명 후보를 같은 회사로 봅니다.
+# 0.9에서는 'Samsung SDS'와 'Samsung SDI'(0.90)처럼 한 글자만 다른 다른 회사가 묶이므로 더 높게 잡습니다.
+# 유사도로 찾은 병합은 어떤 값이든 검토한 제안 파일(--apply-file)로만 적용합니다.
+DEFAULT_THRESHOLD = 0.92
+# 블록(같은 블로킹 키를 가진 이름 묶음)이 이보다 크면 구분력이 없는 키로 보고 비교하지 않습니다.
+MAX_BLOCK_SIZE = 200
+# 이름마다 블로킹 키로 쓸 가장 드문 3-gram 개수
+RARE_NGRAMS_PER_NAME = 3
+# 접두어 블로킹 키 길이
+PREFIX_LENGTH = 4
+# 정규화 키가 이보다 짧은 이름은 유사도로 묶지 않습니다. (짧은 이름은 한 글자 차이도 다른 회사일 가능성이 큼)
+MIN_FUZZY_LENGTH = 6
+# 병합 적용 시 한 트랜잭션에서 바꿀 회사명(변형) 수
+DEFAULT_APPLY_BATCH_SIZE = 500
+
+# 정규화할 때 지우는 법인 표기
+KOREAN_LEGAL_FORMS = re.compile(r"\(주\)|\(유\)|주식회사|유한회사|유한책임회사")
+ENGLISH_LEGAL_FORMS = {'inc', 'corp', 'corporation', 'co', 'ltd', 'llc', 'limited', 'plc', 'gmbh'}
+PUNCTUATION = re.compile(r"[\s.,()\[\]{}\-_&'\"/·]+")
+
+
+def normalize_company_name(name):
+    """
+    회사명 비교용 키를 만듭니다.
+    유니코드 정규화(NFKC, ㈜ -> (주)), 대소문자 통일, 법인 표기와 문장부호/공백을 제거합니다.
+    예: ' Samsung Electronics Co., Ltd. ' -> 'samsungelectronics', '㈜ 삼성 전자' -> '삼성전자'
+    """
+    text = KOREAN_LEGAL_FORMS.sub(" ", unicodedata.normalize('NFKC', name).casefold())
+    tokens = [t for t in PUNCTUATION.split(text) if t]
+    while len(tokens) > 1 and tokens[-1] in ENGLISH_LEGAL_FORMS:
+        tokens.pop()
+    return "".join(tokens) or "".join(name.split()).casefold()
+
+def load_aliases(path):
+    """
+    {변형 이름: 대표 이름} JSON 파일을 읽어 {정규화 키: 대표 키}로 반환합니다.
+    'Samsung Electronics'와 '삼성전자'처럼 글자가 전혀 다른 이름은 유사도로 찾을 수 없으므로 별칭으로 지정합니다.
+    """
+    with open(path, encoding='utf-8') as f:
+        aliases = json.load(f)
+    return {normalize_company_name(k): normalize_company_name(v) for k, v in aliases.items()}
+
+
+# --- 후보 찾기 ---
+def _ngrams(key, n=3):
+    return {key[i:i + n] for i in range(len(key) - n + 1)} or {key}
+
+def _blocking_keys(key, grams, gram_freq):
+    """접두어 하나와 전체 이름 중 가장 드문 3-gram 몇 개를 블로킹 키로 씁니다."""
+    rare = sorted(grams, key=lambda g: (gram_freq[g], g))[:RARE_NGRAMS_PER_NAME]
+    return [('p', key[:PREFIX_LENGTH])] + [('g', g) for g in rare]
+
+def _similarity(a, b, threshold):
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    # quick_ratio()는 ratio()의 상한값이므로, 먼저 걸러 정확한 비교 횟수를 줄입니다.
+    if matcher.quick_ratio() < threshold:
+        return 0.0
+    return matcher.ratio()
+
+def find_duplicate_companies(name_counts, threshold=DEFAULT_THRESHOLD, aliases=None):
+    """
+    {회사명: 연락처 수}에서 같은 회사로 보이는 이름 묶음을 찾아 병합 제안 목록과 통계를 반환합니다.
+    1. 정규화 키가 같은 이름(대소문자/공백/법인 표기 차이)과 별칭은 바로 같은 회사로 묶습니다.
+    2. 서로 다른 키끼리는 (MIN_FUZZY_LENGTH 이상일 때) 블로킹 키(접두어, 드문 3-gram)를 하나 이상 공유하는 쌍만 유사도를 계산합니다.
+       모든 쌍(O(n²))을 비교하지 않으므로 이름 수에 거의 비례하는 시간에 끝납니다.
+    3. threshold 이상인 쌍을 union-find로 묶고, 연락처가 가장 많은 표기를 대표 이름으로 정합니다.
+    """
+    aliases = aliases or {}
+    stats = {'names': len(name_counts), 'keys': 0, 'blocks': 0, 'skipped_blocks': 0,
+             'candidate_pairs': 0, 'matched_pairs': 0}
+
+    names_by_key = defaultdict(list)
+    for name in name_counts:
+        key = normalize_company_name(name)
+        names_by_key[aliases.get(key, key)].append(name)
+    keys = list(names_by_key)
+    stats['keys'] = len(keys)
+
+    grams = {key: _ngrams(key) for key in keys}
+    gram_freq = Counter(g for key in keys for g in grams[key])
+    blocks = defaultdict(list)
+    for key in keys:
+        if len(key) < MIN_FUZZY_LENGTH:
+            continue
+        for block in _blocking_keys(key, grams[key], gram_freq):
+            blocks[block].append(key)
+
+    parent = {key: key for key in keys}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    scores, seen = {}, set()
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) > MAX_BLOCK_SIZE:
+            stats['skipped_blocks'] += 1
+            continue
+        stats['blocks'] += 1
+        for a, b in combinations(members, 2):
+            pair = (a, b) if a < b else (b, a)
+            if pair in seen:
+                continue
+            seen.add(pair)
+            # 길이 차이가 크면 유사도가 threshold를 넘을 수 없습니다. (ratio <= 2·짧은 길이 / 길이 합)
+            if 2 * min(len(a), len(b)) < threshold * (len(a) + len(b)):
+                continue
+            stats['candidate_pairs'] += 1
+            score = _similarity(a, b, threshold)
+            if score >= threshold:
+                stats['matched_pairs'] += 1
+                scores[pair] = score
+                parent[find(a)] = find(b)
+
+    # 대표 이름과 직접 비교하지 않은(다른 이름을 거쳐 묶인) 키는 묶음 안에서 가장 높은 점수를 보여줍니다.
+    best_score = defaultdict(float)
+    for (a, b), score in scores.items():
+        best_score[a] = max(best_score[a], score)
+        best_score[b] = max(best_score[b], score)
+
+    clusters = defaultdict(list)
+    for key in keys:
+        clusters[find(key)].append(key)
+
+    proposals = []
+    for members in clusters.values():
+        names = [name for key in members for name in names_by_key[key]]
+        if len(names) < 2:
+            continue
+        # 연락처가 가장 많은 표기를 대표로 합니다. 같으면 같은 정규화 키의 연락처가 많은 쪽,
+        # 그것도 같으면 앞뒤 공백이 없는 표기, 더 긴 표기 순으로 고릅니다. (끝 글자가 빠진 'Alpha Beta Gamm' 같은 오타 방지)
+        key_of = {name: key for key in members for name in names_by_key[key]}
+        key_counts = {key: sum(name_counts[n] for n in names_by_key[key]) for key in members}
+        canonical = min(names, key=lambda n: (-name_counts[n], -key_counts[key_of[n]], n != n.strip(), -len(n.strip()), n))
+        canonical_key = key_of[canonical]
+        variants = []
+        for key in members:
+            pair = (key, canonical_key) if key < canonical_key else (canonical_key, key)
+            score = 1.0 if key == canonical_key else scores.get(pair, best_score[key])
+            for name in names_by_key[key]:
+                if name != canonical:
+                    variants.append({'name': name, 'contacts': name_counts[name], 'score': round(score, 3)})
+        variants.sort(key=lambda v: -v['contacts'])
+        proposals.append({'canonical': canonical, 'contacts': sum(name_counts[n] for n in names),
+                          'variants': variants})
+    proposals.sort(key=lambda p: -p['contacts'])
+    return proposals, stats
+
+
+# --- 공개 API ---
+def load_company_counts(db_name='sales_mobi_2025.db'):
+    """{회사명: 연락처 수}를 반환합니다. (회사명 인덱스로 묶으므로 연락처 수가 아니라 회사명 수만큼 읽습니다)"""
+    with db_connection(db_name) as conn:
+        return {row[0]: row[1] for row in
+                conn.execute("SELECT company_name, COUNT(*) FROM contacts GROUP BY company_name")}
+
+def propose_merges(db_name='sales_mobi_2025.db', threshold=DEFAULT_THRESHOLD, aliases=None):
+    """DB의 회사명을 읽어 병합 제안 목록과 통계(단계별 시간 포함)를 반환합니다."""
+    started = time.perf_counter()
+    name_counts = load_company_counts(db_name)
+    loaded = time.perf_counter()
+    proposals, stats = find_duplicate_companies(name_counts, threshold, aliases)
+    stats['load_seconds'] = loaded - started
+    stats['match_seconds'] = time.perf_counter() - loaded
+    return proposals, stats
+
+def default_undo_path(db_name):
+    """sales_mobi_2025.db -> sales_mobi_2025_company_undo_20250307_181500.jsonl"""
+    root = os.path.splitext(db_name)[0]
+    return f"{root}_company_undo_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+def apply_merges(proposals, db_name='sales_mobi_2025.db', batch_size=DEFAULT_APPLY_BATCH_SIZE,
+                 include_fuzzy=True, undo_path=None):
+    """
+    병합 제안대로 변형 회사명을 쓰는 연락처를 대표 이름으로 바꾸고, 바뀐 연락처 수를 반환합니다.
+    - include_fuzzy=False면 정규화/별칭이 일치한 변형(score 1.0)만 바꾸고, 유사도로 찾은 변형은 건너뜁니다.
+    - 바꾸기 전에 연락처별 원래 회사명을 undo_path(JSONL)에 남깁니다. undo_merges()로 되돌릴 수 있습니다.
+    batch_size개의 변형 이름마다 한 트랜잭션으로 커밋하므로 중간에 실패해도 앞선 배치는 유지되며,
+    다시 실행하면 남은 변형만 바뀝니다. (검색 색인과 변경 기록은 트리거로 함께 갱신됩니다)
+    """
+    renames = [(p['canonical'], v['name']) for p in proposals for v in p['variants']
+               if include_fuzzy or v['score'] == 1.0]
+    undo_path = undo_path or default_undo_path(db_name)
+    updated = 0
+    with db_connection(db_name) as conn, open(undo_path, 'a', encoding='utf-8') as undo:
+        for i in range(0, len(renames), batch_size):
+            try:
+                conn.execute("BEGIN")
+                for canonical, variant in renames[i:i + batch_size]:
+                    for (contact_id,) in conn.execute("SELECT id FROM contacts WHERE company_name = ?", (variant,)):
+                        undo.write(json.dumps({'id': contact_id, 'from': variant, 'to': canonical},
+                                              ensure_ascii=False) + "\n")
+                    updated += conn.execute("UPDATE contacts SET company_name = ? WHERE company_name = ?",
+                                            (canonical, variant)).rowcount
+                # 커밋 전에 되돌리기 기록을 먼저 디스크에 씁니다.
+                undo.flush()
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+    return updated
+
+def undo_merges(undo_path, db_name='sales_mobi_2025.db', batch_size=DEFAULT_APPLY_BATCH_SIZE * 10):
+    """
+    apply_merges()가 남긴 기록으로 연락처의 회사명을 원래대로 되돌리고, 되돌린 연락처 수를 반환합니다.
+    병합 뒤에 회사명을 다시 바꾼 연락처는 건드리지 않습니다.
+    """
+    with open(undo_path, encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    restored = 0
+    with db_connection(db_name) as conn:
+        for i in range(0, len(entries), batch_size):
+            try:
+                conn.execute("BEGIN")
+                for e in entries[i:i + batch_size]:
+                    restored += conn.execute("UPDATE contacts SET company_name = ? WHERE id = ? AND company_name = ?",
+                                             (e['from'], e['id'], e['to'])).rowcount
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+    return restored
+
+def save_proposals(path, proposals):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(proposals, f, ensure_ascii=False, indent=2)
+
+def load_proposals(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def print_proposals(proposals, limit=20):
+    for p in proposals[:limit]:
+        print(f"  {p['canonical']} (연락처 {p['contacts']}명)")
+        for v in p['variants']:
+            score = "정규화/별칭 일치" if v['score'] == 1.0 else f"유사도 {v['score']:.2f}"
+            print(f"      ← {v['name']!r} ({v['contacts']}명, {score})")
+    if len(proposals) > limit:
+        print(f"  ... 외 {len(proposals) - limit}개 묶음")
+
+
+# --- CLI 실행 블록 ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="연락처 회사명 중복(표기 차이)을 찾아 병합합니다.")
+    parser.add_argument('--db', default='sales_mobi_2025.db', help="대상 데이터베이스 파일")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="같은 회사로 볼 최소 유사도 (0~1)")
+    parser.add_argument('--aliases', help="{변형 이름: 대표 이름} JSON 파일 (예: 영문/한글 표기)")
+    parser.add_argument('--out', help="병합 제안을 저장할 JSON 파일 (검토 후 --apply-file로 적용)")
+    parser.add_argument('--apply', action='store_true',
+                        help="정규화/별칭이 일치한 병합만 바로 적용 (유사도 병합은 --out으로 저장해 검토 후 --apply-file로 적용)")
+    parser.add_argument('--apply-file', help="저장해 둔(검토한) 병합 제안 JSON 파일을 적용")
+    parser.add_argument('--undo-file', help="적용 시 원래 회사명을 기록할 JSONL 파일 (기본값: <DB>_company_undo_<시각>.jsonl)")
+    parser.add_argument('--undo', help="이 되돌리기 기록(JSONL)으로 회사명을 원래대로 되돌림")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_APPLY_BATCH_SIZE, help="트랜잭션당 바꿀 회사명 수")
+    args = parser.parse_args(argv)
+
+    setup_database(db_name=args.db)
+    try:
+        if args.undo:
+            restored = undo_merges(args.undo, args.db)
+            print(f"✅ 연락처 {restored}명의 회사명을 원래대로 되돌렸습니다.")
+            return 0
+        if args.apply_file:
+            proposals = load_proposals(args.apply_file)
+        else:
+            aliases = load_aliases(args.aliases) if args.aliases else None
+            proposals, stats = propose_merges(args.db, args.threshold, aliases)
+            print(f"회사명 {stats['names']}개 (정규화 후 {stats['keys']}개), 비교한 후보 쌍 {stats['candidate_pairs']}개, "
+                  f"유사 쌍 {stats['matched_pairs']}개 (읽기 {stats['load_seconds']:.2f}초, 비교 {stats['match_seconds']:.2f}초)")
+            print(f"병합 제안 {len(proposals)}개 묶음:")
+            print_proposals(proposals)
+            if args.out:
+                save_proposals(args.out, proposals)
+                print(f"✅ 병합 제안을 {args.out}에 저장했습니다.")
+        if args.apply or args.apply_file:
+            include_fuzzy = bool(args.apply_file)
+            undo_path = args.undo_file or default_undo_path(args.db)
+            started = time.perf_counter()
+            updated = apply_merges(proposals, args.db, args.batch_size, include_fuzzy, undo_path)
+            print(f"✅ 연락처 {updated}명의 회사명을 대표 이름으로 바꿨습니다. ({time.perf_counter() - started:.2f}초)")
+            print(f"   되돌리려면: --undo {undo_path}")
+            fuzzy = sum(1 for p in proposals for v in p['variants'] if v['score'] != 1.0)
+            if not include_fuzzy and fuzzy:
+                print(f"⚠️ 유사도로 찾은 변형 {fuzzy}개는 적용하지 않았습니다. --out으로 저장해 검토한 뒤 --apply-file로 적용하세요.")
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"❌ 회사명 병합 중 오류 발생: {e}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,245 @@
+import sqlite3
+import os
+import csv
+import gzip
+import json
+import time
+import argparse
+from db_setup import db_connection, setup_database
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 출력은 선택 기능입니다.
+    np = None
+
+# fetchmany() 한 번에 가져올 행 수. 메모리 사용량은 테이블 크기가 아니라 이 값에만 비례합니다.
+DEFAULT_BATCH_SIZE = 5000
+EXPORT_FORMATS = ('csv', 'jsonl', 'npy')
+
+# 내보낼 데이터: 종류 -> SELECT 문. 증분 내보내기는 tasks.updated_at 기준으로만 지원합니다.
+EXPORT_QUERIES = {
+    'tasks': "SELECT * FROM tasks",
+    'contacts': "SELECT * FROM contacts",
+    # 참가자 ID와 기술 목록은 ';'로 이어 붙여 한 행으로 내보냅니다.
+    'projects': """SELECT p.id, p.name, p.start_date, p.end_date,
+                   (SELECT group_concat(contact_id, ';') FROM project_participants WHERE project_id = p.id) AS participant_ids,
+                   (SELECT group_concat(t.name, ';') FROM project_technologies pt JOIN technologies t ON t.id = pt.technology_id
+                    WHERE pt.project_id = p.id) AS technologies
+                   FROM projects p""",
+}
+INCREMENTAL_COLUMN = {'tasks': 'updated_at'}
+
+# NumPy 구조화 배열로 내보낼 숫자/날짜 컬럼 (NULL은 정수 -1, 날짜 NaT로 저장)
+NUMPY_COLUMNS = {
+    'tasks': [('id', 'i8'), ('contact_id', 'i8'), ('category_id', 'i8'), ('project_id', 'i8'),
+              ('task_date', 'M8[D]'), ('due_date', 'M8[D]'), ('created_at', 'M8[s]'), ('updated_at', 'M8[s]')],
+    'contacts': [('id', 'i8'), ('age', 'i8')],
+    'projects': [('id', 'i8'), ('start_date', 'M8[D]'), ('end_date', 'M8[D]')],
+}
+
+
+def _export_sql(kind, since):
+    """(SQL, 파라미터)를 반환합니다. since가 있으면 그 시각 이후(포함)에 수정된 행만 고릅니다."""
+    sql, params = f"SELECT * FROM ({EXPORT_QUERIES[kind]})", []
+    column = INCREMENTAL_COLUMN.get(kind)
+    if since is not None:
+        if column is None:
+            raise ValueError(f"'{kind}'는 증분 내보내기를 지원하지 않습니다. (지원: {list(INCREMENTAL_COLUMN)})")
+        # 같은 시각에 나중에 커밋된 행을 놓치지 않도록 경계값(>=)을 포함합니다. 받는 쪽은 id로 중복을 제거합니다.
+        sql += f" WHERE {column} >= ?"
+        params.append(since)
+    order = f"{column}, id" if column else "id"
+    return sql + f" ORDER BY {order}", params
+
+def _detect_format(path):
+    """파일 이름에서 (형식, gzip 압축 여부)를 판단합니다. 예: tasks.csv.gz -> ('csv', True)"""
+    name = path.lower()
+    compress = name.endswith('.gz')
+    if compress:
+        name = name[:-3]
+    fmt = os.path.splitext(name)[1].lstrip('.')
+    if fmt == 'ndjson':
+        fmt = 'jsonl'
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {path} ({', '.join(EXPORT_FORMATS)}만 가능, .gz 압축 가능)")
+    if fmt == 'npy' and compress:
+        raise ValueError("NumPy(.npy) 출력은 gzip 압축을 지원하지 않습니다.")
+    return fmt, compress
+
+def _open_text(path, compress):
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+def _iter_batches(cursor, batch_size):
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+# --- 형식별 쓰기 ---
+def _write_csv(cursor, f, batch_size):
+    writer = csv.writer(f)
+    writer.writerow([d[0] for d in cursor.description])
+    count = 0
+    for rows in _iter_batches(cursor, batch_size):
+        writer.writerows(rows)
+        count += len(rows)
+    return count
+
+def _write_jsonl(cursor, f, batch_size):
+    columns = [d[0] for d in cursor.description]
+    count = 0
+    for rows in _iter_batches(cursor, batch_size):
+        f.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows)
+        count += len(rows)
+    return count
+
+def _numpy_value(value, dtype):
+    if dtype == 'i8':
+        return -1 if value is None or value == '' else int(value)
+    if not value:
+        return np.datetime64('NaT')
+    try:
+        # 'YYYY-MM-DD HH:MM:SS'와 'YYYY-MM-DD'를 모두 초 단위로 읽은 뒤 컬럼 단위로 바꿉니다.
+        return np.datetime64(str(value).replace(' ', 'T'), 's').astype(dtype)
+    except ValueError:
+        return np.datetime64('NaT')
+
+def _write_numpy(conn, kind, sql, params, path, batch_size):
+    """
+    숫자/날짜 컬럼만 구조화 배열(.npy)로 씁니다.
+    행 수를 먼저 센 뒤 open_memmap으로 파일에 바로 채우므로, 배열 전체를 메모리에 올리지 않습니다.
+    """
+    if np is None:
+        raise RuntimeError("NumPy 출력에는 numpy 패키지가 필요합니다. (pip install numpy)")
+    fields = NUMPY_COLUMNS[kind]
+    dtype = np.dtype(fields)
+    total = conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+    array = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(total,))
+
+    column_list = ", ".join(name for name, _ in fields)
+    cursor = conn.execute(f"SELECT {column_list} FROM ({sql})", params)
+    count = 0
+    for rows in _iter_batches(cursor, batch_size):
+        array[count:count + len(rows)] = [
+            tuple(_numpy_value(value, t) for value, (_, t) in zip(row, fields)) for row in rows]
+        count += len(rows)
+    array.flush()
+    del array
+    return count
+
+
+# --- 공개 API ---
+def export_table(kind, path, db_name='sales_mobi_2025.db', since=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    kind('tasks', 'contacts', 'projects')의 전체(또는 since 이후 수정된) 행을 path로 내보냅니다.
+    형식은 확장자로 정합니다: .csv, .jsonl, .npy (csv/jsonl은 .gz를 붙이면 gzip 압축)
+    한 읽기 트랜잭션 안에서 fetchmany로 나누어 읽으므로 메모리 사용량이 일정하고 결과는 일관된 시점의 데이터입니다.
+    결과 통계 딕셔너리를 반환합니다. ('last_updated_at'은 다음 증분 내보내기의 since 값으로 사용)
+    """
+    if kind not in EXPORT_QUERIES:
+        raise ValueError(f"알 수 없는 데이터 종류입니다: {kind} ({', '.join(EXPORT_QUERIES)})")
+    fmt, compress = _detect_format(path)
+    sql, params = _export_sql(kind, since)
+    column = INCREMENTAL_COLUMN.get(kind)
+    last_updated_at = since
+    started = time.perf_counter()
+
+    with db_connection(db_name) as conn:
+        conn.execute("BEGIN")
+        try:
+            if fmt == 'npy':
+                count = _write_numpy(conn, kind, sql, params, path, batch_size)
+            else:
+                cursor = conn.execute(sql, params)
+                with _open_text(path, compress) as f:
+                    write = _write_csv if fmt == 'csv' else _write_jsonl
+                    count = write(cursor, f, batch_size)
+            if column and count:
+                # 같은 읽기 트랜잭션 안이므로 내보낸 행과 같은 시점의 최댓값입니다.
+                last_updated_at = conn.execute(f"SELECT MAX({column}) FROM ({sql})", params).fetchone()[0]
+        finally:
+            conn.rollback()
+
+    elapsed = time.perf_counter() - started
+    return {
+        'kind': kind, 'path': path, 'format': fmt + ('.gz' if compress else ''), 'rows': count,
+        'bytes': os.path.getsize(path), 'elapsed': elapsed,
+        'rows_per_sec': count / elapsed if elapsed else 0.0,
+        'since': since, 'last_updated_at': last_updated_at,
+    }
+
+def load_state(state_path):
+    if state_path and os.path.exists(state_path):
+        with open(state_path, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def save_state(state_path, state):
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, state_path)
+
+def export_all(out_dir, fmt='csv', compress=False, db_name='sales_mobi_2025.db', state_path=None,
+               batch_size=DEFAULT_BATCH_SIZE):
+    """
+    모든 종류를 out_dir에 <종류>.<형식>[.gz]로 내보냅니다. (야간 추출용)
+    state_path를 주면 업무는 지난번 내보내기 이후 수정된 행만 내보내고, 끝난 뒤 기준 시각을 기록합니다.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    state = load_state(state_path)
+    results = []
+    for kind in EXPORT_QUERIES:
+        path = os.path.join(out_dir, f"{kind}.{fmt}" + ('.gz' if compress else ''))
+        since = state.get(kind) if kind in INCREMENTAL_COLUMN else None
+        result = export_table(kind, path, db_name=db_name, since=since, batch_size=batch_size)
+        results.append(result)
+        if state_path and result['last_updated_at'] is not None:
+            state[kind] = result['last_updated_at']
+            save_state(state_path, state)
+    return results
+
+def print_summary(result):
+    since = f", {result['since']} 이후" if result['since'] else ""
+    print(f"✅ {result['kind']} → {result['path']} ({result['format']}{since}): {result['rows']}행, "
+          f"{result['bytes'] / 1024:.1f}KB, {result['elapsed']:.2f}초 ({result['rows_per_sec']:.0f} rows/sec)")
+
+
+# --- CLI 실행 블록 ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="영업 관리 DB를 CSV/JSONL/NumPy 파일로 내보냅니다.")
+    parser.add_argument('kind', choices=list(EXPORT_QUERIES) + ['all'], help="내보낼 데이터 종류 (all: 전체)")
+    parser.add_argument('path', help="출력 파일 경로 (.csv, .jsonl, .npy, .gz 압축 가능). all이면 출력 폴더")
+    parser.add_argument('--db', default='sales_mobi_2025.db', help="원본 데이터베이스 파일")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv', help="all일 때 출력 형식")
+    parser.add_argument('--gzip', action='store_true', help="all일 때 gzip으로 압축")
+    parser.add_argument('--since', help="업무: 이 시각(updated_at) 이후 수정된 행만 내보내기")
+    parser.add_argument('--state', help="증분 내보내기 기준 시각을 저장할 JSON 파일")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="fetchmany 한 번에 읽을 행 수")
+    args = parser.parse_args(argv)
+
+    setup_database(db_name=args.db)
+    try:
+        if args.kind == 'all':
+            results = export_all(args.path, fmt=args.format, compress=args.gzip, db_name=args.db,
+                                 state_path=args.state, batch_size=args.batch_size)
+        else:
+            since = args.since or load_state(args.state).get(args.kind)
+            results = [export_table(args.kind, args.path, db_name=args.db, since=since, batch_size=args.batch_size)]
+            if args.state and results[0]['last_updated_at'] is not None:
+                state = load_state(args.state)
+                state[args.kind] = results[0]['last_updated_at']
+                save_state(args.state, state)
+    except (OSError, ValueError, RuntimeError, sqlite3.Error) as e:
+        print(f"❌ 내보내기 중 오류 발생: {e}")
+        return 1
+    for result in results:
+        print_summary(result)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,265 @@
+import sqlite3
+import os
+import re
+import time
+import heapq
+import atexit
+import argparse
+import threading
+from itertools import islice
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from db_setup import setup_database
+import db_search
+
+# 연도별 DB 파일 이름: sales_mobi_2025.db -> 2025
+YEAR_DB_PATTERN = re.compile(r'^sales_mobi_(\d{4})\.db$')
+# 커넥션 하나에 ATTACH할 수 있는 최대 DB 수 (SQLite 기본 컴파일 옵션 SQLITE_MAX_ATTACHED)
+MAX_ATTACHED = 10
+# 연도별 쿼리를 동시에 실행할 최대 스레드 수
+DEFAULT_MAX_WORKERS = 8
+# 쿼리 SQL에서 연도별 스키마 이름으로 바뀌는 자리 표시자. 예: "SELECT * FROM {db}.tasks"
+SCHEMA_PLACEHOLDER = '{db}'
+# 연합 조회에 필요한 최소 스키마 버전 (PRAGMA user_version, v2에서 전문 검색 색인 추가)
+MIN_SCHEMA_VERSION = 2
+
+
+def discover_year_databases(directory='.'):
+    """directory에서 sales_mobi_YYYY.db 파일을 찾아 {연도: 절대 경로}를 연도순으로 반환합니다."""
+    found = {}
+    for name in os.listdir(directory):
+        match = YEAR_DB_PATTERN.match(name)
+        if match:
+            found[int(match.group(1))] = os.path.abspath(os.path.join(directory, name))
+    return dict(sorted(found.items()))
+
+def prepare_year_databases(paths):
+    """
+    연도별 DB마다 setup_database()를 실행해 스키마(검색 색인 등)를 최신 버전으로 맞춥니다.
+    지난 연도 파일까지 마이그레이션(쓰기)하므로 조회 때는 자동으로 부르지 않고, 필요할 때 직접 호출합니다.
+    """
+    for path in paths.values():
+        setup_database(db_name=path)
+
+def read_schema_version(path):
+    """DB 파일을 읽기 전용으로 열어 스키마 버전(PRAGMA user_version)을 반환합니다."""
+    conn = sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+def split_by_schema_version(paths, min_version=MIN_SCHEMA_VERSION):
+    """
+    연도별 DB를 조회할 수 있는 것과 스키마가 오래된 것으로 나눠 ({연도: 경로}, {연도: 스키마 버전})을 반환합니다.
+    파일은 읽기 전용으로만 열고 마이그레이션하지 않습니다.
+    """
+    usable, outdated = {}, {}
+    for year, path in paths.items():
+        version = read_schema_version(path)
+        if version >= min_version:
+            usable[year] = path
+        else:
+            outdated[year] = version
+    return usable, outdated
+
+def schema_name(year):
+    return f"y{year}"
+
+def _sort_key(columns):
+    # SQLite는 NULL을 가장 작은 값으로 정렬하므로, 파이썬에서도 None이 먼저 오도록 (값 존재 여부, 값)으로 비교합니다.
+    return lambda row: tuple((row[c] is not None, row[c]) for c in columns)
+
+
+class FederatedDatabase:
+    """
+    연도별 DB 파일(sales_mobi_YYYY.db)을 하나처럼 조회하는 읽기 전용 연합(federation) 계층입니다.
+    - 작업 스레드마다 메모리 DB 커넥션을 열고, 연도별 파일을 y2025 같은 스키마 이름으로 읽기 전용 ATTACH합니다.
+      커넥션 하나에는 MAX_ATTACHED개까지만 붙일 수 있으므로, 연도가 더 많으면 MAX_ATTACHED개씩 묶어 커넥션을 나눕니다.
+    - 같은 쿼리를 연도마다 스레드 풀에서 동시에 실행합니다. (sqlite3는 쿼리 실행 중 GIL을 놓습니다)
+    - 연도별 쿼리에는 LIMIT(limit + offset)를 붙여 필요한 만큼만 읽고(LIMIT pushdown),
+      이미 정렬된 연도별 결과를 heapq.merge로 합치며 앞에서부터 필요한 개수만 꺼냅니다.
+      그래서 전체 응답 시간은 연도 수가 아니라 가장 느린 연도 하나의 조회 시간에 가깝습니다.
+
+    사용 예:
+        federation = get_federation('.')
+        rows = federation.search("클라우드 전환", kinds=['task'], limit=20)
+    """
+
+    def __init__(self, paths, max_workers=None):
+        self.paths = dict(sorted(paths.items()))
+        # 결과의 정렬 키가 같으면 최근 연도가 먼저 오도록 연도 역순으로 병합합니다.
+        self.years = sorted(self.paths, reverse=True)
+        years = list(self.paths)
+        self._groups = [years[i:i + MAX_ATTACHED] for i in range(0, len(years), MAX_ATTACHED)]
+        self._group_of = {year: i for i, group in enumerate(self._groups) for year in group}
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        workers = max_workers or min(DEFAULT_MAX_WORKERS, max(1, len(years)))
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='federation')
+        self.stats = {'queries': 0, 'year_queries': 0, 'rows_read': 0, 'connections': 0}
+
+    # --- 내부 헬퍼 ---
+    def _connection(self, year):
+        """현재 스레드에서 year가 속한 묶음의 ATTACH 커넥션을 반환합니다. (처음이면 엽니다)"""
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        group = self._group_of[year]
+        conn = connections.get(group)
+        if conn is None:
+            conn = sqlite3.connect('file::memory:', uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            for attached in self._groups[group]:
+                conn.execute(f"ATTACH DATABASE ? AS {schema_name(attached)}",
+                             (f"file:{quote(self.paths[attached])}?mode=ro",))
+            connections[group] = conn
+            with self._lock:
+                self._connections.append(conn)
+                self.stats['connections'] += 1
+        return conn
+
+    def _query_year(self, year, sql, params, limit):
+        conn = self._connection(year)
+        sql = sql.replace(SCHEMA_PLACEHOLDER, schema_name(year))
+        if limit is not None:
+            sql, params = sql + " LIMIT ?", list(params) + [limit]
+        rows = [dict(row, year=year) for row in conn.execute(sql, params)]
+        with self._lock:
+            self.stats['year_queries'] += 1
+            self.stats['rows_read'] += len(rows)
+        return rows
+
+    # --- 공개 API ---
+    def query(self, sql, params=(), key_columns=('id',), reverse=False, limit=None, offset=0, years=None):
+        """
+        sql을 연도마다 실행하고 key_columns 순으로 병합한 결과(딕셔너리 목록, 'year' 포함)를 반환합니다.
+        - sql의 테이블 이름 앞에는 '{db}.'를 붙입니다. 예: "SELECT * FROM {db}.tasks ORDER BY created_at DESC, id DESC"
+        - sql은 key_columns 순(reverse=True면 역순)으로 정렬되어 있어야 하며, LIMIT은 여기서 붙입니다.
+        """
+        years = [y for y in self.years if years is None or y in years]
+        pushdown = None if limit is None else limit + offset
+        futures = [self._pool.submit(self._query_year, year, sql, params, pushdown) for year in years]
+        results = [future.result() for future in futures]
+        with self._lock:
+            self.stats['queries'] += 1
+        merged = heapq.merge(*results, key=_sort_key(key_columns), reverse=reverse)
+        return list(islice(merged, offset, None if limit is None else offset + limit))
+
+    def search(self, query, kinds=None, limit=20, offset=0, years=None):
+        """
+        모든 연도의 업무/연락처/프로젝트를 전문 검색합니다. (db_search.search와 같은 형식 + 'year')
+        bm25 점수는 연도별 색인 통계로 계산되므로, 연도가 다른 결과끼리의 순위는 근사값입니다.
+        """
+        built = db_search.build_search_sql(query, kinds, schema=SCHEMA_PLACEHOLDER)
+        if built is None:
+            return []
+        sql, params = built
+        return self.query(sql, params, key_columns=('score', 'kind', 'id'), limit=limit, offset=offset, years=years)
+
+    def recent_tasks(self, status=None, assignee=None, limit=20, offset=0, years=None):
+        """모든 연도의 업무를 최근 등록순으로 반환합니다."""
+        clauses, params = [], []
+        if status:
+            clauses.append("current_status = ?")
+            params.append(status)
+        if assignee:
+            clauses.append("assignee = ?")
+            params.append(assignee)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT * FROM {SCHEMA_PLACEHOLDER}.tasks {where} ORDER BY created_at DESC, id DESC"
+        return self.query(sql, params, key_columns=('created_at', 'id'), reverse=True,
+                          limit=limit, offset=offset, years=years)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats.update({'years': sorted(self.paths), 'attach_groups': len(self._groups)})
+        return stats
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+_federations = {}
+_federations_lock = threading.Lock()
+
+def get_federation(directory='.', **options):
+    """
+    directory의 연도별 DB 파일들에 대한 공유 연합 객체를 반환합니다. (options는 처음 만들 때만 적용)
+    스키마 버전이 MIN_SCHEMA_VERSION보다 낮은 파일은 빼고 조회합니다.
+    """
+    path = os.path.abspath(directory)
+    with _federations_lock:
+        federation = _federations.get(path)
+        if federation is None:
+            usable, _ = split_by_schema_version(discover_year_databases(path))
+            federation = _federations[path] = FederatedDatabase(usable, **options)
+        return federation
+
+def close_all_federations():
+    with _federations_lock:
+        for federation in _federations.values():
+            federation.close()
+        _federations.clear()
+
+atexit.register(close_all_federations)
+
+
+# --- CLI 실행 블록 ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="연도별 DB 파일(sales_mobi_YYYY.db)을 한 번에 조회합니다.")
+    parser.add_argument('command', choices=['years', 'search', 'tasks'], help="실행할 작업")
+    parser.add_argument('query', nargs='?', default='', help="search: 검색어")
+    parser.add_argument('--dir', default='.', help="연도별 DB 파일이 있는 폴더")
+    parser.add_argument('--kinds', nargs='+', choices=list(db_search.SEARCH_TARGETS), help="search: 검색 대상")
+    parser.add_argument('--status', help="tasks: 이 상태의 업무만")
+    parser.add_argument('--assignee', help="tasks: 이 담당자의 업무만")
+    parser.add_argument('--years', type=int, nargs='+', help="조회할 연도 (기본값: 전체)")
+    parser.add_argument('--limit', type=int, default=20, help="최대 결과 수")
+    args = parser.parse_args(argv)
+
+    paths = discover_year_databases(args.dir)
+    if not paths:
+        print(f"❌ {os.path.abspath(args.dir)}에서 연도별 DB 파일을 찾지 못했습니다.")
+        return 1
+    # 지난 연도 파일은 마이그레이션하지 않고 읽기 전용으로만 확인합니다.
+    paths, outdated = split_by_schema_version(paths)
+    for year, version in outdated.items():
+        print(f"⚠️ {year}년 DB는 스키마 버전 {version}이라 건너뜁니다. "
+              f"(필요: {MIN_SCHEMA_VERSION} 이상, setup_database로 업그레이드하세요)")
+    if args.command == 'years':
+        for year, path in paths.items():
+            print(f"  {year}: {path} ({os.path.getsize(path) / 1024:.1f}KB)")
+        return 0
+    if not paths:
+        print("❌ 조회할 수 있는 연도별 DB가 없습니다.")
+        return 1
+
+    federation = get_federation(args.dir)
+    started = time.perf_counter()
+    try:
+        if args.command == 'search':
+            rows = federation.search(args.query, kinds=args.kinds, limit=args.limit, years=args.years)
+        else:
+            rows = federation.recent_tasks(args.status, args.assignee, limit=args.limit, years=args.years)
+    except sqlite3.Error as e:
+        print(f"❌ 연합 조회 중 오류 발생: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+    for row in rows:
+        if args.command == 'search':
+            print(f"  [{row['year']}] [{row['kind']}] ID {row['id']}: {row['title']}")
+        else:
+            print(f"  [{row['year']}] #{row['id']} {row['created_at']} {row['assignee']} "
+                  f"{row['current_status']} - {row['task_description']}")
+    print(f"{len(paths)}개 연도에서 {len(rows)}건 ({elapsed * 1000:.1f}ms)")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
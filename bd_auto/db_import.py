@@ -0,0 +1,380 @@
+import sqlite3
+import os
+import re
+import csv
+import json
+import time
+import argparse
+from datetime import datetime
+from itertools import islice
+from db_setup import db_connection, setup_database
+from db_manager import resolve_technology_ids
+from db_migrations import normalize_technology_name
+
+# 대량 입력 시 한 트랜잭션에 묶을 기본 행 수
+DEFAULT_CHUNK_SIZE = 1000
+# IN (...) 조회 한 번에 넣을 최대 파라미터 수
+LOOKUP_BATCH_SIZE = 500
+
+STATUS_OPTIONS = ['To Do', 'In Progress', 'Done', 'Pending']
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+# --- 입력 파일 읽기 ---
+def csv_records(f):
+    """
+    CSV 파일에서 (레코드가 시작하는 파일 줄 번호, 행 딕셔너리)를 차례로 돌려줍니다.
+    따옴표 안에 줄바꿈이 있으면 한 레코드가 여러 줄이므로 레코드 번호가 아닌 csv 모듈의 줄 번호를 씁니다.
+    """
+    reader = csv.DictReader(f)
+    while True:
+        line_no = reader.line_num + 1
+        row = next(reader, None)
+        if row is None:
+            return
+        yield line_no, row
+
+def read_records(path):
+    """
+    CSV 또는 JSONL 파일을 읽어 (파일 줄 번호, 딕셔너리)를 돌려주는 제너레이터입니다.
+    JSON으로 읽을 수 없는 줄은 가져오기 전체를 멈추지 않도록 딕셔너리 대신 ValueError 객체로 돌려주며,
+    import_file()은 이를 해당 줄의 오류로 기록합니다.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        if ext == '.csv':
+            yield from csv_records(f)
+        elif ext in ('.jsonl', '.ndjson'):
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, ValueError(f"JSON으로 읽을 수 없습니다: {e}")
+        else:
+            raise ValueError(f"지원하지 않는 파일 형식입니다: {ext} (csv, jsonl만 가능)")
+
+
+# --- 값 정리 및 유효성 검사 ---
+def _text(record, key, required=False):
+    value = record.get(key)
+    value = '' if value is None else str(value).strip()
+    if required and not value:
+        raise ValueError(f"'{key}' 값은 필수입니다.")
+    return value
+
+def _optional(record, key):
+    """빈 문자열은 NULL로 저장합니다."""
+    return _text(record, key) or None
+
+def _date(record, key, required=False):
+    value = _text(record, key, required)
+    if value:
+        try:
+            datetime.strptime(value, '%Y-%m-%d')
+        except ValueError:
+            raise ValueError(f"'{key}' 값은 YYYY-MM-DD 형식이어야 합니다: {value}")
+    return value or None
+
+def _email(record, key):
+    value = _text(record, key)
+    if value and not EMAIL_PATTERN.match(value):
+        raise ValueError(f"올바르지 않은 이메일 형식입니다: {value}")
+    return value or None
+
+def _list(record, key):
+    """JSONL의 리스트 또는 CSV의 ';' / ',' 구분 문자열을 리스트로 바꿉니다."""
+    value = record.get(key)
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        items = value
+    else:
+        items = re.split(r'[;,]', str(value))
+    return [str(item).strip() for item in items if str(item).strip()]
+
+def validate_contact(record):
+    age = _text(record, 'age')
+    if age and not age.isdigit():
+        raise ValueError(f"'age' 값은 숫자여야 합니다: {age}")
+    return {
+        'person_name': _text(record, 'person_name', required=True),
+        'company_name': _text(record, 'company_name', required=True),
+        'email': _email(record, 'email'),
+        'phone': _optional(record, 'phone'),
+        'age': int(age) if age else None,
+        'department': _optional(record, 'department'),
+        'position': _optional(record, 'position'),
+        'notes': _optional(record, 'notes'),
+    }
+
+def validate_project(record):
+    return {
+        'name': _text(record, 'name', required=True),
+        'start_date': _date(record, 'start_date'),
+        'end_date': _date(record, 'end_date'),
+        # 참가자는 연락처 ID 또는 이메일로 지정합니다.
+        'participants': _list(record, 'participants'),
+        'technologies': _list(record, 'technologies'),
+    }
+
+def validate_task(record):
+    status = _text(record, 'current_status') or 'To Do'
+    if status.lower() not in [opt.lower() for opt in STATUS_OPTIONS]:
+        raise ValueError(f"'current_status' 값은 {STATUS_OPTIONS} 중 하나여야 합니다: {status}")
+    return {
+        'task_date': _date(record, 'task_date', required=True),
+        'task_description': _text(record, 'task_description', required=True),
+        'current_status': status.title(),
+        'due_date': _date(record, 'due_date'),
+        'assignee': _text(record, 'assignee', required=True),
+        # 연락처는 contact_id 또는 contact_email, 프로젝트는 project_name으로 지정합니다.
+        'contact': _text(record, 'contact_id') or _email(record, 'contact_email'),
+        'category': _optional(record, 'category'),
+        'project': _optional(record, 'project_name'),
+    }
+
+VALIDATORS = {
+    'contacts': validate_contact,
+    'projects': validate_project,
+    'tasks': validate_task,
+}
+
+
+# --- 참조 해석 ---
+def _batched(items, size):
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+def _lookup(cursor, sql_template, column, keys):
+    """keys를 LOOKUP_BATCH_SIZE개씩 나눠 IN (...) 조회한 결과를 {key: id}로 반환합니다."""
+    found = {}
+    for batch in _batched(keys, LOOKUP_BATCH_SIZE):
+        placeholders = ', '.join('?' for _ in batch)
+        cursor.execute(sql_template.format(placeholders=placeholders), batch)
+        for row in cursor:
+            found[row[column]] = row['id']
+    return found
+
+def resolve_contacts(cursor, refs):
+    """연락처 참조(ID 또는 이메일)를 실제 contacts.id로 바꾸는 매핑을 반환합니다."""
+    refs = set(refs)
+    ids = {int(r) for r in refs if r.isdigit()}
+    emails = {r for r in refs if not r.isdigit()}
+    mapping = {}
+    for cid in _lookup(cursor, "SELECT id FROM contacts WHERE id IN ({placeholders})", 'id', ids):
+        mapping[str(cid)] = cid
+    mapping.update(_lookup(cursor, "SELECT id, email FROM contacts WHERE email IN ({placeholders})",
+                           'email', emails))
+    return mapping
+
+
+# --- 종류별 청크 쓰기 ---
+def _write_contacts(cursor, rows):
+    cursor.executemany('''INSERT OR IGNORE INTO contacts
+        (person_name, company_name, email, phone, age, department, position, notes)
+        VALUES (:person_name, :company_name, :email, :phone, :age, :department, :position, :notes)''', rows)
+    return cursor.rowcount, []
+
+def _write_projects(cursor, rows):
+    cursor.executemany("INSERT OR IGNORE INTO projects (name, start_date, end_date) "
+                       "VALUES (:name, :start_date, :end_date)", rows)
+    inserted = cursor.rowcount
+    # executemany는 lastrowid를 주지 않으므로 UNIQUE인 이름으로 ID를 다시 조회합니다.
+    project_ids = _lookup(cursor, "SELECT id, name FROM projects WHERE name IN ({placeholders})",
+                          'name', {r['name'] for r in rows})
+    contacts = resolve_contacts(cursor, {ref for r in rows for ref in r['participants']})
+
+    warnings, participants, technologies = [], [], []
+    for r in rows:
+        pid = project_ids[r['name']]
+        for ref in r['participants']:
+            cid = contacts.get(ref)
+            if cid is None:
+                warnings.append(f"프로젝트 '{r['name']}': 연락처 '{ref}'를 찾을 수 없어 건너뜁니다.")
+            else:
+                participants.append((pid, cid))
+        technologies.extend((pid, tech) for tech in r['technologies'])
+
+    cursor.executemany("INSERT OR IGNORE INTO project_participants (project_id, contact_id) VALUES (?, ?)",
+                       participants)
+    technology_ids = resolve_technology_ids(cursor, {tech for _, tech in technologies})
+    cursor.executemany("INSERT OR IGNORE INTO project_technologies (project_id, technology_id) VALUES (?, ?)",
+                       [(pid, technology_ids[key]) for pid, key in
+                        ((pid, normalize_technology_name(tech)) for pid, tech in technologies) if key])
+    return inserted, warnings
+
+def _write_tasks(cursor, rows):
+    contacts = resolve_contacts(cursor, {r['contact'] for r in rows if r['contact']})
+    projects = _lookup(cursor, "SELECT id, name FROM projects WHERE name IN ({placeholders})",
+                       'name', {r['project'] for r in rows if r['project']})
+    category_names = {r['category'] for r in rows if r['category']}
+    cursor.executemany("INSERT OR IGNORE INTO categories (name) VALUES (?)", [(c,) for c in category_names])
+    categories = _lookup(cursor, "SELECT id, name FROM categories WHERE name IN ({placeholders})",
+                         'name', category_names)
+
+    warnings, params = [], []
+    for r in rows:
+        contact_id = contacts.get(r['contact']) if r['contact'] else None
+        if r['contact'] and contact_id is None:
+            warnings.append(f"업무 '{r['task_description'][:20]}': 연락처 '{r['contact']}'를 찾을 수 없습니다.")
+        project_id = projects.get(r['project']) if r['project'] else None
+        if r['project'] and project_id is None:
+            warnings.append(f"업무 '{r['task_description'][:20]}': 프로젝트 '{r['project']}'를 찾을 수 없습니다.")
+        params.append((r['task_date'], r['task_description'], r['current_status'], r['due_date'],
+                       r['assignee'], contact_id, categories.get(r['category']), project_id))
+
+    cursor.executemany('''INSERT INTO tasks
+        (task_date, task_description, current_status, due_date, assignee, contact_id, category_id, project_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', params)
+    return cursor.rowcount, warnings
+
+WRITERS = {
+    'contacts': _write_contacts,
+    'projects': _write_projects,
+    'tasks': _write_tasks,
+}
+
+
+# --- 체크포인트 ---
+def default_checkpoint_path(path, kind):
+    return f"{path}.{kind}.checkpoint.json"
+
+def load_checkpoint(checkpoint_path, path, kind):
+    """같은 파일/종류에 대한 체크포인트가 있으면 이미 처리한 레코드 수를 반환합니다."""
+    if not os.path.exists(checkpoint_path):
+        return 0
+    with open(checkpoint_path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('source') != os.path.abspath(path) or data.get('kind') != kind:
+        return 0
+    return data.get('records_done', 0)
+
+def save_checkpoint(checkpoint_path, path, kind, records_done):
+    tmp_path = checkpoint_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'source': os.path.abspath(path),
+            'kind': kind,
+            'records_done': records_done,
+            'saved_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }, f)
+    # 쓰다가 중단되어도 이전 체크포인트가 깨지지 않도록 교체합니다.
+    os.replace(tmp_path, checkpoint_path)
+
+
+# --- 공개 API ---
+def import_file(path, kind, db_name='sales_mobi_2025.db', chunk_size=DEFAULT_CHUNK_SIZE,
+                resume=True, checkpoint_path=None, verbose=True):
+    """
+    CSV/JSONL 파일을 읽어 contacts, projects, tasks 중 하나의 테이블로 대량 입력합니다.
+    - 레코드를 chunk_size개씩 묶어 executemany로 쓰고, 청크마다 한 번 커밋합니다.
+    - 커밋할 때마다 체크포인트를 저장하므로 중단 후 다시 실행하면 이어서 진행합니다.
+    - 유효하지 않은 행은 건너뛰고 (파일 줄 번호, 사유)를 결과의 'errors'에 모읍니다.
+    결과로 처리 건수와 처리 속도 통계가 담긴 딕셔너리를 반환합니다.
+    """
+    if kind not in VALIDATORS:
+        raise ValueError(f"지원하지 않는 종류입니다: {kind} ({', '.join(VALIDATORS)})")
+    validate, write = VALIDATORS[kind], WRITERS[kind]
+    checkpoint_path = checkpoint_path or default_checkpoint_path(path, kind)
+    skip = load_checkpoint(checkpoint_path, path, kind) if resume else 0
+    if skip and verbose:
+        print(f"체크포인트에서 이어서 진행합니다: 앞의 {skip}건은 건너뜁니다.")
+
+    result = {'read': skip, 'inserted': 0, 'skipped': 0, 'errors': [], 'warnings': [],
+              'chunks': [], 'elapsed': 0.0}
+    started = time.perf_counter()
+    records = read_records(path)
+
+    with db_connection(db_name) as conn:
+        cursor = conn.cursor()
+        for _ in islice(records, skip):
+            pass
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            chunk_started = time.perf_counter()
+            rows = []
+            for line_no, record in chunk:
+                try:
+                    if isinstance(record, ValueError):
+                        raise record
+                    rows.append(validate(record))
+                except (ValueError, TypeError, AttributeError) as e:
+                    result['errors'].append((line_no, str(e)))
+            try:
+                inserted, warnings = write(cursor, rows) if rows else (0, [])
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            result['read'] += len(chunk)
+            save_checkpoint(checkpoint_path, path, kind, result['read'])
+
+            elapsed = time.perf_counter() - chunk_started
+            stats = {
+                'records': len(chunk),
+                'inserted': inserted,
+                'seconds': elapsed,
+                'rows_per_sec': len(chunk) / elapsed if elapsed else 0.0,
+            }
+            result['inserted'] += inserted
+            result['skipped'] += len(rows) - inserted
+            result['warnings'].extend(warnings)
+            result['chunks'].append(stats)
+            if verbose:
+                print(f"  청크 {len(result['chunks'])}: {stats['records']}건 읽음, {inserted}건 추가, "
+                      f"{elapsed:.3f}초 ({stats['rows_per_sec']:.0f} rows/sec)")
+
+    result['elapsed'] = time.perf_counter() - started
+    processed = result['read'] - skip
+    result['rows_per_sec'] = processed / result['elapsed'] if result['elapsed'] else 0.0
+    # 끝까지 처리했으므로 체크포인트는 더 이상 필요 없습니다.
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return result
+
+def print_summary(result):
+    print(f"✅ 가져오기 완료: {result['read']}건 읽음, {result['inserted']}건 추가, "
+          f"{result['skipped']}건 중복으로 건너뜀, {len(result['errors'])}건 오류 "
+          f"({result['elapsed']:.2f}초, {result['rows_per_sec']:.0f} rows/sec)")
+    for line_no, message in result['errors'][:10]:
+        print(f"  ❌ {line_no}번째 줄: {message}")
+    for message in result['warnings'][:10]:
+        print(f"  ⚠️ {message}")
+    hidden = len(result['errors']) + len(result['warnings']) - min(len(result['errors']), 10) \
+        - min(len(result['warnings']), 10)
+    if hidden > 0:
+        print(f"  ... 외 {hidden}건")
+
+
+# --- CLI 실행 블록 ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV/JSONL 파일을 영업 관리 DB로 대량 입력합니다.")
+    parser.add_argument('kind', choices=list(VALIDATORS), help="입력할 데이터 종류")
+    parser.add_argument('path', help="입력 파일 경로 (.csv 또는 .jsonl)")
+    parser.add_argument('--db', default='sales_mobi_2025.db', help="대상 데이터베이스 파일")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="트랜잭션당 행 수")
+    parser.add_argument('--checkpoint', help="체크포인트 파일 경로 (기본값: <입력 파일>.<종류>.checkpoint.json)")
+    parser.add_argument('--restart', action='store_true', help="체크포인트를 무시하고 처음부터 다시 입력")
+    args = parser.parse_args(argv)
+
+    setup_database(db_name=args.db)
+    try:
+        result = import_file(args.path, args.kind, db_name=args.db, chunk_size=args.chunk_size,
+                             resume=not args.restart, checkpoint_path=args.checkpoint)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"❌ 가져오기 중 오류 발생: {e}")
+        return 1
+    print_summary(result)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,263 @@
+import sqlite3
+import os
+import json
+import time
+import queue
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from db_setup import setup_database
+from db_import import VALIDATORS, WRITERS, csv_records, print_summary
+
+# 작업 프로세스 하나가 한 번에 파싱/검증할 레코드 수
+DEFAULT_SHARD_SIZE = 5000
+# 쓰기 프로세스가 한 트랜잭션으로 커밋할 최소 행 수
+DEFAULT_COMMIT_ROWS = 50000
+# 검증이 끝나 쓰기를 기다리는 묶음의 최대 개수 (넘으면 파싱 쪽이 기다립니다)
+DEFAULT_QUEUE_SIZE = 8
+
+_DONE = None
+
+
+# --- 입력 읽기 (메인 프로세스) ---
+def _read_shards(path, shard_size):
+    """
+    입력 파일을 [(파일 줄 번호, 항목), ...] 묶음으로 나눕니다. 줄 번호는 CSV와 JSONL 모두 파일 기준입니다.
+    JSONL은 JSON 해석까지 작업 프로세스에 맡기도록 원본 줄을 그대로 넘기고,
+    CSV는 따옴표 안의 줄바꿈 때문에 여기서 csv 모듈로 행을 나눈 딕셔너리를 넘깁니다.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in ('.csv', '.jsonl', '.ndjson'):
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {ext} (csv, jsonl만 가능)")
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        items = csv_records(f) if ext == '.csv' else enumerate(f, start=1)
+        while True:
+            shard = list(islice(items, shard_size))
+            if not shard:
+                return
+            yield shard
+
+
+# --- 파싱/검증 (작업 프로세스) ---
+def parse_and_validate(kind, items):
+    """한 묶음을 파싱/검증하고 (검증된 행 목록, [(파일 줄 번호, 오류)], 걸린 시간)을 반환합니다."""
+    started = time.perf_counter()
+    validate = VALIDATORS[kind]
+    rows, errors = [], []
+    for line_no, item in items:
+        try:
+            if isinstance(item, str):
+                item = item.strip()
+                if not item:
+                    continue
+                try:
+                    item = json.loads(item)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"JSON으로 읽을 수 없습니다: {e}") from None
+            rows.append(validate(item))
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append((line_no, str(e)))
+    return rows, errors, time.perf_counter() - started
+
+
+# --- 쓰기 (전용 프로세스) ---
+def _writer_main(db_name, kind, batches, results, commit_rows):
+    """
+    DB 커넥션을 소유하는 유일한 프로세스입니다.
+    큐에서 검증된 묶음을 받아 바로 쓰고, 쌓인 행이 commit_rows 이상이 되면 한 번에 커밋합니다.
+    """
+    stats = {'inserted': 0, 'rows': 0, 'warnings': [], 'commits': 0,
+             'wait_seconds': 0.0, 'write_seconds': 0.0, 'commit_seconds': 0.0}
+    write = WRITERS[kind]
+    pending = 0
+    conn = None
+    try:
+        conn = sqlite3.connect(db_name, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        cursor = conn.cursor()
+        while True:
+            waited = time.perf_counter()
+            rows = batches.get()
+            stats['wait_seconds'] += time.perf_counter() - waited
+            if rows is _DONE:
+                break
+            started = time.perf_counter()
+            inserted, warnings = write(cursor, rows)
+            stats['write_seconds'] += time.perf_counter() - started
+            stats['inserted'] += inserted
+            stats['rows'] += len(rows)
+            stats['warnings'].extend(warnings)
+            pending += len(rows)
+            if pending >= commit_rows:
+                started = time.perf_counter()
+                conn.commit()
+                stats['commit_seconds'] += time.perf_counter() - started
+                stats['commits'] += 1
+                pending = 0
+        started = time.perf_counter()
+        conn.commit()
+        stats['commit_seconds'] += time.perf_counter() - started
+        stats['commits'] += 1 if pending else 0
+        results.put(('ok', stats))
+    except Exception as e:
+        # 어떤 오류든 결과를 남겨야 메인 프로세스가 기다리지 않고 원인을 알 수 있습니다.
+        if conn is not None:
+            conn.rollback()
+        status = 'error' if isinstance(e, sqlite3.Error) else 'failed'
+        results.put((status, f"{type(e).__name__}: {e} (마지막 커밋 이후의 행은 롤백되었습니다)"))
+    finally:
+        if conn is not None:
+            conn.close()
+
+def _get_result(results, writer):
+    """쓰기 프로세스의 결과 (상태, 내용)를 기다립니다. 결과 없이 종료되면 RuntimeError를 냅니다."""
+    while True:
+        try:
+            return results.get(timeout=0.5)
+        except queue.Empty:
+            if not writer.is_alive():
+                # 종료 직전에 넣은 결과가 아직 파이프에 남아 있을 수 있으므로 한 번 더 확인합니다.
+                try:
+                    return results.get(timeout=0.5)
+                except queue.Empty:
+                    raise RuntimeError(f"쓰기 프로세스가 결과 없이 종료되었습니다. (exit code {writer.exitcode})")
+
+def _writer_failure(status, payload):
+    if status == 'error':
+        return sqlite3.OperationalError(payload)
+    return RuntimeError(f"쓰기 프로세스 오류: {payload}")
+
+def _put(batches, item, writer, results):
+    """
+    쓰기 프로세스가 살아 있는 동안 큐에 넣습니다. (큐가 가득 차면 기다립니다)
+    쓰기 프로세스가 멈췄으면 그 프로세스가 남긴 오류를 그대로 냅니다.
+    """
+    while True:
+        try:
+            batches.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            if not writer.is_alive():
+                raise _writer_failure(*_get_result(results, writer))
+
+
+# --- 공개 API ---
+def ingest_file(path, kind, db_name='sales_mobi_2025.db', workers=None, shard_size=DEFAULT_SHARD_SIZE,
+                commit_rows=DEFAULT_COMMIT_ROWS, queue_size=DEFAULT_QUEUE_SIZE, verbose=True):
+    """
+    CSV/JSONL 파일을 여러 프로세스로 파싱/검증하고, 하나의 쓰기 프로세스로 입력합니다.
+    - 파싱/검증은 db_import의 검증 함수를 ProcessPoolExecutor(workers개)에서 실행합니다.
+    - 검증된 묶음은 크기가 제한된 큐를 거쳐 쓰기 프로세스로 가며, 큐가 가득 차면 앞 단계가 기다립니다.
+      그래서 쓰기 속도를 넘어서는 만큼 메모리에 쌓이지 않습니다.
+    - 쓰기 프로세스는 commit_rows 행마다 커밋합니다. 중간에 실패하면 마지막 커밋 이후의 행만 롤백됩니다.
+    - 입력 순서는 유지됩니다. (같은 이메일이 여러 번 나오면 먼저 나온 행이 들어갑니다)
+    결과는 db_import.import_file과 같은 형식이며, 단계별 시간은 'stages'에 담깁니다.
+    """
+    if kind not in VALIDATORS:
+        raise ValueError(f"지원하지 않는 종류입니다: {kind} ({', '.join(VALIDATORS)})")
+    workers = workers or os.cpu_count() or 1
+    db_name = os.path.abspath(db_name)
+    # fork는 부모의 열린 SQLite 커넥션(커넥션 풀)을 복사하므로 항상 spawn으로 프로세스를 만듭니다.
+    ctx = multiprocessing.get_context('spawn')
+    batches = ctx.Queue(maxsize=queue_size)
+    results = ctx.Queue()
+    writer = ctx.Process(target=_writer_main, args=(db_name, kind, batches, results, commit_rows),
+                         name="ingest-writer", daemon=True)
+
+    result = {'read': 0, 'inserted': 0, 'skipped': 0, 'errors': [], 'warnings': [], 'elapsed': 0.0}
+    stages = {'read_seconds': 0.0, 'validate_cpu_seconds': 0.0, 'queue_wait_seconds': 0.0}
+    started = time.perf_counter()
+    writer.start()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            in_flight = deque()
+
+            def drain_one():
+                rows, errors, seconds = in_flight.popleft().result()
+                stages['validate_cpu_seconds'] += seconds
+                result['errors'].extend(errors)
+                if rows:
+                    waited = time.perf_counter()
+                    _put(batches, rows, writer, results)
+                    stages['queue_wait_seconds'] += time.perf_counter() - waited
+
+            shards = _read_shards(path, shard_size)
+            while True:
+                read_started = time.perf_counter()
+                shard = next(shards, None)
+                stages['read_seconds'] += time.perf_counter() - read_started
+                if shard is None:
+                    break
+                result['read'] += len(shard)
+                in_flight.append(pool.submit(parse_and_validate, kind, shard))
+                # 작업 프로세스 수의 두 배까지만 미리 보내 메모리 사용량을 제한합니다.
+                if len(in_flight) >= workers * 2:
+                    drain_one()
+            while in_flight:
+                drain_one()
+        _put(batches, _DONE, writer, results)
+        status, payload = _get_result(results, writer)
+    except BaseException:
+        # 커밋하지 않은 쓰기는 SQLite가 롤백하므로 쓰기 프로세스를 바로 멈춥니다.
+        writer.terminate()
+        raise
+    finally:
+        writer.join()
+
+    if status != 'ok':
+        raise _writer_failure(status, payload)
+    result['elapsed'] = time.perf_counter() - started
+    result['inserted'] = payload['inserted']
+    result['skipped'] = payload['rows'] - payload['inserted']
+    result['warnings'] = payload['warnings']
+    result['rows_per_sec'] = result['read'] / result['elapsed'] if result['elapsed'] else 0.0
+    stages.update({
+        'workers': workers,
+        'writer_wait_seconds': payload['wait_seconds'],
+        'write_seconds': payload['write_seconds'],
+        'commit_seconds': payload['commit_seconds'],
+        'commits': payload['commits'],
+    })
+    result['stages'] = stages
+    if verbose:
+        print_stages(result)
+    return result
+
+def print_stages(result):
+    stages = result['stages']
+    print(f"=== 단계별 시간 (작업 프로세스 {stages['workers']}개, 전체 {result['elapsed']:.2f}초) ===")
+    print(f"  읽기(메인)            {stages['read_seconds']:8.2f}초")
+    print(f"  파싱/검증(CPU 합계)   {stages['validate_cpu_seconds']:8.2f}초")
+    print(f"  큐 대기(쓰기 병목)    {stages['queue_wait_seconds']:8.2f}초")
+    print(f"  쓰기 프로세스 대기    {stages['writer_wait_seconds']:8.2f}초 (입력 병목)")
+    print(f"  쓰기(executemany)     {stages['write_seconds']:8.2f}초")
+    print(f"  커밋 {stages['commits']}회            {stages['commit_seconds']:8.2f}초")
+
+
+# --- CLI 실행 블록 ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="여러 프로세스로 CSV/JSONL 파일을 검증하고 하나의 쓰기 프로세스로 입력합니다.")
+    parser.add_argument('kind', choices=list(VALIDATORS), help="입력할 데이터 종류")
+    parser.add_argument('path', help="입력 파일 경로 (.csv 또는 .jsonl)")
+    parser.add_argument('--db', default='sales_mobi_2025.db', help="대상 데이터베이스 파일")
+    parser.add_argument('--workers', type=int, help="파싱/검증 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, help="작업 프로세스당 한 번에 처리할 레코드 수")
+    parser.add_argument('--commit-rows', type=int, default=DEFAULT_COMMIT_ROWS, help="트랜잭션당 최소 행 수")
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE, help="쓰기 대기 큐에 쌓을 최대 묶음 수")
+    args = parser.parse_args(argv)
+
+    setup_database(db_name=args.db)
+    try:
+        result = ingest_file(args.path, args.kind, db_name=args.db, workers=args.workers, shard_size=args.shard_size,
+                             commit_rows=args.commit_rows, queue_size=args.queue_size)
+    except (OSError, ValueError, RuntimeError, sqlite3.Error) as e:
+        print(f"❌ 가져오기 중 오류 발생: {e}")
+        return 1
+    print_summary(result)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
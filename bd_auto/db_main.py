@@ -1,6 +1,18 @@
+import sys
+import time
+_IMPORT_STARTED = time.perf_counter()
+_MODULES_BEFORE_IMPORT = len(sys.modules)
+
+import argparse
 from datetime import datetime
 import db_setup
-import db_manager
+import db_pool
+import db_trace
+# db_manager, db_search, db_cache, db_reminders는 해당 메뉴를 처음 쓸 때 불러옵니다.
+# (cron처럼 짧게 실행되는 경우 시작 시간을 줄이기 위함이며, --profile-startup으로 확인할 수 있습니다)
+
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+_IMPORTED_MODULES = len(sys.modules) - _MODULES_BEFORE_IMPORT
 
 # --- 사용자 인터페이스(UI) 및 입력 처리 헬퍼 함수 ---
 def get_user_input(prompt_text, default_value=None, required=True):
@@ -13,12 +25,26 @@ def get_user_input(prompt_text, default_value=None, required=True):
         if required: print("이 값은 필수입니다. 다시 입력해주세요.")
         else: return ""
 
+# 연락처가 이보다 많으면 전체 목록 대신 검색(자동완성) 모드로 선택합니다.
+CONTACT_LIST_THRESHOLD = 20
+CONTACT_SEARCH_LIMIT = 10
+
+def print_contact_choices(contacts):
+    for c in contacts:
+        email = f" {c['email']}" if c['email'] else ""
+        print(f"  ID {c['id']}: {c['person_name']} ({c['company_name']}){email}")
+
 def select_contact_from_list(is_multiple=False):
     """사용자가 목록에서 연락처를 선택하거나 새로 추가하도록 돕는 UI 함수."""
+    import db_cache
+    import db_manager
+    # 연락처 캐시는 DB가 실제로 바뀌었을 때만(새 연락처 추가 등) 목록을 다시 읽습니다.
+    contact_cache = db_cache.get_contact_cache()
     while True: # 새 연락처 추가 후 목록을 다시 보여주기 위해 루프 사용
-        contacts = db_manager.get_all_contacts()
+        # 개수는 COUNT(*)로만 확인하고, 전체 목록은 실제로 목록을 보여줄 때만 읽습니다.
+        contact_count = db_manager.count_contacts()
         
-        if not contacts:
+        if not contact_count:
             print("\n현재 등록된 연락처가 없습니다.")
             choice = input("지금 새 연락처를 추가하시겠습니까? (y/n): ").strip().lower()
             if choice == 'y':
@@ -27,37 +53,53 @@ def select_contact_from_list(is_multiple=False):
             else:
                 return None # 사용자가 추가를 원치 않으면 None을 반환합니다.
         
-        print("\n--- 연락처 목록 ---")
-        for c in contacts:
-            print(f"  ID {c['id']}: {c['person_name']} ({c['company_name']})")
+        # 연락처가 많으면 전부 출력하지 않고, 이름/회사명/이메일 앞부분으로 검색해서 고르게 합니다.
+        search_mode = contact_count > CONTACT_LIST_THRESHOLD
+        if search_mode:
+            print(f"\n--- 연락처 검색 (등록된 연락처 {contact_count}명) ---")
+            print("이름, 회사명, 이메일의 앞부분을 입력하면 일치하는 연락처를 보여줍니다.")
+        else:
+            print("\n--- 연락처 목록 ---")
+            print_contact_choices(contact_cache.all())
         
         prompt = "연결할 연락처의 ID를 입력하세요"
         if is_multiple: prompt += " (쉼표로 구분)"
+        if search_mode: prompt += " (검색어 입력 시 검색)"
         prompt += " (또는 'new'를 입력하여 새로 추가)"
 
-        ids_str = input(f"{prompt}: ").strip().lower()
+        while True:
+            user_input = input(f"{prompt}: ").strip()
+            ids_str = user_input.lower()
 
-        if ids_str == 'new':
-            run_add_contact_flow()
-            continue # 새 연락처 추가 후 목록을 다시 보여주기 위해 루프를 다시 시작합니다.
+            if ids_str == 'new':
+                run_add_contact_flow()
+                break # 새 연락처 추가 후 목록을 다시 보여주기 위해 바깥 루프로 돌아갑니다.
 
-        selected_ids = [int(i.strip()) for i in ids_str.split(',') if i.strip().isdigit()]
-        
-        if not selected_ids:
-            print("올바른 ID나 'new'를 입력해주세요.")
-            continue
-
-        # 유효성 검사 (실제 존재하는 ID인지 확인)
-        valid_ids = [c['id'] for c in contacts]
-        if all(sid in valid_ids for sid in selected_ids):
-            return selected_ids if is_multiple else selected_ids[0]
-        else:
-            print("목록에 없는 ID가 포함되어 있습니다. 다시 입력해주세요.")
+            selected_ids = [int(i.strip()) for i in ids_str.split(',') if i.strip().isdigit()]
+            
+            if not selected_ids:
+                if search_mode and user_input:
+                    matches = db_manager.search_contacts_by_prefix(user_input, limit=CONTACT_SEARCH_LIMIT)
+                    if matches:
+                        print_contact_choices(matches)
+                    else:
+                        print(f"'{user_input}'(으)로 시작하는 연락처가 없습니다.")
+                else:
+                    print("올바른 ID나 'new'를 입력해주세요.")
+                continue
+
+            # 유효성 검사 (실제 존재하는 ID인지 확인). 검색 모드에서는 캐시를 채우지 않고 DB에서 직접 확인합니다.
+            exists = db_manager.contacts_exist(selected_ids) if search_mode else contact_cache.has_ids(selected_ids)
+            if exists:
+                return selected_ids if is_multiple else selected_ids[0]
+            else:
+                print("목록에 없는 ID가 포함되어 있습니다. 다시 입력해주세요.")
 
 # --- 메뉴 실행 함수 ---
 
 def run_add_contact_flow():
     """연락처 추가 과정을 진행하는 함수."""
+    import db_manager
     print("\n=== 새 연락처 추가 ===")
     contact_details = {
         'person_name': get_user_input("이름 (필수)"),
@@ -73,6 +115,7 @@ def run_add_contact_flow():
 
 def run_add_project_flow():
     """프로젝트 추가 과정을 진행하는 함수."""
+    import db_manager
     print("\n=== 새 프로젝트 추가 ===")
     project_details = {
         'name': get_user_input("프로젝트명 (필수)"),
@@ -91,14 +134,10 @@ def run_add_project_flow():
 
     db_manager.add_project(project_details)
 
-def run_view_projects_flow():
-    """프로젝트 목록을 조회하고 출력하는 함수."""
-    print("\n=== 전체 프로젝트 목록 ===")
-    project_details = db_manager.get_all_projects_with_details()
-    if not project_details:
-        print("저장된 프로젝트가 없습니다.")
-        return
-        
+PROJECTS_PAGE_SIZE = 20
+
+def print_project_details(project_details):
+    """프로젝트 상세 정보 목록을 출력하는 함수."""
     for detail in project_details:
         p = detail['project']
         participants = detail['participants']
@@ -115,18 +154,108 @@ def run_view_projects_flow():
         print(f"  관련 기술: {', '.join(tech_list) if tech_list else '없음'}")
     print("-" * 25)
 
+def run_view_projects_flow():
+    """프로젝트 목록을 페이지 단위로 조회하고 출력하는 함수."""
+    import db_manager
+    print("\n=== 전체 프로젝트 목록 ===")
+    page = 0
+    while True:
+        project_details = db_manager.get_all_projects_with_details(
+            limit=PROJECTS_PAGE_SIZE, offset=page * PROJECTS_PAGE_SIZE)
+        if not project_details:
+            if page == 0:
+                print("저장된 프로젝트가 없습니다.")
+            return
+
+        print(f"[{page + 1} 페이지]")
+        print_project_details(project_details)
+
+        if len(project_details) < PROJECTS_PAGE_SIZE:
+            return
+        choice = input("다음 페이지를 보시겠습니까? (y/n): ").strip().lower()
+        if choice != 'y':
+            return
+        page += 1
+
+SEARCH_PAGE_SIZE = 10
+SEARCH_KIND_LABELS = {'task': '업무', 'contact': '연락처', 'project': '프로젝트'}
+
+def run_search_flow():
+    """업무 내용, 연락처, 프로젝트명을 통합 검색하는 함수."""
+    import db_search
+    print("\n=== 통합 검색 ===")
+    query = get_user_input("검색어 (여러 단어는 공백으로 구분)")
+    page = 0
+    while True:
+        results = db_search.search(query, limit=SEARCH_PAGE_SIZE, offset=page * SEARCH_PAGE_SIZE)
+        if not results:
+            print("검색 결과가 없습니다." if page == 0 else "더 이상 결과가 없습니다.")
+            return
+
+        print(f"[{page + 1} 페이지]")
+        for r in results:
+            print(f"  [{SEARCH_KIND_LABELS[r['kind']]}] ID {r['id']}: {r['title']}")
+            if r['snippet'] and r['snippet'] != r['title']:
+                print(f"      {r['snippet']}")
+
+        if len(results) < SEARCH_PAGE_SIZE:
+            return
+        choice = input("다음 페이지를 보시겠습니까? (y/n): ").strip().lower()
+        if choice != 'y':
+            return
+        page += 1
+
+REMINDER_DAYS = 7
+
+def run_reminders_flow():
+    """담당자별 지연/마감 임박 업무를 보여주는 함수."""
+    import db_reminders
+    print(f"\n=== 마감 알림 (오늘부터 {REMINDER_DAYS}일) ===")
+    db_reminders.print_reminders(db_reminders.get_due_reminders(REMINDER_DAYS), REMINDER_DAYS)
+
+
+def print_startup_profile(timings):
+    total = _IMPORT_SECONDS + sum(timings.values())
+    print("=== 시작 시간 ===")
+    print(f"  모듈 import      {_IMPORT_SECONDS * 1000:8.2f}ms (새로 불러온 모듈 {_IMPORTED_MODULES}개)")
+    print(f"  쿼리 추적 설정   {timings['trace'] * 1000:8.2f}ms")
+    print(f"  스키마 확인      {timings['setup'] * 1000:8.2f}ms")
+    print(f"  합계             {total * 1000:8.2f}ms (파이썬 인터프리터 시작 시간 제외)")
+
 
 # --- 메인 실행 블록 ---
-def main():
-    # 프로그램 시작 시 데이터베이스 구조 확인 및 생성
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="영업 및 프로젝트 관리 시스템")
+    parser.add_argument('--profile-startup', action='store_true', help="import/초기화 시간을 출력하고 종료")
+    parser.add_argument('--trace', action='store_true', help="쿼리 추적을 켜고 느린 쿼리를 slow_queries.log에 기록")
+    parser.add_argument('--trace-params', action='store_true',
+                        help="--trace와 함께 로그에 파라미터 값까지 기록 (개인정보가 포함될 수 있음)")
+    args = parser.parse_args(argv)
+
+    timings = {}
+    started = time.perf_counter()
+    if args.trace or args.trace_params:
+        # 느린 쿼리(100ms 이상)는 slow_queries.log에 기록하고, 쿼리 통계는 메뉴 8번에서 확인합니다.
+        db_trace.enable(slow_ms=100.0, log_path='slow_queries.log', log_params=args.trace_params)
+    timings['trace'] = time.perf_counter() - started
+
+    # 프로그램 시작 시 데이터베이스 구조 확인 및 생성 (이미 최신 스키마면 바로 넘어갑니다)
+    started = time.perf_counter()
     db_setup.setup_database(db_name='sales_mobi_2025.db')
+    timings['setup'] = time.perf_counter() - started
+    if args.profile_startup:
+        print_startup_profile(timings)
+        return 0
 
     while True:
         print("\n--- 영업 및 프로젝트 관리 시스템 ---")
         print("1. 프로젝트 추가")
         print("2. 전체 프로젝트 조회")
         print("3. 연락처 추가")
+        print("4. 통합 검색")
+        print("5. 마감 알림 보기")
         # 여기에 다른 메뉴들을 추가할 수 있습니다.
+        print("8. 쿼리 통계 보기")
         print("9. 종료")
         choice = input("원하는 작업의 번호를 입력하세요: ").strip()
 
@@ -136,11 +265,26 @@ def main():
             run_view_projects_flow()
         elif choice == '3':
             run_add_contact_flow()
+        elif choice == '4':
+            run_search_flow()
+        elif choice == '5':
+            run_reminders_flow()
+        elif choice == '8':
+            import db_cache
+            if db_trace.is_enabled():
+                db_trace.print_top_statements(n=10)
+            else:
+                print("쿼리 추적이 꺼져 있습니다. --trace 옵션으로 실행하면 쿼리 통계를 볼 수 있습니다.")
+            cache_stats = db_cache.get_contact_cache().get_stats()
+            print(f"[연락처 캐시] 적중 {cache_stats['hits']}회, 재로딩 {cache_stats['misses']}회, "
+                  f"적중률 {cache_stats['hit_rate']:.0%}, 캐시된 연락처 {cache_stats['size']}건")
         elif choice == '9':
+            db_pool.print_stats()
             print("프로그램을 종료합니다.")
             break
         else:
             print("잘못된 선택입니다. 다시 입력하세요.")
+    return 0
 
 if __name__ == '__main__':
-    main()
+    raise SystemExit(main())
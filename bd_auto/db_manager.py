@@ -1,94 +1,338 @@
 import sqlite3
 from datetime import datetime
-from db_setup import get_db_connection
+from db_setup import db_connection
+from db_migrations import normalize_technology_name
+import db_snapshot
 
-# --- 데이터 조회(Read) 함수들 ---
-def get_all_contacts():
-    conn = get_db_connection()
+# IN (...) 조회 한 번에 넣을 최대 파라미터 수
+LOOKUP_BATCH_SIZE = 500
+
+# --- 커넥션을 인자로 받는 쿼리 함수들 (동기 API와 db_async가 함께 사용) ---
+def query_contacts(conn):
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM contacts ORDER BY person_name")
-    contacts = cursor.fetchall()
-    conn.close()
-    return contacts
+    return cursor.fetchall()
+
+def query_contact_count(conn):
+    return conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+def query_missing_contact_ids(conn, contact_ids):
+    """contact_ids 중 contacts 테이블에 없는 ID 목록을 반환합니다."""
+    ids = list(dict.fromkeys(contact_ids))
+    found = set()
+    for i in range(0, len(ids), LOOKUP_BATCH_SIZE):
+        batch = ids[i:i + LOOKUP_BATCH_SIZE]
+        placeholders = ", ".join("?" * len(batch))
+        found.update(row[0] for row in conn.execute(f"SELECT id FROM contacts WHERE id IN ({placeholders})", batch))
+    return [cid for cid in ids if cid not in found]
+
+def query_projects_with_details(conn, limit=None, offset=0):
+    """
+    프로젝트 목록과 각 프로젝트의 참가자/기술 목록을 함께 반환합니다.
+    프로젝트 수와 관계없이 쿼리 3번으로 조회한 뒤, 자식 행을 한 번의 순회로 묶습니다.
+    limit을 지정하면 이름순으로 offset부터 limit개의 프로젝트만 조회합니다.
+    """
+    # SQLite에서 LIMIT -1은 '제한 없음'을 의미합니다.
+    page_params = (-1 if limit is None else limit, offset)
+    page_sql = "SELECT id FROM projects ORDER BY name LIMIT ? OFFSET ?"
 
-def get_all_projects_with_details():
-    conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM projects ORDER BY name")
+    cursor.execute("SELECT * FROM projects ORDER BY name LIMIT ? OFFSET ?", page_params)
     projects = cursor.fetchall()
-    
-    project_details = []
-    for p in projects:
-        # 참가자 목록 조회
-        cursor.execute("""
-            SELECT c.person_name, c.company_name FROM contacts c
-            JOIN project_participants pp ON c.id = pp.contact_id
-            WHERE pp.project_id = ?
-        """, (p['id'],))
-        participants = cursor.fetchall()
-        
-        # 기술 목록 조회
-        cursor.execute("SELECT technology_name FROM project_technologies WHERE project_id = ?", (p['id'],))
-        technologies = cursor.fetchall()
-        
-        project_details.append({
+    if not projects:
+        return []
+
+    # 참가자 목록을 한 번에 조회
+    cursor.execute(f"""
+        SELECT pp.project_id, c.person_name, c.company_name FROM project_participants pp
+        JOIN contacts c ON c.id = pp.contact_id
+        WHERE pp.project_id IN ({page_sql})
+    """, page_params)
+    participants_by_project = {}
+    for row in cursor:
+        participants_by_project.setdefault(row['project_id'], []).append(row)
+
+    # 기술 목록을 한 번에 조회
+    cursor.execute(f"""
+        SELECT pt.project_id, t.name AS technology_name FROM project_technologies pt
+        JOIN technologies t ON t.id = pt.technology_id
+        WHERE pt.project_id IN ({page_sql})
+        ORDER BY t.name
+    """, page_params)
+    technologies_by_project = {}
+    for row in cursor:
+        technologies_by_project.setdefault(row['project_id'], []).append(row)
+
+    return [
+        {
             'project': p,
-            'participants': participants,
-            'technologies': technologies
-        })
-        
-    conn.close()
-    return project_details
+            'participants': participants_by_project.get(p['id'], []),
+            'technologies': technologies_by_project.get(p['id'], [])
+        }
+        for p in projects
+    ]
 
-# --- 데이터 생성(Create) 함수들 ---
-def add_contact(details):
+def insert_contact(cursor, details):
+    """연락처 한 건을 추가하고 새 ID를 반환합니다. 커밋은 호출한 쪽에서 합니다."""
     sql = '''INSERT INTO contacts (person_name, company_name, email, phone, age, department, position, notes)
              VALUES (?, ?, ?, ?, ?, ?, ?, ?)'''
+    cursor.execute(sql, (details['person_name'], details['company_name'], details['email'],
+                         details['phone'], details['age'], details['department'],
+                         details['position'], details['notes']))
+    return cursor.lastrowid
+
+def resolve_technology_ids(cursor, names):
+    """
+    기술 이름 목록을 {정규화된 이름: 기술 ID}로 바꿉니다. 사전에 없는 기술은 한 번에 추가합니다.
+    표기(대소문자, 공백)가 달라도 같은 기술이면 같은 ID가 됩니다. 커밋은 호출한 쪽에서 합니다.
+    """
+    by_key = {}
+    for name in names:
+        key = normalize_technology_name(name)
+        if key:
+            by_key.setdefault(key, name.strip())
+    if not by_key:
+        return {}
+    cursor.executemany("INSERT INTO technologies (name, normalized_name) VALUES (?, ?) "
+                       "ON CONFLICT (normalized_name) DO NOTHING",
+                       [(name, key) for key, name in by_key.items()])
+    keys = list(by_key)
+    ids = {}
+    for i in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        batch = keys[i:i + LOOKUP_BATCH_SIZE]
+        cursor.execute(f"SELECT id, normalized_name FROM technologies WHERE normalized_name IN "
+                       f"({', '.join('?' for _ in batch)})", batch)
+        ids.update((row[1], row[0]) for row in cursor.fetchall())
+    return ids
+
+def insert_project(cursor, details):
+    """프로젝트와 참가자/기술 정보를 추가하고 새 프로젝트 ID를 반환합니다. 커밋은 호출한 쪽에서 합니다."""
+    # 1. 프로젝트 기본 정보 추가
+    cursor.execute("INSERT INTO projects (name, start_date, end_date) VALUES (?, ?, ?)",
+                   (details['name'], details['start_date'], details['end_date']))
+    project_id = cursor.lastrowid
+
+    # 2. 참가자 정보 추가
+    cursor.executemany("INSERT INTO project_participants (project_id, contact_id) VALUES (?, ?)",
+                       [(project_id, contact_id) for contact_id in details['participant_ids']])
+
+    # 3. 기술 정보 추가 (이름을 기술 ID로 한 번에 변환)
+    technology_ids = resolve_technology_ids(cursor, details['technologies'])
+    cursor.executemany("INSERT OR IGNORE INTO project_technologies (project_id, technology_id) VALUES (?, ?)",
+                       [(project_id, tech_id) for tech_id in technology_ids.values()])
+    return project_id
+
+def query_tasks(conn, status=None, assignee=None, limit=None, offset=0):
+    """업무 목록을 연락처/프로젝트 이름과 함께 등록순으로 반환합니다."""
+    clauses, params = [], []
+    if status:
+        clauses.append("t.current_status = ?")
+        params.append(status)
+    if assignee:
+        clauses.append("t.assignee = ?")
+        params.append(assignee)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT t.*, c.person_name, c.company_name, p.name AS project_name FROM tasks t
+        LEFT JOIN contacts c ON c.id = t.contact_id
+        LEFT JOIN projects p ON p.id = t.project_id
+        {where}
+        ORDER BY t.created_at, t.id LIMIT ? OFFSET ?
+    """, params + [-1 if limit is None else limit, offset])
+    return cursor.fetchall()
+
+def query_projects_by_technology(conn, technology_name):
+    """해당 기술을 쓰는 프로젝트 목록을 이름순으로 반환합니다. (표기 차이 무시, 역방향 인덱스 사용)"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT p.* FROM technologies t
+        JOIN project_technologies pt ON pt.technology_id = t.id
+        JOIN projects p ON p.id = pt.project_id
+        WHERE t.normalized_name = ?
+        ORDER BY p.name
+    """, (normalize_technology_name(technology_name),))
+    return cursor.fetchall()
+
+def query_top_technologies(conn, limit=10):
+    """프로젝트 수가 많은 기술 순으로 (id, name, project_count) 행을 반환합니다."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT t.id, t.name, c.project_count FROM (
+            SELECT technology_id, COUNT(*) AS project_count FROM project_technologies GROUP BY technology_id
+        ) c JOIN technologies t ON t.id = c.technology_id
+        ORDER BY c.project_count DESC, t.name LIMIT ?
+    """, (limit,))
+    return cursor.fetchall()
+
+# 접두어 검색의 상한값으로 쓰는 가장 큰 유니코드 문자 ('abc' 접두어 -> 'abc' <= 값 < 'abc\U0010FFFF')
+PREFIX_UPPER_BOUND = "\U0010FFFF"
+PREFIX_SEARCH_COLUMNS = ('person_name', 'company_name', 'email')
+
+def query_contacts_by_prefix(conn, prefix, limit=10):
+    """
+    이름, 회사명, 이메일 중 하나가 prefix로 시작하는 연락처를 최대 limit명 반환합니다. (대소문자 무시)
+    컬럼마다 COLLATE NOCASE 인덱스의 범위 검색으로 limit개까지만 읽으므로 테이블 크기와 관계없이 빠릅니다.
+    이름 일치, 회사명 일치, 이메일 일치 순으로 정렬하고 중복은 제거합니다.
+    """
+    prefix = prefix.strip()
+    if not prefix:
+        return []
+    selects = [
+        f"""SELECT * FROM (SELECT *, {rank} AS match_rank FROM contacts
+            WHERE {col} >= ? COLLATE NOCASE AND {col} < ? COLLATE NOCASE
+            ORDER BY {col} COLLATE NOCASE LIMIT ?)"""
+        for rank, col in enumerate(PREFIX_SEARCH_COLUMNS)
+    ]
+    params = [prefix, prefix + PREFIX_UPPER_BOUND, limit] * len(PREFIX_SEARCH_COLUMNS)
+    rows = conn.execute(" UNION ALL ".join(selects), params).fetchall()
+
+    seen, matches = set(), []
+    for row in rows:
+        if row['id'] not in seen:
+            seen.add(row['id'])
+            matches.append(row)
+    return matches[:limit]
+
+# --- 데이터 조회(Read) 함수들 ---
+def get_all_contacts():
+    with db_connection() as conn:
+        return query_contacts(conn)
+
+def count_contacts():
+    with db_connection() as conn:
+        return query_contact_count(conn)
+
+def contacts_exist(contact_ids):
+    """모든 ID가 실제로 존재하는지 전체 목록을 읽지 않고 확인합니다."""
+    with db_connection() as conn:
+        return not query_missing_contact_ids(conn, contact_ids)
+
+def search_contacts_by_prefix(prefix, limit=10):
+    """자동완성용 연락처 접두어 검색입니다. (query_contacts_by_prefix 참고)"""
+    with db_connection() as conn:
+        return query_contacts_by_prefix(conn, prefix, limit)
+
+def get_projects_by_technology(technology_name):
+    with db_connection() as conn:
+        return query_projects_by_technology(conn, technology_name)
+
+def get_top_technologies(limit=10):
+    with db_connection() as conn:
+        return query_top_technologies(conn, limit)
+
+def get_all_projects_with_details(limit=None, offset=0):
+    """프로젝트 상세 목록을 반환합니다. (query_projects_with_details 참고)"""
+    with db_connection() as conn:
+        return query_projects_with_details(conn, limit, offset)
+
+# --- 대시보드용 업무 집계 조회 ---
+# tasks를 GROUP BY로 훑지 않고, 트리거가 유지하는 집계 테이블(db_migrations.TASK_AGGREGATES)을 읽습니다.
+# 집계 테이블의 크기는 업무 수가 아니라 (상태 × 담당자) 같은 조합 수에만 비례합니다.
+DONE_STATUS = 'Done'
+
+def get_task_counts_by_status_assignee(status=None, assignee=None):
+    """{(상태, 담당자): 업무 수}를 반환합니다. status/assignee로 범위를 좁힐 수 있습니다."""
+    clauses, params = [], []
+    if status:
+        clauses.append("current_status = ?")
+        params.append(status)
+    if assignee:
+        clauses.append("assignee = ?")
+        params.append(assignee)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with db_connection() as conn:
+        rows = conn.execute(f"SELECT current_status, assignee, task_count FROM task_counts_by_status_assignee {where}",
+                            params).fetchall()
+    return {(row['current_status'], row['assignee']): row['task_count'] for row in rows}
+
+def get_open_task_counts_by_assignee():
+    """담당자별 미완료(Done이 아닌) 업무 수를 {담당자: 업무 수}로 반환합니다."""
+    with db_connection() as conn:
+        rows = conn.execute("""SELECT assignee, SUM(task_count) AS open_count FROM task_counts_by_status_assignee
+                               WHERE current_status <> ? GROUP BY assignee""", (DONE_STATUS,)).fetchall()
+    return {row['assignee']: row['open_count'] for row in rows}
+
+def get_task_counts_by_project(project_id=None):
+    """{프로젝트 ID: {상태: 업무 수}}를 반환합니다. 프로젝트가 없는 업무는 ID 0으로 집계됩니다."""
+    sql = "SELECT project_id, current_status, task_count FROM task_counts_by_project_status"
+    params = ()
+    if project_id is not None:
+        sql += " WHERE project_id = ?"
+        params = (project_id,)
+    counts = {}
+    with db_connection() as conn:
+        for row in conn.execute(sql, params):
+            counts.setdefault(row['project_id'], {})[row['current_status']] = row['task_count']
+    return counts
+
+def get_task_counts_by_due_week(from_week=None, to_week=None, open_only=True):
+    """
+    마감 주차(그 주 월요일, YYYY-MM-DD)별 업무 수를 {주차: 업무 수}로 반환합니다.
+    from_week/to_week(포함)로 범위를 정하며, 마감일이 없는 업무는 '' 키로 집계됩니다.
+    """
+    clauses, params = [], []
+    if open_only:
+        clauses.append("current_status <> ?")
+        params.append(DONE_STATUS)
+    if from_week:
+        clauses.append("due_week >= ?")
+        params.append(from_week)
+    if to_week:
+        clauses.append("due_week <= ?")
+        params.append(to_week)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with db_connection() as conn:
+        rows = conn.execute(f"""SELECT due_week, SUM(task_count) AS task_count FROM task_counts_by_due_week
+                                {where} GROUP BY due_week ORDER BY due_week""", params).fetchall()
+    return {row['due_week']: row['task_count'] for row in rows}
+
+# --- 리포트용 읽기 전용 함수들 ---
+# 운영 DB 대신 db_snapshot의 메모리 복제본에서 조회하므로 대화형 쓰기 작업과 경쟁하지 않습니다.
+# 결과는 최대 max_age초(기본값은 db_snapshot.DEFAULT_MAX_AGE) 전의 데이터일 수 있습니다.
+def get_report_contacts(max_age=None):
+    with db_snapshot.get_snapshot().connection(max_age) as conn:
+        return query_contacts(conn)
+
+def get_report_projects_with_details(limit=None, offset=0, max_age=None):
+    with db_snapshot.get_snapshot().connection(max_age) as conn:
+        return query_projects_with_details(conn, limit, offset)
+
+def get_report_tasks(status=None, assignee=None, limit=None, offset=0, max_age=None):
+    with db_snapshot.get_snapshot().connection(max_age) as conn:
+        return query_tasks(conn, status, assignee, limit, offset)
+
+def refresh_report_snapshot():
+    """리포트용 복제본을 지금 바로 갱신하고 걸린 시간(초)을 반환합니다."""
+    return db_snapshot.get_snapshot().refresh()
+
+# --- 데이터 생성(Create) 함수들 ---
+def add_contact(details):
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(sql, (details['person_name'], details['company_name'], details['email'], 
-                             details['phone'], details['age'], details['department'], 
-                             details['position'], details['notes']))
-        conn.commit()
+        with db_connection() as conn:
+            contact_id = insert_contact(conn.cursor(), details)
+            conn.commit()
         print(f"✅ 연락처 '{details['person_name']}'님이 성공적으로 추가되었습니다!")
-        return cursor.lastrowid
+        return contact_id
     except sqlite3.IntegrityError:
         print(f"❌ 오류: 해당 이메일({details['email']})을 가진 연락처가 이미 존재합니다.")
     except sqlite3.Error as e:
         print(f"❌ 데이터 삽입 중 오류 발생: {e}")
-    finally:
-        if conn: conn.close()
     return None
 
 def add_project(details):
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        # 트랜잭션 시작
-        cursor.execute("BEGIN")
-        
-        # 1. 프로젝트 기본 정보 추가
-        cursor.execute("INSERT INTO projects (name, start_date, end_date) VALUES (?, ?, ?)", 
-                       (details['name'], details['start_date'], details['end_date']))
-        project_id = cursor.lastrowid
-        
-        # 2. 참가자 정보 추가
-        for contact_id in details['participant_ids']:
-            cursor.execute("INSERT INTO project_participants (project_id, contact_id) VALUES (?, ?)", 
-                           (project_id, contact_id))
-            
-        # 3. 기술 정보 추가
-        for tech in details['technologies']:
-            cursor.execute("INSERT INTO project_technologies (project_id, technology_name) VALUES (?, ?)", 
-                           (project_id, tech))
-            
-        conn.commit()
-        print(f"✅ 프로젝트 '{details['name']}'이(가) 성공적으로 추가되었습니다!")
-    except sqlite3.Error as e:
-        conn.rollback() # 오류 발생 시 트랜잭션 롤백
-        print(f"❌ 프로젝트 추가 중 오류 발생: {e}")
-    finally:
-        if conn: conn.close()
+    with db_connection() as conn:
+        try:
+            cursor = conn.cursor()
+            # 트랜잭션 시작
+            cursor.execute("BEGIN")
+            project_id = insert_project(cursor, details)
+            conn.commit()
+            print(f"✅ 프로젝트 '{details['name']}'이(가) 성공적으로 추가되었습니다!")
+            return project_id
+        except sqlite3.Error as e:
+            conn.rollback() # 오류 발생 시 트랜잭션 롤백
+            print(f"❌ 프로젝트 추가 중 오류 발생: {e}")
+    return None
 
-# 여기에 update_task, delete_task 등의 다른 데이터 관리 함수들을 추가할 수 있습니다.
\ No newline at end of file
+# 여기에 update_task, delete_task 등의 다른 데이터 관리 함수들을 추가할 수 있습니다.
@@ -0,0 +1,187 @@
+import sqlite3
+import os
+import time
+import pathlib
+import argparse
+from itertools import islice
+from db_setup import db_connection, setup_database
+
+# bd_input_task.py가 사용하는 비정규화 업무 DB (스크립트 폴더 기준)
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sales_data_task.db')
+DEFAULT_CHUNK_SIZE = 5000
+LOOKUP_BATCH_SIZE = 500
+
+# 마이그레이션 보조 테이블 (대상 DB에 만듭니다)
+# - legacy_contact_map: 중복 제거 키 -> contacts.id (메모리 대신 DB에서 중복을 판별해 메모리 사용량을 일정하게 유지)
+# - legacy_migration_state: 원본 파일별로 마지막으로 옮긴 업무 ID (청크와 같은 트랜잭션에서 갱신)
+STATE_TABLES = [
+    '''CREATE TABLE IF NOT EXISTS legacy_contact_map (
+        dedup_key TEXT PRIMARY KEY,
+        contact_id INTEGER NOT NULL REFERENCES contacts (id) ON DELETE CASCADE
+    ) WITHOUT ROWID''',
+    '''CREATE TABLE IF NOT EXISTS legacy_migration_state (
+        source TEXT PRIMARY KEY,
+        last_task_id INTEGER NOT NULL,
+        migrated_tasks INTEGER NOT NULL,
+        updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )''',
+]
+
+def contact_key(row):
+    """연락처 중복 제거 키: 이메일이 있으면 이메일, 없으면 이름+회사명 (대소문자/앞뒤 공백 무시)."""
+    email = (row['contact_email'] or '').strip().lower()
+    if email:
+        return f"email:{email}"
+    name = (row['contact_person'] or '').strip().lower()
+    company = (row['company_name'] or '').strip().lower()
+    return f"name:{name}|{company}"
+
+def _batched(items, size):
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+def _lookup_keys(cursor, keys):
+    found = {}
+    for batch in _batched(keys, LOOKUP_BATCH_SIZE):
+        placeholders = ', '.join('?' for _ in batch)
+        cursor.execute(f"SELECT dedup_key, contact_id FROM legacy_contact_map WHERE dedup_key IN ({placeholders})",
+                       batch)
+        found.update((row['dedup_key'], row['contact_id']) for row in cursor)
+    return found
+
+def _create_contact(cursor, key, row):
+    """
+    새 연락처를 만들고 (ID, 새로 만들었는지)를 반환합니다.
+    같은 이메일의 연락처가 이미 있으면 (그 ID, False)를 반환합니다.
+    """
+    email = (row['contact_email'] or '').strip() or None
+    if email:
+        cursor.execute("SELECT id FROM contacts WHERE email = ? OR email = ?", (email, email.lower()))
+        existing = cursor.fetchone()
+        if existing:
+            return existing['id'], False
+    cursor.execute('''INSERT INTO contacts (person_name, company_name, email, phone)
+                      VALUES (?, ?, ?, ?)''',
+                   (row['contact_person'].strip(), row['company_name'].strip(), email,
+                    (row['contact_phone'] or '').strip() or None))
+    return cursor.lastrowid, True
+
+def _migrate_chunk(cursor, rows):
+    """한 청크의 업무를 옮기고 (새로 만든 연락처 수)를 반환합니다."""
+    keys = {}
+    for row in rows:
+        keys.setdefault(contact_key(row), row)
+    contact_ids = _lookup_keys(cursor, keys)
+
+    new_contacts = 0
+    new_map_rows = []
+    for key, row in keys.items():
+        if key not in contact_ids:
+            contact_ids[key], created = _create_contact(cursor, key, row)
+            new_map_rows.append((key, contact_ids[key]))
+            new_contacts += created
+    cursor.executemany("INSERT INTO legacy_contact_map (dedup_key, contact_id) VALUES (?, ?)", new_map_rows)
+
+    cursor.executemany('''INSERT INTO tasks
+        (task_date, task_description, current_status, due_date, assignee, contact_id, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', [
+        (row['task_date'], row['task_description'], row['current_status'], row['due_date'], row['assignee'],
+         contact_ids[contact_key(row)], row['created_at'], row['updated_at'])
+        for row in rows])
+    return new_contacts
+
+def migrate_legacy_tasks(source=DEFAULT_SOURCE, target='sales_mobi_2025.db', chunk_size=DEFAULT_CHUNK_SIZE,
+                         restart=False, verbose=True):
+    """
+    bd_input_task 형식(회사/담당자 정보가 업무마다 반복되는 tasks 테이블)의 데이터를
+    db_setup 스키마(contacts + tasks.contact_id)로 옮깁니다.
+    - 원본은 ID 순서로 chunk_size개씩 읽으므로 메모리 사용량은 청크 크기에만 비례합니다.
+    - 연락처는 이메일(없으면 이름+회사명) 기준으로 한 번만 만들고, 업무는 외래 키로 연결합니다.
+    - 청크마다 한 트랜잭션으로 커밋하며, 진행 위치도 같은 트랜잭션에 기록하므로
+      중단 후 다시 실행하면 이어서 진행합니다. (restart=True면 진행 위치를 무시합니다)
+    결과 통계 딕셔너리를 반환합니다.
+    """
+    source_key = os.path.abspath(source)
+    src = sqlite3.connect(pathlib.Path(source_key).as_uri() + "?mode=ro", uri=True)
+    src.row_factory = sqlite3.Row
+    result = {'migrated_tasks': 0, 'new_contacts': 0, 'chunks': 0, 'elapsed': 0.0}
+    started = time.perf_counter()
+
+    try:
+        with db_connection(target) as conn:
+            cursor = conn.cursor()
+            for sql in STATE_TABLES:
+                cursor.execute(sql)
+            if restart:
+                cursor.execute("DELETE FROM legacy_migration_state WHERE source = ?", (source_key,))
+            conn.commit()
+
+            cursor.execute("SELECT last_task_id, migrated_tasks FROM legacy_migration_state WHERE source = ?",
+                           (source_key,))
+            state = cursor.fetchone()
+            last_id = state['last_task_id'] if state else 0
+            if state and verbose:
+                print(f"이전 진행 위치(업무 ID {last_id}, {state['migrated_tasks']}건 완료)부터 이어서 진행합니다.")
+            total_before = state['migrated_tasks'] if state else 0
+
+            while True:
+                rows = src.execute("SELECT * FROM tasks WHERE id > ? ORDER BY id LIMIT ?",
+                                   (last_id, chunk_size)).fetchall()
+                if not rows:
+                    break
+                chunk_started = time.perf_counter()
+                try:
+                    new_contacts = _migrate_chunk(cursor, rows)
+                    last_id = rows[-1]['id']
+                    cursor.execute('''INSERT INTO legacy_migration_state (source, last_task_id, migrated_tasks)
+                                      VALUES (?, ?, ?)
+                                      ON CONFLICT (source) DO UPDATE SET
+                                          last_task_id = excluded.last_task_id,
+                                          migrated_tasks = excluded.migrated_tasks,
+                                          updated_at = CURRENT_TIMESTAMP''',
+                                   (source_key, last_id, total_before + result['migrated_tasks'] + len(rows)))
+                    conn.commit()
+                except sqlite3.Error:
+                    conn.rollback()
+                    raise
+
+                elapsed = time.perf_counter() - chunk_started
+                result['migrated_tasks'] += len(rows)
+                result['new_contacts'] += new_contacts
+                result['chunks'] += 1
+                if verbose:
+                    print(f"  청크 {result['chunks']}: 업무 {len(rows)}건, 새 연락처 {new_contacts}건, "
+                          f"{elapsed:.3f}초 ({len(rows) / elapsed if elapsed else 0:.0f} rows/sec)")
+    finally:
+        src.close()
+
+    result['elapsed'] = time.perf_counter() - started
+    result['rows_per_sec'] = result['migrated_tasks'] / result['elapsed'] if result['elapsed'] else 0.0
+    return result
+
+
+# --- CLI 실행 블록 ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="bd_input_task 업무 데이터를 정규화된 영업 관리 DB로 옮깁니다.")
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help="원본(비정규화) 업무 DB 파일")
+    parser.add_argument('--target', default='sales_mobi_2025.db', help="대상 데이터베이스 파일")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="트랜잭션당 업무 수")
+    parser.add_argument('--restart', action='store_true', help="진행 위치를 무시하고 처음부터 다시 옮기기 (이미 옮긴 업무는 중복되므로 빈 대상 DB에만 사용)")
+    args = parser.parse_args(argv)
+
+    setup_database(db_name=args.target)
+    try:
+        result = migrate_legacy_tasks(args.source, args.target, chunk_size=args.chunk_size, restart=args.restart)
+    except sqlite3.Error as e:
+        print(f"❌ 마이그레이션 중 오류 발생: {e}")
+        return 1
+    print(f"✅ 마이그레이션 완료: 업무 {result['migrated_tasks']}건, 새 연락처 {result['new_contacts']}건 "
+          f"({result['elapsed']:.2f}초, {result['rows_per_sec']:.0f} rows/sec)")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,484 @@
+import sqlite3
+import re
+import argparse
+import unicodedata
+from datetime import date
+
+def _fts_statements(table, columns):
+    """
+    table의 columns를 색인하는 외부 콘텐츠(external content) FTS5 테이블과 동기화 트리거를 만드는 SQL 목록입니다.
+    한국어는 형태소 분석 없이도 부분 일치가 되도록 trigram 토크나이저를 사용합니다.
+    """
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_values});
+        END""",
+        # 이미 저장된 행을 한 번에 색인합니다.
+        f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')",
+    ]
+
+# 트리거로 유지하는 업무 집계 테이블: 테이블 -> [(키 컬럼, tasks 행에서 키를 구하는 식)]
+# 식의 {row}는 트리거에서는 new/old, 재계산할 때는 tasks로 바뀝니다.
+# - 프로젝트가 없는 업무는 project_id 0으로 집계합니다.
+# - due_week는 마감일이 속한 주의 월요일(YYYY-MM-DD)이며, 마감일이 없거나 날짜 형식이 아니면 ''입니다.
+TASK_AGGREGATES = {
+    'task_counts_by_status_assignee': [
+        ('current_status', "{row}.current_status"),
+        ('assignee', "{row}.assignee"),
+    ],
+    'task_counts_by_project_status': [
+        ('project_id', "IFNULL({row}.project_id, 0)"),
+        ('current_status', "{row}.current_status"),
+    ],
+    'task_counts_by_due_week': [
+        ('due_week', "IFNULL(date({row}.due_date, '-6 days', 'weekday 1'), '')"),
+        ('current_status', "{row}.current_status"),
+    ],
+}
+# 집계 키에 영향을 주는 tasks 컬럼 (이 컬럼이 바뀔 때만 UPDATE 트리거가 실행됩니다)
+TASK_AGGREGATE_COLUMNS = ['current_status', 'assignee', 'project_id', 'due_date']
+
+def aggregate_keys(table, row):
+    return [(column, expr.format(row=row)) for column, expr in TASK_AGGREGATES[table]]
+
+def aggregate_rebuild_statements():
+    """집계 테이블을 tasks 기준으로 처음부터 다시 계산하는 SQL 목록입니다."""
+    statements = []
+    for table in TASK_AGGREGATES:
+        keys = aggregate_keys(table, 'tasks')
+        columns = ", ".join(c for c, _ in keys)
+        exprs = ", ".join(e for _, e in keys)
+        group_by = ", ".join(str(i) for i in range(1, len(keys) + 1))
+        statements.append(f"DELETE FROM {table}")
+        statements.append(f"INSERT INTO {table} ({columns}, task_count) "
+                          f"SELECT {exprs}, COUNT(*) FROM tasks GROUP BY {group_by}")
+    return statements
+
+def _aggregate_statements():
+    """집계 테이블과 tasks의 INSERT/UPDATE/DELETE 트리거, 초기 계산 SQL 목록입니다."""
+    statements, increments, decrements = [], [], []
+    for table in TASK_AGGREGATES:
+        columns = ", ".join(c for c, _ in TASK_AGGREGATES[table])
+        statements.append(f"""CREATE TABLE IF NOT EXISTS {table} (
+            {", ".join(f"{c} NOT NULL" for c, _ in TASK_AGGREGATES[table])},
+            task_count INTEGER NOT NULL,
+            PRIMARY KEY ({columns})
+        ) WITHOUT ROWID""")
+        new_values = ", ".join(e for _, e in aggregate_keys(table, 'new'))
+        increments.append(f"INSERT INTO {table} ({columns}, task_count) VALUES ({new_values}, 1) "
+                          f"ON CONFLICT ({columns}) DO UPDATE SET task_count = task_count + 1;")
+        old_match = " AND ".join(f"{c} = {e}" for c, e in aggregate_keys(table, 'old'))
+        decrements.append(f"UPDATE {table} SET task_count = task_count - 1 WHERE {old_match};\n"
+                          f"            DELETE FROM {table} WHERE {old_match} AND task_count <= 0;")
+
+    increment, decrement = "\n            ".join(increments), "\n            ".join(decrements)
+    statements += [
+        f"""CREATE TRIGGER IF NOT EXISTS tasks_agg_ai AFTER INSERT ON tasks BEGIN
+            {increment}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS tasks_agg_ad AFTER DELETE ON tasks BEGIN
+            {decrement}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS tasks_agg_au AFTER UPDATE OF {", ".join(TASK_AGGREGATE_COLUMNS)} ON tasks BEGIN
+            {decrement}
+            {increment}
+        END""",
+    ]
+    # 이미 저장된 업무를 한 번에 집계합니다.
+    return statements + aggregate_rebuild_statements()
+
+def normalize_technology_name(name):
+    """기술 이름 비교용 키: 유니코드 정규화(NFKC), 대소문자 통일(casefold), 공백 정리. 예: ' Kubernetes ' -> 'kubernetes'"""
+    return " ".join(unicodedata.normalize('NFKC', name).casefold().split())
+
+def _migrate_project_technologies(conn):
+    """기존 (project_id, technology_name) 행을 technologies 사전과 (project_id, technology_id) 연결로 옮깁니다."""
+    technology_ids = {}
+    links = []
+    for project_id, name in conn.execute("SELECT project_id, technology_name FROM project_technologies "
+                                         "WHERE technology_name IS NOT NULL ORDER BY rowid"):
+        key = normalize_technology_name(name)
+        if not key:
+            continue
+        if key not in technology_ids:
+            # 표기가 여러 가지면 처음 나온 표기를 표시용 이름으로 씁니다.
+            technology_ids[key] = conn.execute("INSERT INTO technologies (name, normalized_name) VALUES (?, ?)",
+                                               (name.strip(), key)).lastrowid
+        links.append((project_id, technology_ids[key]))
+    conn.executemany("INSERT OR IGNORE INTO project_technologies_v5 (project_id, technology_id) VALUES (?, ?)", links)
+
+# 변경 기록(CDC) 대상 테이블: 테이블 -> 행을 가리키는 키 컬럼 (최대 2개)
+# 연결 테이블은 rowid가 없거나(WITHOUT ROWID) 의미가 없으므로 기본 키 두 개를 그대로 기록합니다.
+CDC_TABLES = {
+    'contacts': ['id'],
+    'projects': ['id'],
+    'tasks': ['id'],
+    'project_participants': ['project_id', 'contact_id'],
+    'project_technologies': ['project_id', 'technology_id'],
+}
+
+def _cdc_statements():
+    """변경 기록 테이블과, 대상 테이블마다 INSERT/UPDATE/DELETE를 기록하는 트리거 SQL 목록입니다."""
+    statements = [
+        # AUTOINCREMENT: 오래된 기록을 지운 뒤에도 seq가 재사용되지 않고 계속 증가합니다.
+        """CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            op TEXT NOT NULL CHECK (op IN ('I', 'U', 'D')),
+            row_id INTEGER NOT NULL,
+            row_id2 INTEGER,
+            changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )""",
+        # 소비자별로 처리를 확인(ack)한 마지막 seq
+        """CREATE TABLE IF NOT EXISTS change_consumers (
+            name TEXT PRIMARY KEY,
+            acked_seq INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )""",
+        # 압축(compaction) 때 행별 마지막 기록을 찾는 데 사용
+        "CREATE INDEX IF NOT EXISTS idx_change_log_row ON change_log (table_name, row_id, row_id2, seq)",
+    ]
+    for table in CDC_TABLES:
+        statements.extend(_cdc_trigger_statements(table))
+    return statements
+
+def _cdc_trigger_statements(table, update_columns=None):
+    """
+    table의 INSERT/UPDATE/DELETE를 변경 기록에 남기는 트리거입니다.
+    UPDATE가 키(연결 테이블의 (project_id, contact_id) 등)를 바꾸면 옛 키는 'D'로도 기록해,
+    이미 옛 행을 받아 간 소비자가 그 행을 지울 수 있게 합니다.
+    update_columns를 주면 UPDATE 트리거는 그 컬럼을 SET하는 UPDATE에서만 실행됩니다.
+    """
+    keys = CDC_TABLES[table]
+    update_of = f" OF {', '.join(update_columns)}" if update_columns else ""
+
+    def values(row):
+        return ", ".join(f"{row}.{k}" for k in keys) + (", NULL" if len(keys) == 1 else "")
+
+    key_changed = " OR ".join(f"old.{k} IS NOT new.{k}" for k in keys)
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_cdc_i AFTER INSERT ON {table} BEGIN
+            INSERT INTO change_log (table_name, op, row_id, row_id2) VALUES ('{table}', 'I', {values('new')});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_cdc_u AFTER UPDATE{update_of} ON {table} BEGIN
+            INSERT INTO change_log (table_name, op, row_id, row_id2)
+                SELECT '{table}', 'D', {values('old')} WHERE {key_changed};
+            INSERT INTO change_log (table_name, op, row_id, row_id2) VALUES ('{table}', 'U', {values('new')});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_cdc_d AFTER DELETE ON {table} BEGIN
+            INSERT INTO change_log (table_name, op, row_id, row_id2) VALUES ('{table}', 'D', {values('old')});
+        END""",
+    ]
+
+def _recreate_tasks_cdc_update_trigger(conn):
+    """
+    tasks의 변경 기록 UPDATE 트리거가 updated_at만 바꾸는 UPDATE(tasks_updated_at 트리거)에서는 실행되지 않도록,
+    updated_at을 뺀 모든 컬럼에 대한 UPDATE OF 트리거로 다시 만듭니다. (tasks에 컬럼을 추가하면 다시 실행해야 합니다)
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(tasks)") if row[1] != 'updated_at']
+    conn.execute("DROP TRIGGER IF EXISTS tasks_cdc_u")
+    conn.execute(_cdc_trigger_statements('tasks', columns)[1])
+
+# 미완료 업무 중 마감일이 있는 업무 (마감 알림용 부분 인덱스의 조건)
+# 부분 인덱스는 쿼리의 WHERE에 이 조건이 그대로 들어 있어야 사용되므로, 조회할 때도 이 문자열을 씁니다.
+OPEN_DUE_TASK_CONDITION = "current_status != 'Done' AND due_date IS NOT NULL"
+DUE_DATE_PATTERN = re.compile(r"(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})|(\d{4})(\d{2})(\d{2})")
+
+def normalize_due_date(value):
+    """
+    마감일을 YYYY-MM-DD로 맞춥니다. 빈 값은 None, 날짜로 읽을 수 없는 값은 그대로 반환합니다.
+    예: '2025/3/7' -> '2025-03-07', '2025-03-07 18:00' -> '2025-03-07', '' -> None
+    """
+    if value is None or not str(value).strip():
+        return None
+    text = str(value).strip()
+    match = DUE_DATE_PATTERN.match(text)
+    if match:
+        year, month, day = (int(g) for g in match.groups() if g is not None)
+        try:
+            return date(year, month, day).isoformat()
+        except ValueError:
+            pass
+    return value
+
+def _normalize_due_dates(conn):
+    """이미 저장된 마감일을 normalize_due_date()로 정리합니다. (형식이 다른 값만 고칩니다)"""
+    updates = []
+    for task_id, due_date in conn.execute("SELECT id, due_date FROM tasks WHERE due_date IS NOT NULL"):
+        normalized = normalize_due_date(due_date)
+        if normalized != due_date:
+            updates.append((normalized, task_id))
+    conn.executemany("UPDATE tasks SET due_date = ? WHERE id = ?", updates)
+
+DUE_DATE_TRIGGERS = ['tasks_due_date_ai', 'tasks_due_date_au']
+
+def _due_date_sql(v):
+    """
+    normalize_due_date()와 같은 규칙을 SQL 식으로 만듭니다. (트리거는 파이썬 함수를 부를 수 없으므로)
+    구분자(-, /, .)를 '-'로 바꾼 뒤 'YYYY-M-D...'와 'YYYYMMDD'를 YYYY-MM-DD로 맞추고,
+    실제 날짜가 아니면(date()로 되돌린 값이 다르면) 원래 값을 그대로 둡니다.
+    """
+    return f"""(SELECT CASE WHEN trim({v}) = '' THEN NULL
+                     WHEN iso IS NOT NULL AND date(iso) = iso THEN iso
+                     ELSE {v} END
+              FROM (SELECT CASE
+                  WHEN t GLOB '[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]'
+                      THEN substr(t, 1, 4) || '-' || substr(t, 5, 2) || '-' || substr(t, 7, 2)
+                  WHEN t GLOB '[0-9][0-9][0-9][0-9]-[0-9]-[0-9]*' OR t GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9]*'
+                      THEN printf('%s-%02d-%02d', substr(t, 1, 4), CAST(substr(t, 6) AS INTEGER),
+                                  CAST(substr(t, instr(substr(t, 6), '-') + 6) AS INTEGER))
+                  END AS iso
+                  FROM (SELECT replace(replace(trim({v}), '/', '-'), '.', '-') AS t)))"""
+
+def _due_date_trigger_statements():
+    """
+    새로 저장되는 마감일을 normalize_due_date()와 같은 규칙으로 맞추는 트리거입니다.
+    집계/변경 기록 트리거보다 먼저 만들어야 합니다. (나중에 만든 트리거가 먼저 실행되므로, v11 참고)
+    빈 문자열은 NULL로, '2025/3/7', '20250307', '2025-03-07 18:00' 같은 값은 '2025-03-07'로 바꿉니다.
+    (get_user_input의 기본값 ''이 그대로 저장되어도 마감일 없는 업무로 처리됩니다)
+    """
+    statements = []
+    for name, event in zip(DUE_DATE_TRIGGERS, ('INSERT', 'UPDATE OF due_date')):
+        statements.append(f"""CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON tasks
+        WHEN new.due_date IS NOT {_due_date_sql('new.due_date')} BEGIN
+            UPDATE tasks SET due_date = {_due_date_sql('due_date')} WHERE id = new.id;
+        END""")
+    return statements
+
+# --- 버전별 스키마 마이그레이션 ---
+# (버전, 설명, 실행할 단계 목록) 형태로 순서대로 추가합니다.
+# 단계는 SQL 문자열이거나 커넥션을 인자로 받는 함수입니다.
+# 적용된 버전은 PRAGMA user_version에 기록되므로, 이미 적용된 단계는 다시 실행되지 않습니다.
+MIGRATIONS = [
+    (1, "조회/외래 키용 보조 인덱스 추가", [
+        # 외래 키(ON DELETE SET NULL) 처리와 연락처/프로젝트/카테고리별 업무 조회
+        "CREATE INDEX IF NOT EXISTS idx_tasks_contact_id ON tasks (contact_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks (project_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_category_id ON tasks (category_id)",
+        # 상태별 목록과 마감일 조회
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_due_date ON tasks (current_status, due_date)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date)",
+        # get_all_contacts의 ORDER BY person_name과 회사별 조회
+        "CREATE INDEX IF NOT EXISTS idx_contacts_person_name ON contacts (person_name)",
+        "CREATE INDEX IF NOT EXISTS idx_contacts_company_name ON contacts (company_name)",
+        # project_participants의 역방향 조회(연락처 → 프로젝트)와 ON DELETE CASCADE
+        "CREATE INDEX IF NOT EXISTS idx_project_participants_contact ON project_participants (contact_id, project_id)",
+    ]),
+    (2, "업무 내용/연락처/프로젝트명 전문 검색(FTS5) 색인 추가",
+        _fts_statements('tasks', ['task_description'])
+        + _fts_statements('contacts', ['person_name', 'company_name', 'notes'])
+        + _fts_statements('projects', ['name'])),
+    (3, "연락처 자동완성(접두어 검색)용 대소문자 무시 인덱스 추가", [
+        "CREATE INDEX IF NOT EXISTS idx_contacts_person_name_nocase ON contacts (person_name COLLATE NOCASE)",
+        "CREATE INDEX IF NOT EXISTS idx_contacts_company_name_nocase ON contacts (company_name COLLATE NOCASE)",
+        "CREATE INDEX IF NOT EXISTS idx_contacts_email_nocase ON contacts (email COLLATE NOCASE)",
+    ]),
+    (4, "대시보드용 업무 집계 테이블(상태×담당자, 프로젝트×상태, 마감 주차)과 트리거 추가",
+        _aggregate_statements()),
+    (5, "기술 이름 사전(technologies) 도입: project_technologies를 기술 ID로 연결하고 역방향 인덱스 추가", [
+        """CREATE TABLE IF NOT EXISTS technologies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            normalized_name TEXT NOT NULL UNIQUE
+        )""",
+        """CREATE TABLE project_technologies_v5 (
+            project_id INTEGER NOT NULL,
+            technology_id INTEGER NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE,
+            FOREIGN KEY (technology_id) REFERENCES technologies (id) ON DELETE CASCADE,
+            PRIMARY KEY (project_id, technology_id)
+        ) WITHOUT ROWID""",
+        _migrate_project_technologies,
+        "DROP TABLE project_technologies",
+        "ALTER TABLE project_technologies_v5 RENAME TO project_technologies",
+        # 기술 -> 프로젝트 역방향 조회와 기술별 프로젝트 수 집계
+        "CREATE INDEX IF NOT EXISTS idx_project_technologies_technology ON project_technologies (technology_id, project_id)",
+    ]),
+    (6, "증분 동기화용 변경 기록(CDC) 테이블과 트리거 추가", _cdc_statements()),
+    (7, "마감일 형식 정리와 미완료 업무 마감일 부분 인덱스(마감 알림용) 추가", [
+        _normalize_due_dates,
+        *_due_date_trigger_statements(),
+        f"CREATE INDEX IF NOT EXISTS idx_tasks_open_due_date ON tasks (due_date) WHERE {OPEN_DUE_TASK_CONDITION}",
+    ]),
+    (8, "마감일 트리거가 '/'와 '.' 구분 날짜, YYYYMMDD도 정리하도록 수정", [
+        *(f"DROP TRIGGER IF EXISTS {name}" for name in DUE_DATE_TRIGGERS),
+        *_due_date_trigger_statements(),
+        _normalize_due_dates,
+    ]),
+    (9, "업무 수정 시각(updated_at) 자동 갱신 트리거와 증분 내보내기용 인덱스 추가", [
+        # UPDATE 문이 updated_at을 직접 바꾸지 않았을 때만 현재 시각으로 갱신합니다.
+        # (이 트리거의 UPDATE는 updated_at만 SET하므로 집계/변경 기록 트리거는 다시 실행되지 않습니다, v12 참고)
+        """CREATE TRIGGER IF NOT EXISTS tasks_updated_at AFTER UPDATE ON tasks
+        WHEN new.updated_at IS old.updated_at BEGIN
+            UPDATE tasks SET updated_at = CURRENT_TIMESTAMP WHERE id = new.id;
+        END""",
+        # db_export의 증분 내보내기(WHERE updated_at >= ? ORDER BY updated_at, id)
+        "CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks (updated_at, id)",
+    ]),
+    (10, "변경 기록 UPDATE 트리거가 키가 바뀐 행의 옛 키를 삭제(D)로 기록하도록 수정", [
+        *(f"DROP TRIGGER IF EXISTS {table}_cdc_u" for table in CDC_TABLES),
+        *(_cdc_trigger_statements(table)[1] for table in CDC_TABLES),
+    ]),
+    # SQLite는 같은 이벤트의 트리거를 나중에 만든 것부터 실행합니다. v7/v8의 마감일 트리거가 집계/변경 기록
+    # 트리거보다 나중에 만들어져, 마감일을 고치는 UPDATE가 INSERT 집계보다 먼저 실행되며 집계가 어긋났습니다.
+    # 집계/변경 기록 트리거를 다시 만들어 가장 먼저 실행되게 하고, 어긋난 집계는 처음부터 다시 계산합니다.
+    (11, "업무 집계/변경 기록 트리거를 마감일 트리거보다 먼저 실행되도록 다시 만들고 집계 재계산", [
+        *(f"DROP TRIGGER IF EXISTS tasks_agg_{op}" for op in ('ai', 'ad', 'au')),
+        *(f"DROP TRIGGER IF EXISTS tasks_cdc_{op}" for op in ('i', 'u', 'd')),
+        *_aggregate_statements(),
+        *_cdc_trigger_statements('tasks'),
+    ]),
+    (12, "업무 수정 시각(updated_at)만 바뀌는 UPDATE는 변경 기록에 남기지 않도록 수정", [
+        _recreate_tasks_cdc_update_trigger,
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def apply_migrations(conn, verbose=True):
+    """
+    현재 user_version보다 높은 버전의 마이그레이션을 순서대로 적용합니다.
+    각 버전은 하나의 트랜잭션으로 실행되며, 실패하면 해당 버전 전체가 롤백됩니다.
+    적용한 마이그레이션 수를 반환합니다.
+    """
+    current = get_schema_version(conn)
+    applied = 0
+    for version, description, steps in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        applied += 1
+        if verbose:
+            print(f"  스키마 마이그레이션 v{version} 적용: {description}")
+    if applied:
+        # 새 인덱스에 대한 통계를 갱신해 쿼리 플래너가 활용하도록 합니다.
+        conn.execute("PRAGMA optimize")
+    return applied
+
+
+# --- 인덱스 사용 현황 보고 ---
+# db_manager 등에서 실제로 실행하는 대표 쿼리입니다. (설명, SQL)
+KNOWN_QUERIES = [
+    ("get_all_contacts", "SELECT * FROM contacts ORDER BY person_name"),
+    ("get_all_projects_with_details: 참가자",
+     "SELECT pp.project_id, c.person_name, c.company_name FROM project_participants pp "
+     "JOIN contacts c ON c.id = pp.contact_id WHERE pp.project_id IN (SELECT id FROM projects ORDER BY name LIMIT 20)"),
+    ("get_all_projects_with_details: 기술",
+     "SELECT pt.project_id, t.name FROM project_technologies pt JOIN technologies t ON t.id = pt.technology_id "
+     "WHERE pt.project_id IN (SELECT id FROM projects ORDER BY name LIMIT 20)"),
+    ("get_projects_by_technology",
+     "SELECT p.* FROM technologies t JOIN project_technologies pt ON pt.technology_id = t.id "
+     "JOIN projects p ON p.id = pt.project_id WHERE t.normalized_name = 'kubernetes'"),
+    ("get_top_technologies",
+     "SELECT technology_id, COUNT(*) FROM project_technologies GROUP BY technology_id"),
+    ("연락처 삭제 시 참가자 CASCADE", "SELECT 1 FROM project_participants WHERE contact_id = 1"),
+    ("연락처 삭제 시 업무 SET NULL", "SELECT 1 FROM tasks WHERE contact_id = 1"),
+    ("프로젝트 삭제 시 업무 SET NULL", "SELECT 1 FROM tasks WHERE project_id = 1"),
+    ("카테고리 삭제 시 업무 SET NULL", "SELECT 1 FROM tasks WHERE category_id = 1"),
+    ("상태별 업무 조회", "SELECT * FROM tasks WHERE current_status = 'To Do' ORDER BY due_date"),
+    ("마감일 범위 조회", "SELECT * FROM tasks WHERE due_date BETWEEN '2025-01-01' AND '2025-01-31'"),
+    ("마감 알림: 미완료 업무 마감일", f"SELECT id FROM tasks WHERE {OPEN_DUE_TASK_CONDITION} AND due_date <= '2025-02-01'"),
+    ("회사별 연락처 조회", "SELECT * FROM contacts WHERE company_name = 'x'"),
+    ("연락처 자동완성: 이름", "SELECT id FROM contacts WHERE person_name >= 'k' COLLATE NOCASE "
+                          "AND person_name < 'l' COLLATE NOCASE ORDER BY person_name COLLATE NOCASE LIMIT 10"),
+    ("연락처 자동완성: 회사", "SELECT id FROM contacts WHERE company_name >= 'k' COLLATE NOCASE "
+                          "AND company_name < 'l' COLLATE NOCASE ORDER BY company_name COLLATE NOCASE LIMIT 10"),
+    ("연락처 자동완성: 이메일", "SELECT id FROM contacts WHERE email >= 'k' COLLATE NOCASE "
+                           "AND email < 'l' COLLATE NOCASE ORDER BY email COLLATE NOCASE LIMIT 10"),
+]
+
+INDEX_IN_PLAN = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+
+def _index_sizes(conn):
+    """dbstat 가상 테이블로 인덱스별 디스크 사용량(바이트)을 구합니다. 지원하지 않으면 빈 딕셔너리를 반환합니다."""
+    try:
+        return {row[0]: row[1] for row in conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")}
+    except sqlite3.Error:
+        return {}
+
+def index_report(conn):
+    """
+    모든 인덱스의 테이블, 컬럼, 크기와 이를 사용하는 대표 쿼리 목록을 반환합니다.
+    SQLite는 인덱스 사용 횟수를 기록하지 않으므로, KNOWN_QUERIES의 실행 계획으로 사용 여부를 판단합니다.
+    """
+    sizes = _index_sizes(conn)
+    used_by = {}
+    for label, sql in KNOWN_QUERIES:
+        try:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+        except sqlite3.Error:
+            continue
+        for row in plan:
+            match = INDEX_IN_PLAN.search(row[3])
+            if match:
+                used_by.setdefault(match.group(1), set()).add(label)
+
+    report = []
+    for name, table in conn.execute(
+            "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' ORDER BY tbl_name, name"):
+        columns = [row[2] for row in conn.execute(f"PRAGMA index_info('{name}')")]
+        report.append({
+            'name': name,
+            'table': table,
+            'columns': columns,
+            'size_bytes': sizes.get(name),
+            'used_by': sorted(used_by.get(name, ())),
+        })
+    return report
+
+def print_index_report(conn):
+    print(f"=== 인덱스 현황 (스키마 버전 v{get_schema_version(conn)}) ===")
+    for item in index_report(conn):
+        size = f"{item['size_bytes'] / 1024:.1f} KB" if item['size_bytes'] is not None else "알 수 없음"
+        print(f"- {item['name']} ON {item['table']} ({', '.join(c or '?' for c in item['columns'])}) | 크기: {size}")
+        if item['used_by']:
+            for label in item['used_by']:
+                print(f"    사용 쿼리: {label}")
+        else:
+            print("    사용 쿼리: 없음")
+
+
+# --- CLI 실행 블록 ---
+def main(argv=None):
+    from db_setup import setup_database, db_connection
+
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션 적용 및 인덱스 사용 현황 보고")
+    parser.add_argument('--db', default='sales_mobi_2025.db', help="대상 데이터베이스 파일")
+    parser.add_argument('--report', action='store_true', help="인덱스 크기와 사용 현황을 출력")
+    args = parser.parse_args(argv)
+
+    setup_database(db_name=args.db)
+    if args.report:
+        with db_connection(args.db) as conn:
+            print_index_report(conn)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+import sqlite3
+import os
+import queue
+import threading
+import time
+import atexit
+from contextlib import contextmanager
+
+# 커넥션을 새로 열 때 한 번만 적용되는 기본 PRAGMA 목록입니다.
+DEFAULT_PRAGMAS = (
+    "PRAGMA foreign_keys = ON;",
+)
+
+# 모든 풀이 새 커넥션을 만들 때 사용하는 커넥션 클래스와 후처리 함수 목록입니다.
+# (예: db_trace가 쿼리 추적용 커넥션 클래스로 바꿔 끼웁니다)
+_connection_factory = sqlite3.Connection
+_connect_hooks = []
+
+def set_connection_factory(factory):
+    """이후 새로 여는 커넥션에 사용할 sqlite3.Connection 하위 클래스를 지정합니다."""
+    global _connection_factory
+    _connection_factory = factory or sqlite3.Connection
+
+def add_connect_hook(hook):
+    """이후 새로 여는 모든 커넥션에 대해 hook(conn)을 호출하도록 등록합니다."""
+    if hook not in _connect_hooks:
+        _connect_hooks.append(hook)
+
+def remove_connect_hook(hook):
+    if hook in _connect_hooks:
+        _connect_hooks.remove(hook)
+
+class ConnectionPool:
+    """
+    하나의 SQLite 파일에 대한 커넥션 풀입니다.
+    - 최대 size개의 커넥션을 열어두고 재사용합니다.
+    - PRAGMA 설정은 커넥션을 처음 열 때 한 번만 적용합니다.
+    - 오래 쉬었던 커넥션은 꺼낼 때 'SELECT 1'로 상태를 확인합니다.
+    - 같은 스레드에서 중첩해서 요청하면 이미 빌려간 커넥션을 그대로 돌려줍니다.
+    """
+
+    def __init__(self, db_path, size=5, pragmas=DEFAULT_PRAGMAS,
+                 health_check_interval=30.0, timeout=10.0, connect_hook=None):
+        self.db_path = db_path
+        self.size = size
+        self.pragmas = tuple(pragmas)
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        # 커넥션을 연 직후 추가 설정이 필요할 때 사용하는 콜백 (예: 추적 기능)
+        self.connect_hook = connect_hook
+
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._created = 0
+        self._closed = False
+        self.stats = {
+            'opened': 0,           # 새로 연 커넥션 수
+            'reused': 0,           # 풀에서 재사용한 횟수
+            'nested': 0,           # 같은 스레드에서 중첩 사용한 횟수
+            'waits': 0,            # 빈 커넥션을 기다린 횟수
+            'health_failures': 0,  # 상태 확인에 실패해 폐기한 커넥션 수
+            'closed': 0,           # 닫은 커넥션 수
+        }
+
+    # --- 내부 헬퍼 ---
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               factory=_connection_factory)
+        conn.row_factory = sqlite3.Row
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        for hook in _connect_hooks:
+            hook(conn)
+        if self.connect_hook:
+            self.connect_hook(conn)
+        with self._lock:
+            self.stats['opened'] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._created -= 1
+            self.stats['closed'] += 1
+
+    def _is_healthy(self, conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    # --- 공개 API ---
+    def acquire(self):
+        """풀에서 커넥션을 하나 꺼냅니다. 남는 커넥션이 없으면 새로 열거나 기다립니다."""
+        if self._closed:
+            raise sqlite3.ProgrammingError(f"이미 닫힌 커넥션 풀입니다: {self.db_path}")
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._created < self.size
+                    if can_open:
+                        self._created += 1
+                if can_open:
+                    try:
+                        return self._open()
+                    except sqlite3.Error:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                with self._lock:
+                    self.stats['waits'] += 1
+                try:
+                    conn, last_used = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        f"커넥션 풀 대기 시간 초과 ({self.timeout}초): {self.db_path}")
+
+            idle_for = time.monotonic() - last_used
+            if idle_for >= self.health_check_interval and not self._is_healthy(conn):
+                with self._lock:
+                    self.stats['health_failures'] += 1
+                self._discard(conn)
+                continue
+            with self._lock:
+                self.stats['reused'] += 1
+            return conn
+
+    def release(self, conn):
+        """커넥션을 풀에 돌려줍니다. 커밋되지 않은 트랜잭션은 롤백합니다."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        if self._closed:
+            self._discard(conn)
+            return
+        try:
+            self._idle.put_nowait((conn, time.monotonic()))
+        except queue.Full:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        with 문으로 커넥션을 빌려 쓰는 API입니다.
+        예외가 발생하면 롤백하고, 블록을 벗어나면 커넥션을 풀에 반납합니다.
+        """
+        current = getattr(self._local, 'conn', None)
+        if current is not None:
+            # 같은 스레드의 중첩 호출: 바깥 블록이 반납을 책임집니다.
+            with self._lock:
+                self.stats['nested'] += 1
+            yield current
+            return
+
+        conn = self.acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self.release(conn)
+
+    def close(self):
+        """풀에 남아 있는 모든 커넥션을 닫습니다."""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def get_stats(self):
+        """열린 커넥션 수와 재사용 횟수 등의 카운터를 반환합니다."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = self.size
+            stats['in_pool'] = self._idle.qsize()
+            stats['in_use'] = self._created - stats['in_pool']
+        return stats
+
+
+# --- 파일 경로별 풀 레지스트리 ---
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_name, **options):
+    """
+    db_name(파일 경로)에 해당하는 공유 풀을 반환합니다. 없으면 새로 만듭니다.
+    options는 풀을 처음 만들 때만 적용됩니다.
+    """
+    db_path = os.path.abspath(db_name)
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None or pool._closed:
+            pool = ConnectionPool(db_path, **options)
+            _pools[db_path] = pool
+        return pool
+
+def db_connection(db_name, **options):
+    """get_pool(db_name).connection()의 줄임 표현입니다."""
+    return get_pool(db_name, **options).connection()
+
+def get_all_stats():
+    """모든 풀의 통계를 {파일 경로: 통계} 형태로 반환합니다."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {path: pool.get_stats() for path, pool in pools}
+
+def print_stats():
+    """풀 통계를 사람이 읽기 쉬운 형태로 출력합니다."""
+    for path, s in get_all_stats().items():
+        print(f"[커넥션 풀] {os.path.basename(path)}: 새로 연결 {s['opened']}회, "
+              f"재사용 {s['reused']}회, 중첩 사용 {s['nested']}회, 대기 {s['waits']}회")
+
+def close_all_pools():
+    """프로그램 종료 시 모든 풀을 닫습니다."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+atexit.register(close_all_pools)
@@ -0,0 +1,242 @@
+import sqlite3
+import os
+import heapq
+import argparse
+import threading
+from datetime import date, timedelta
+from db_setup import db_connection, setup_database
+from db_migrations import OPEN_DUE_TASK_CONDITION
+from db_cdc import query_last_seq, iter_changes
+from db_manager import DONE_STATUS
+
+# 힙에 올려 둘 마감일 범위: 오늘부터 이 일수 뒤까지 (지난 마감일은 모두 포함)
+DEFAULT_HORIZON_DAYS = 30
+# 알림 목록의 기본 범위: 오늘부터 이 일수 뒤까지 마감인 업무
+DEFAULT_WITHIN_DAYS = 7
+# 힙과 함께 보관하는 업무 컬럼
+TASK_FIELDS = ['id', 'due_date', 'assignee', 'task_description', 'current_status']
+
+
+def _valid_date(value):
+    """YYYY-MM-DD 형식의 실제 날짜인지 확인합니다. (힙은 문자열 순서로 정렬하므로 다른 형식은 제외)"""
+    try:
+        return len(value) == 10 and date.fromisoformat(value) is not None
+    except (TypeError, ValueError):
+        return False
+
+
+class ReminderScheduler:
+    """
+    마감일 기준 최소 힙(min-heap)으로 지연/마감 임박 업무를 찾는 프로세스 내 알림 엔진입니다.
+    - 처음에는 부분 인덱스(idx_tasks_open_due_date)로 미완료 업무 중 horizon 안에 마감인 업무만 읽습니다.
+    - 그 뒤로는 tasks 전체를 다시 읽지 않고, 변경 기록(db_cdc)에서 바뀐 업무만 받아 힙을 고칩니다.
+    - 힙 항목은 (마감일, 업무 ID)입니다. 마감일이 바뀌거나 완료된 업무의 옛 항목은 지우지 않고,
+      꺼낼 때 현재 상태(_tasks)와 비교해 버립니다. (lazy deletion)
+    - 날짜가 바뀌면 horizon을 늘려 새로 범위에 들어온 업무만 추가로 읽습니다.
+
+    사용 예:
+        scheduler = get_scheduler()
+        for assignee, groups in scheduler.due_reminders(within_days=3).items(): ...
+    """
+
+    def __init__(self, db_name='sales_mobi_2025.db', horizon_days=DEFAULT_HORIZON_DAYS):
+        self.db_path = os.path.abspath(db_name)
+        self.horizon_days = horizon_days
+        self._lock = threading.Lock()
+        self._heap = []       # (due_date, task_id)
+        self._tasks = {}      # task_id -> 힙에 올라간 업무 (dict)
+        self._horizon = None  # 이 날짜(포함)까지 마감인 업무만 추적합니다. 'YYYY-MM-DD'
+        self._seq = None      # 반영한 마지막 변경 기록 seq
+        self.stats = {'loads': 0, 'loaded_rows': 0, 'changes': 0, 'stale_entries': 0}
+
+    # --- 힙 관리 (호출 전에 _lock을 잡고 있어야 합니다) ---
+    def _track(self, row):
+        """업무 행의 현재 상태를 반영합니다. 추적 대상이 아니면(완료, 마감일 없음, horizon 밖) 빠집니다."""
+        task_id, due_date = row['id'], row['due_date']
+        if (row['current_status'] == DONE_STATUS or not _valid_date(due_date)
+                or due_date > self._horizon):
+            self._tasks.pop(task_id, None)
+            return
+        old = self._tasks.get(task_id)
+        self._tasks[task_id] = {key: row[key] for key in TASK_FIELDS}
+        if old is None or old['due_date'] != due_date:
+            heapq.heappush(self._heap, (due_date, task_id))
+
+    def _is_current(self, entry):
+        task = self._tasks.get(entry[1])
+        return task is not None and task['due_date'] == entry[0]
+
+    def _compact(self):
+        """버려야 할 항목이 유효한 항목보다 많아지면 힙을 다시 만듭니다."""
+        if len(self._heap) > 2 * len(self._tasks) + 64:
+            self._heap = [(task['due_date'], task_id) for task_id, task in self._tasks.items()]
+            heapq.heapify(self._heap)
+
+    def _load_range(self, conn, after, until):
+        """마감일이 (after, until] 범위인 미완료 업무를 부분 인덱스로 읽어 힙에 올립니다."""
+        sql = f"SELECT {', '.join(TASK_FIELDS)} FROM tasks WHERE {OPEN_DUE_TASK_CONDITION} AND due_date <= ?"
+        params = [until]
+        if after is not None:
+            sql += " AND due_date > ?"
+            params.append(after)
+        count = 0
+        for row in conn.execute(sql, params):
+            self._track(row)
+            count += 1
+        self.stats['loaded_rows'] += count
+
+    def _reload(self, horizon):
+        """힙을 비우고 처음부터 다시 읽습니다. 읽은 시점의 seq부터 변경 기록을 이어 받습니다."""
+        self._heap, self._tasks, self._horizon = [], {}, horizon
+        with db_connection(self.db_path) as conn:
+            conn.execute("BEGIN")
+            try:
+                self._seq = query_last_seq(conn)
+                self._load_range(conn, None, horizon)
+            finally:
+                conn.rollback()
+        self.stats['loads'] += 1
+
+    def _extend(self, horizon):
+        # _track()이 새 horizon으로 비교하도록 범위를 읽기 전에 먼저 늘립니다.
+        after, self._horizon = self._horizon, horizon
+        with db_connection(self.db_path) as conn:
+            self._load_range(conn, after, horizon)
+
+    def _sync(self, horizon):
+        """변경 기록을 반영하고, horizon이 늘었다면 새로 범위에 들어온 업무를 읽습니다."""
+        if self._seq is None:
+            self._reload(horizon)
+            return
+        with db_connection(self.db_path) as conn:
+            last_seq = query_last_seq(conn)
+            first_seq = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+        if last_seq > self._seq and (first_seq is None or first_seq > self._seq + 1):
+            # 반영하지 않은 기록이 이미 지워졌다면(truncate_log) 변경을 놓쳤을 수 있으므로 다시 읽습니다.
+            self._reload(max(horizon, self._horizon))
+            return
+        for changes in iter_changes(self._seq, tables=['tasks'], with_rows=True, db_name=self.db_path):
+            for change in changes:
+                if change['row'] is None:
+                    self._tasks.pop(change['key'][0], None)
+                else:
+                    self._track(change['row'])
+            self.stats['changes'] += len(changes)
+            self._seq = changes[-1]['seq']
+        if horizon > self._horizon:
+            self._extend(horizon)
+        self._compact()
+
+    # --- 공개 API ---
+    def sync(self, today=None):
+        """DB 변경 사항을 힙에 반영합니다. 조회 함수들은 이 함수를 먼저 호출합니다."""
+        today = today or date.today()
+        with self._lock:
+            self._sync((today + timedelta(days=self.horizon_days)).isoformat())
+
+    def due_before(self, cutoff):
+        """마감일이 cutoff(포함, 'YYYY-MM-DD') 이전인 미완료 업무를 마감일 순으로 반환합니다. (sync()를 먼저 호출하세요)"""
+        with self._lock:
+            if self._seq is None:
+                self._reload(cutoff)
+            elif cutoff > self._horizon:
+                self._extend(cutoff)
+            # 범위 안의 항목만 꺼냈다가 다시 넣으므로 비용은 힙 크기가 아니라 결과 수에 비례합니다.
+            popped, tasks, seen = [], [], set()
+            while self._heap and self._heap[0][0] <= cutoff:
+                entry = heapq.heappop(self._heap)
+                if not self._is_current(entry) or entry in seen:
+                    self.stats['stale_entries'] += 1
+                    continue
+                seen.add(entry)
+                popped.append(entry)
+                tasks.append(dict(self._tasks[entry[1]]))
+            for entry in popped:
+                heapq.heappush(self._heap, entry)
+        return tasks
+
+    def due_reminders(self, within_days=DEFAULT_WITHIN_DAYS, assignee=None, today=None):
+        """
+        담당자별 알림 목록을 {담당자: {'overdue': [...], 'due_soon': [...]}}로 반환합니다.
+        - overdue: 마감일이 오늘 이전인 미완료 업무
+        - due_soon: 오늘부터 within_days일 뒤까지 마감인 미완료 업무
+        각 업무에는 'days_left'(마감까지 남은 일수, 지났으면 음수)가 담깁니다.
+        """
+        today = today or date.today()
+        self.sync(today)
+        reminders = {}
+        for task in self.due_before((today + timedelta(days=within_days)).isoformat()):
+            if assignee and task['assignee'] != assignee:
+                continue
+            task['days_left'] = (date.fromisoformat(task['due_date']) - today).days
+            groups = reminders.setdefault(task['assignee'], {'overdue': [], 'due_soon': []})
+            groups['overdue' if task['days_left'] < 0 else 'due_soon'].append(task)
+        return reminders
+
+    def next_due(self, today=None):
+        """추적 중인 업무 중 마감일이 가장 빠른 업무를 반환합니다. (다음 알림 시각 계산용, 없으면 None)"""
+        self.sync(today)
+        with self._lock:
+            while self._heap and not self._is_current(self._heap[0]):
+                heapq.heappop(self._heap)
+                self.stats['stale_entries'] += 1
+            return dict(self._tasks[self._heap[0][1]]) if self._heap else None
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update({'tracked': len(self._tasks), 'heap_size': len(self._heap),
+                          'horizon': self._horizon, 'seq': self._seq})
+        return stats
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+def get_scheduler(db_name='sales_mobi_2025.db', **options):
+    """db_name 파일에 대한 공유 알림 엔진을 반환합니다. (options는 처음 만들 때만 적용)"""
+    path = os.path.abspath(db_name)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(path)
+        if scheduler is None:
+            scheduler = _schedulers[path] = ReminderScheduler(path, **options)
+        return scheduler
+
+def get_due_reminders(within_days=DEFAULT_WITHIN_DAYS, assignee=None, db_name='sales_mobi_2025.db'):
+    return get_scheduler(db_name).due_reminders(within_days, assignee)
+
+def print_reminders(reminders, within_days=DEFAULT_WITHIN_DAYS):
+    if not reminders:
+        print(f"지연되었거나 {within_days}일 안에 마감인 업무가 없습니다.")
+        return
+    for assignee in sorted(reminders):
+        groups = reminders[assignee]
+        print(f"\n[{assignee}] 지연 {len(groups['overdue'])}건, {within_days}일 내 마감 {len(groups['due_soon'])}건")
+        for task in groups['overdue']:
+            print(f"  ⚠️ {-task['days_left']}일 지남  #{task['id']} {task['due_date']} {task['task_description']} "
+                  f"({task['current_status']})")
+        for task in groups['due_soon']:
+            label = "오늘 마감" if task['days_left'] == 0 else f"D-{task['days_left']}"
+            print(f"  ⏰ {label:<9} #{task['id']} {task['due_date']} {task['task_description']} "
+                  f"({task['current_status']})")
+
+
+# --- CLI 실행 블록 ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="담당자별 지연/마감 임박 업무 알림 목록")
+    parser.add_argument('--db', default='sales_mobi_2025.db', help="대상 데이터베이스 파일")
+    parser.add_argument('--days', type=int, default=DEFAULT_WITHIN_DAYS, help="오늘부터 이 일수 안에 마감인 업무까지 표시")
+    parser.add_argument('--assignee', help="이 담당자의 업무만 표시")
+    args = parser.parse_args(argv)
+
+    setup_database(db_name=args.db)
+    try:
+        reminders = get_due_reminders(args.days, args.assignee, db_name=args.db)
+    except sqlite3.Error as e:
+        print(f"❌ 알림 목록 조회 중 오류 발생: {e}")
+        return 1
+    print_reminders(reminders, args.days)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
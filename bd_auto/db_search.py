@@ -0,0 +1,86 @@
+from db_setup import db_connection
+
+# trigram 토크나이저는 3글자 이상인 검색어만 색인으로 찾을 수 있습니다.
+# 그보다 짧은 검색어(예: '삼성')는 LIKE 조건으로 보완합니다.
+MIN_MATCH_LENGTH = 3
+
+# 검색 대상: 종류 -> (FTS 테이블, 색인 컬럼, 결과 제목으로 쓸 SQL 식)
+SEARCH_TARGETS = {
+    'task': ('tasks_fts', ['task_description'], "task_description"),
+    'contact': ('contacts_fts', ['person_name', 'company_name', 'notes'], "person_name || ' (' || company_name || ')'"),
+    'project': ('projects_fts', ['name'], "name"),
+}
+
+def _split_terms(query):
+    """검색어를 공백 기준으로 나누어 (FTS MATCH용 긴 단어, LIKE용 짧은 단어)로 분류합니다."""
+    terms = [t for t in query.split() if t]
+    long_terms = [t for t in terms if len(t) >= MIN_MATCH_LENGTH]
+    short_terms = [t for t in terms if len(t) < MIN_MATCH_LENGTH]
+    return long_terms, short_terms
+
+def _match_expression(terms):
+    """각 단어를 큰따옴표로 감싼 구문으로 만들어 AND로 연결합니다. (FTS 연산자/특수문자 무시)"""
+    return " AND ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+def _escape_like(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _target_select(kind, long_terms, short_terms, schema=None):
+    fts, columns, title = SEARCH_TARGETS[kind]
+    clauses, params = [], []
+    if long_terms:
+        clauses.append(f"{fts} MATCH ?")
+        params.append(_match_expression(long_terms))
+        score = f"bm25({fts})"
+        snippet = f"snippet({fts}, -1, '[', ']', '…', 12)"
+    else:
+        # MATCH 없이 LIKE만 쓰는 경우에는 순위 점수와 하이라이트를 만들 수 없습니다.
+        score = "0.0"
+        snippet = f"substr({columns[0]}, 1, 60)"
+    for term in short_terms:
+        clauses.append("(" + " OR ".join(f"{c} LIKE ? ESCAPE '\\'" for c in columns) + ")")
+        params.extend([f"%{_escape_like(term)}%"] * len(columns))
+    # ATTACH한 DB(schema)를 조회할 때도 MATCH/bm25가 같은 이름을 가리키도록 별칭을 붙입니다.
+    source = f"{schema}.{fts} AS {fts}" if schema else fts
+    sql = (f"SELECT '{kind}' AS kind, rowid AS id, {title} AS title, {snippet} AS snippet, {score} AS score "
+           f"FROM {source} WHERE {' AND '.join(clauses)}")
+    return sql, params
+
+def build_search_sql(query, kinds=None, schema=None):
+    """
+    search()가 실행하는 (SQL, 파라미터)를 반환합니다. 검색어가 비어 있으면 None입니다.
+    결과는 score, kind, id 순으로 정렬되며 LIMIT/OFFSET은 붙이지 않습니다.
+    schema를 주면 ATTACH한 DB의 색인을 조회합니다. (db_federation 참고)
+    """
+    long_terms, short_terms = _split_terms(query)
+    if not long_terms and not short_terms:
+        return None
+    selects, params = [], []
+    for kind in kinds or list(SEARCH_TARGETS):
+        sql, kind_params = _target_select(kind, long_terms, short_terms, schema)
+        selects.append(sql)
+        params.extend(kind_params)
+    return " UNION ALL ".join(selects) + " ORDER BY score, kind, id", params
+
+def search(query, kinds=None, limit=20, offset=0, db_name='sales_mobi_2025.db'):
+    """
+    업무 내용, 연락처(이름/회사/특이사항), 프로젝트명을 전문 검색합니다.
+    결과는 관련도(bm25, 낮을수록 관련도 높음) 순으로 정렬된 딕셔너리 목록이며,
+    limit/offset으로 페이지를 나눕니다.
+    각 항목: {'kind': 'task'|'contact'|'project', 'id', 'title', 'snippet', 'score'}
+    """
+    built = build_search_sql(query, kinds)
+    if built is None:
+        return []
+    sql, params = built
+
+    with db_connection(db_name) as conn:
+        rows = conn.execute(sql + " LIMIT ? OFFSET ?", params + [limit, offset]).fetchall()
+    return [dict(row) for row in rows]
+
+def rebuild_search_index(db_name='sales_mobi_2025.db'):
+    """트리거를 거치지 않고 변경된 데이터가 있을 때 전문 검색 색인을 처음부터 다시 만듭니다."""
+    with db_connection(db_name) as conn:
+        for fts, _, _ in SEARCH_TARGETS.values():
+            conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+        conn.commit()
@@ -1,106 +1,114 @@
 import sqlite3
+import db_pool
+import db_migrations
 
-def get_db_connection(db_name='sales_mobi_2025.db'):
-    """데이터베이스 연결을 생성하고 커넥션 객체를 반환합니다."""
-    # (실제 환경에서는 db_name을 설정 파일에서 가져오는 것이 좋습니다)
-    conn = sqlite3.connect(db_name)
-    # 외래 키 제약 조건을 활성화합니다.
-    conn.execute("PRAGMA foreign_keys = ON;")
-    # 결과를 딕셔너리처럼 사용할 수 있도록 row_factory를 설정합니다.
-    conn.row_factory = sqlite3.Row
-    return conn
+def db_connection(db_name='sales_mobi_2025.db'):
+    """
+    공유 커넥션 풀에서 커넥션을 빌려주는 컨텍스트 매니저를 반환합니다.
+    PRAGMA foreign_keys와 row_factory는 커넥션을 처음 열 때 한 번만 설정됩니다.
+    사용 예: with db_connection() as conn: ...
+    """
+    return db_pool.db_connection(db_name)
 
 def setup_database(db_name='sales_mobi_2025.db'):
     """
     모든 테이블(contacts, categories, tasks, projects 등)의 스키마를 정의하고 생성합니다.
     이 함수는 프로그램 시작 시 한 번만 호출됩니다.
+    이미 최신 스키마(PRAGMA user_version == SCHEMA_VERSION)라면 아무것도 하지 않고 바로 돌아갑니다.
     """
-    print("데이터베이스 설정 확인 및 초기화 시작...")
     try:
-        conn = get_db_connection(db_name)
-        cursor = conn.cursor()
+        with db_connection(db_name) as conn:
+            # user_version은 모든 테이블을 만든 뒤 마이그레이션이 끝나야 올라가므로, 같으면 확인할 것이 없습니다.
+            if db_migrations.get_schema_version(conn) == db_migrations.SCHEMA_VERSION:
+                return
+            print("데이터베이스 설정 확인 및 초기화 시작...")
+            cursor = conn.cursor()
 
-        # 1. 연락처 테이블 (contacts)
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS contacts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            person_name TEXT NOT NULL,
-            company_name TEXT NOT NULL,
-            email TEXT UNIQUE,
-            phone TEXT,
-            age INTEGER,
-            department TEXT,
-            position TEXT,
-            notes TEXT
-        )
-        ''')
+            # 0. 지운 행의 빈 페이지를 PRAGMA incremental_vacuum으로 조금씩 회수할 수 있도록 합니다.
+            #    (테이블이 없는 새 파일에만 바로 적용되며, 기존 파일은 db_archive가 VACUUM으로 전환합니다)
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
 
-        # 2. 카테고리 테이블 (categories)
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE
-        )
-        ''')
+            # 1. 연락처 테이블 (contacts)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS contacts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                person_name TEXT NOT NULL,
+                company_name TEXT NOT NULL,
+                email TEXT UNIQUE,
+                phone TEXT,
+                age INTEGER,
+                department TEXT,
+                position TEXT,
+                notes TEXT
+            )
+            ''')
+
+            # 2. 카테고리 테이블 (categories)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS categories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE
+            )
+            ''')
         
-        # 3. 프로젝트 테이블 (projects)
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS projects (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE,
-            start_date TEXT,
-            end_date TEXT
-        )
-        ''')
+            # 3. 프로젝트 테이블 (projects)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS projects (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                start_date TEXT,
+                end_date TEXT
+            )
+            ''')
 
-        # 4. 업무 테이블 (tasks) - 다른 테이블을 참조하는 외래 키 포함
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            task_date TEXT NOT NULL,
-            task_description TEXT NOT NULL,
-            current_status TEXT NOT NULL DEFAULT 'To Do',
-            due_date TEXT,
-            assignee TEXT NOT NULL,
-            contact_id INTEGER,
-            category_id INTEGER,
-            project_id INTEGER,
-            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (contact_id) REFERENCES contacts (id) ON DELETE SET NULL,
-            FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE SET NULL,
-            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE SET NULL
-        )
-        ''')
+            # 4. 업무 테이블 (tasks) - 다른 테이블을 참조하는 외래 키 포함
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_date TEXT NOT NULL,
+                task_description TEXT NOT NULL,
+                current_status TEXT NOT NULL DEFAULT 'To Do',
+                due_date TEXT,
+                assignee TEXT NOT NULL,
+                contact_id INTEGER,
+                category_id INTEGER,
+                project_id INTEGER,
+                created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (contact_id) REFERENCES contacts (id) ON DELETE SET NULL,
+                FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE SET NULL,
+                FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE SET NULL
+            )
+            ''')
         
-        # 5. 프로젝트-참가자 연결 테이블 (다대다 관계)
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS project_participants (
-            project_id INTEGER,
-            contact_id INTEGER,
-            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE,
-            FOREIGN KEY (contact_id) REFERENCES contacts (id) ON DELETE CASCADE,
-            PRIMARY KEY (project_id, contact_id)
-        )
-        ''')
+            # 5. 프로젝트-참가자 연결 테이블 (다대다 관계)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS project_participants (
+                project_id INTEGER,
+                contact_id INTEGER,
+                FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE,
+                FOREIGN KEY (contact_id) REFERENCES contacts (id) ON DELETE CASCADE,
+                PRIMARY KEY (project_id, contact_id)
+            )
+            ''')
         
-        # 6. 프로젝트-기술 연결 테이블 (다대다 관계)
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS project_technologies (
-            project_id INTEGER,
-            technology_name TEXT,
-            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE,
-            PRIMARY KEY (project_id, technology_name)
-        )
-        ''')
+            # 6. 프로젝트-기술 연결 테이블 (다대다 관계)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS project_technologies (
+                project_id INTEGER,
+                technology_name TEXT,
+                FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE,
+                PRIMARY KEY (project_id, technology_name)
+            )
+            ''')
+
+            conn.commit()
 
-        conn.commit()
-        print("데이터베이스 스키마가 성공적으로 준비되었습니다.")
+            # 7. 버전별 마이그레이션 (보조 인덱스 등) 적용
+            db_migrations.apply_migrations(conn)
+            print("데이터베이스 스키마가 성공적으로 준비되었습니다.")
     except sqlite3.Error as e:
         print(f"데이터베이스 설정 중 오류 발생: {e}")
-    finally:
-        if 'conn' in locals() and conn:
-            conn.close()
 
 if __name__ == '__main__':
     setup_database(db_name='sales_mobi_2025.db')
\ No newline at end of file
@@ -0,0 +1,207 @@
+import sqlite3
+import os
+import time
+import tempfile
+import threading
+import atexit
+from contextlib import contextmanager
+
+# backup() 한 단계에서 복사할 페이지 수. 단계 사이에는 원본 잠금이 풀리므로 쓰기 작업이 끼어들 수 있습니다.
+DEFAULT_PAGES_PER_STEP = 256
+# 단계 사이에 쉬는 시간(초)
+DEFAULT_STEP_SLEEP = 0.0
+# 나누어 복사하는 도중 원본이 바뀌면 backup()은 처음부터 다시 복사합니다.
+# 이 횟수만큼 다시 시작되면 나누어 복사하기를 포기하고 한 번에(pages=-1) 복사합니다.
+MAX_BACKUP_RESTARTS = 3
+# 스냅샷이 이보다 오래되면 다음 조회 때 새로 복사합니다. (None이면 직접 refresh()할 때만 갱신)
+DEFAULT_MAX_AGE = 60.0
+
+
+class _BackupRestarted(Exception):
+    """나누어 복사하기가 MAX_BACKUP_RESTARTS번 다시 시작되었을 때 backup()을 멈추는 데 씁니다."""
+
+
+class ReportingSnapshot:
+    """
+    리포트용 조회를 위해 DB 전체를 메모리(또는 임시 파일) 복제본으로 복사해 두는 클래스입니다.
+    - sqlite3의 Connection.backup()으로 pages_per_step 페이지씩 나누어 복사하므로,
+      원본 파일은 한 단계 동안만 잠기고 그 사이사이에 대화형 쓰기 작업이 진행될 수 있습니다.
+      (WAL 모드라면 복사 중에도 쓰기가 막히지 않습니다)
+      단, 단계 사이에 다른 커넥션이 쓰면 SQLite는 복사를 처음부터 다시 시작하므로 쓰기가 잦으면 끝나지 않을 수 있습니다.
+      그래서 MAX_BACKUP_RESTARTS번 다시 시작되면 원본을 잠근 채 한 번에 복사합니다. (stats['restarts'], stats['fallbacks'])
+    - 새 복제본을 다 만든 뒤에 교체하므로, 갱신 중에도 조회는 이전 복제본으로 계속됩니다.
+    - 복제본은 읽기 전용(query_only)이며, 조회는 잠금으로 한 번에 하나씩 처리합니다.
+    - max_age가 지나면 다음 조회 때 갱신하고, start()로 주기적인 백그라운드 갱신도 할 수 있습니다.
+
+    사용 예:
+        snapshot = get_snapshot()
+        with snapshot.connection() as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()
+    """
+
+    def __init__(self, db_name='sales_mobi_2025.db', use_temp_file=False,
+                 pages_per_step=DEFAULT_PAGES_PER_STEP, step_sleep=DEFAULT_STEP_SLEEP,
+                 max_age=DEFAULT_MAX_AGE):
+        self.db_path = os.path.abspath(db_name)
+        self.use_temp_file = use_temp_file
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.max_age = max_age
+
+        self._replica = None
+        self._replica_file = None
+        self._refreshed_at = None
+        self._read_lock = threading.RLock()     # 복제본 조회/교체
+        self._refresh_lock = threading.Lock()   # 동시에 하나의 갱신만 실행
+        self._timer = None
+        self._stop = threading.Event()
+        self.stats = {'refreshes': 0, 'pages': 0, 'steps': 0, 'restarts': 0, 'fallbacks': 0,
+                      'last_duration': 0.0, 'reads': 0}
+
+    # --- 복제본 만들기 ---
+    def _new_replica(self):
+        if not self.use_temp_file:
+            return sqlite3.connect(':memory:', check_same_thread=False), None
+        fd, path = tempfile.mkstemp(prefix='report_snapshot_', suffix='.db')
+        os.close(fd)
+        return sqlite3.connect(path, check_same_thread=False), path
+
+    def refresh(self):
+        """원본 DB를 새 복제본으로 복사한 뒤 교체합니다. 걸린 시간(초)을 반환합니다."""
+        with self._refresh_lock:
+            started = time.perf_counter()
+            steps = restarts = 0
+            last_remaining = None
+
+            def progress(status, remaining, total):
+                nonlocal steps, restarts, last_remaining
+                steps += 1
+                # 정상적으로 진행하면 남은 페이지 수가 줄어듭니다. 줄지 않았다면 원본이 바뀌어 처음부터 다시 복사한 것입니다.
+                if last_remaining is not None and remaining >= last_remaining:
+                    restarts += 1
+                    if restarts >= MAX_BACKUP_RESTARTS:
+                        raise _BackupRestarted()
+                last_remaining = remaining
+
+            replica, replica_file = self._new_replica()
+            source = sqlite3.connect(self.db_path, timeout=10.0)
+            try:
+                try:
+                    source.backup(replica, pages=self.pages_per_step, progress=progress, sleep=self.step_sleep)
+                except _BackupRestarted:
+                    source.backup(replica, pages=-1)
+                    steps += 1
+                    self.stats['fallbacks'] += 1
+                page_count = replica.execute("PRAGMA page_count").fetchone()[0]
+            except sqlite3.Error:
+                replica.close()
+                if replica_file:
+                    os.remove(replica_file)
+                raise
+            finally:
+                source.close()
+            replica.row_factory = sqlite3.Row
+            replica.execute("PRAGMA query_only = ON")
+
+            with self._read_lock:
+                old, old_file = self._replica, self._replica_file
+                self._replica, self._replica_file = replica, replica_file
+                self._refreshed_at = time.monotonic()
+            if old is not None:
+                old.close()
+            if old_file:
+                os.remove(old_file)
+
+            elapsed = time.perf_counter() - started
+            self.stats['refreshes'] += 1
+            self.stats['pages'] = page_count
+            self.stats['steps'] = steps
+            self.stats['restarts'] += restarts
+            self.stats['last_duration'] = elapsed
+            return elapsed
+
+    def age(self):
+        """마지막 갱신 후 지난 시간(초). 아직 복사하지 않았다면 None."""
+        if self._refreshed_at is None:
+            return None
+        return time.monotonic() - self._refreshed_at
+
+    # --- 조회 ---
+    @contextmanager
+    def connection(self, max_age=None):
+        """
+        읽기 전용 복제본 커넥션을 빌려줍니다. 블록이 끝날 때까지 다른 조회는 기다립니다.
+        복제본이 없거나 max_age(지정하지 않으면 self.max_age)보다 오래되었으면 먼저 갱신합니다.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        age = self.age()
+        if age is None or (max_age is not None and age > max_age):
+            self.refresh()
+        with self._read_lock:
+            self.stats['reads'] += 1
+            try:
+                yield self._replica
+            finally:
+                if self._replica.in_transaction:
+                    self._replica.rollback()
+
+    # --- 주기적 갱신 ---
+    def start(self, interval):
+        """interval초마다 백그라운드 스레드에서 갱신합니다."""
+        if self._timer is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except sqlite3.Error as e:
+                    print(f"⚠️ 리포트 스냅샷 갱신 실패: {e}")
+
+        self._timer = threading.Thread(target=run, name="report-snapshot", daemon=True)
+        self._timer.start()
+
+    def stop(self):
+        if self._timer is not None:
+            self._stop.set()
+            self._timer.join()
+            self._timer = None
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['age'] = self.age()
+        return stats
+
+    def close(self):
+        self.stop()
+        with self._read_lock:
+            if self._replica is not None:
+                self._replica.close()
+                self._replica = None
+            if self._replica_file:
+                os.remove(self._replica_file)
+                self._replica_file = None
+            self._refreshed_at = None
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+def get_snapshot(db_name='sales_mobi_2025.db', **options):
+    """db_name 파일에 대한 공유 리포트 스냅샷을 반환합니다. (options는 처음 만들 때만 적용)"""
+    path = os.path.abspath(db_name)
+    with _snapshots_lock:
+        snapshot = _snapshots.get(path)
+        if snapshot is None:
+            snapshot = _snapshots[path] = ReportingSnapshot(path, **options)
+        return snapshot
+
+def close_all_snapshots():
+    with _snapshots_lock:
+        for snapshot in _snapshots.values():
+            snapshot.close()
+        _snapshots.clear()
+
+# 임시 파일 복제본이 남지 않도록 종료 시 정리합니다.
+atexit.register(close_all_snapshots)
@@ -0,0 +1,311 @@
+import sqlite3
+import os
+import re
+import sys
+import time
+import logging
+import threading
+import contextlib
+
+import db_pool
+
+# 진행 핸들러를 호출하는 VM 명령어 간격 (값이 작을수록 정확하지만 느려집니다)
+PROGRESS_INTERVAL = 1000
+
+_config = {
+    'enabled': False,
+    'slow_ms': 100.0,
+    'log_file': None,   # (경로, max_bytes, backup_count)
+    'log_params': False,  # True면 로그에 파라미터 값이 바인딩된 SQL을 남깁니다 (개인정보가 포함될 수 있음)
+}
+_stats = {}
+_stats_lock = threading.Lock()
+
+# 느린 쿼리와 DB 오류를 기록하는 로거입니다. 회전 로그 파일은 처음 기록할 때 연결합니다.
+logger = logging.getLogger('bd_auto.db_trace')
+logger.propagate = False
+_handler = None
+_handler_lock = threading.Lock()
+
+# 호출 함수를 찾을 때 건너뛸 파일 (추적/풀 내부 코드)
+_SKIP_FILES = {os.path.abspath(__file__), os.path.abspath(db_pool.__file__), os.path.abspath(contextlib.__file__)}
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(sql):
+    """통계 집계용으로 공백을 정리한 SQL을 반환합니다."""
+    return _WHITESPACE.sub(" ", sql).strip()
+
+def _caller():
+    """추적 코드 바깥에서 쿼리를 실행한 함수를 '파일:함수:줄' 형태로 반환합니다."""
+    frame = sys._getframe(1)
+    while frame is not None and os.path.abspath(frame.f_code.co_filename) in _SKIP_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}:{frame.f_lineno}"
+
+def _log_sql(key, expanded_sql, param_count):
+    """로그에 남길 SQL입니다. 기본값은 파라미터 값 없이 SQL 원문과 파라미터 개수만 남깁니다."""
+    if _config['log_params'] and expanded_sql:
+        return expanded_sql
+    if param_count is None:
+        return f"{key} (executemany)"
+    return f"{key} (파라미터 {param_count}개)"
+
+def _record(sql, expanded_sql, elapsed, rows, caller, vm_steps, param_count=None, error=None):
+    key = _normalize(sql)
+    elapsed_ms = elapsed * 1000
+    with _stats_lock:
+        entry = _stats.get(key)
+        if entry is None:
+            entry = _stats[key] = {
+                'sql': key, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                'rows': 0, 'vm_steps': 0, 'errors': 0, 'callers': set(),
+            }
+        entry['count'] += 1
+        entry['total_ms'] += elapsed_ms
+        entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+        entry['rows'] += rows
+        entry['vm_steps'] += vm_steps
+        entry['callers'].add(caller)
+        if error is not None:
+            entry['errors'] += 1
+
+    if error is not None:
+        _open_log_file()
+        logger.error("DB 오류 %s | %s | %s", error, caller, _log_sql(key, expanded_sql, param_count))
+    elif elapsed_ms >= _config['slow_ms']:
+        _open_log_file()
+        logger.warning("느린 쿼리 %.1fms | 행 %d | VM %d | %s | %s",
+                       elapsed_ms, rows, vm_steps, caller, _log_sql(key, expanded_sql, param_count))
+
+def _open_log_file():
+    """
+    enable()에서 지정한 회전 로그 파일 핸들러를 처음 기록할 때 엽니다.
+    logging.handlers는 socket/pickle까지 불러오므로, 기록할 일이 없는 실행에서는 import하지 않습니다.
+    """
+    global _handler
+    if _handler is not None or _config['log_file'] is None:
+        return
+    with _handler_lock:
+        if _handler is None and _config['log_file'] is not None:
+            from logging.handlers import RotatingFileHandler
+            log_path, max_bytes, backup_count = _config['log_file']
+            handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+            logger.addHandler(handler)
+            _handler = handler
+
+
+class TracingCursor(sqlite3.Cursor):
+    """
+    execute/executemany와 fetch 계열 메서드의 시간을 재는 커서입니다.
+    한 문장의 시간은 실행부터 결과를 다 읽을 때까지(또는 다음 실행, 커서를 닫거나 버릴 때까지)를 합산합니다.
+    conn.execute(...).fetchone()처럼 결과를 끝까지 읽지 않는 조회는 커서가 사라질 때 기록됩니다.
+    """
+
+    _pending = None
+
+    def _start(self, sql, param_count):
+        self._finish()
+        conn = self.connection
+        conn._trace_sql = None
+        self._pending = {
+            'sql': sql, 'params': param_count, 'caller': _caller(), 'elapsed': 0.0, 'rows': 0,
+            'ticks': getattr(conn, '_progress_ticks', 0),
+        }
+
+    def _finish(self, error=None):
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        conn = self.connection
+        rows = pending['rows']
+        if self.description is None and self.rowcount > 0:
+            rows = self.rowcount
+        vm_steps = (getattr(conn, '_progress_ticks', 0) - pending['ticks']) * PROGRESS_INTERVAL
+        _record(pending['sql'], getattr(conn, '_trace_sql', None), pending['elapsed'], rows,
+                pending['caller'], vm_steps, pending['params'], error)
+
+    def _run(self, method, sql, parameters, param_count):
+        if not _config['enabled']:
+            return method(sql, parameters)
+        self._start(sql, param_count)
+        started = time.perf_counter()
+        try:
+            method(sql, parameters)
+        except sqlite3.Error as e:
+            self._pending['elapsed'] += time.perf_counter() - started
+            self._finish(error=e)
+            raise
+        self._pending['elapsed'] += time.perf_counter() - started
+        if self.description is None:
+            # 결과 행이 없는 문장(INSERT/UPDATE 등)은 바로 기록합니다.
+            self._finish()
+        return self
+
+    def _timed_fetch(self, method, *args):
+        pending = self._pending
+        if pending is None:
+            return method(*args)
+        started = time.perf_counter()
+        try:
+            result = method(*args)
+        finally:
+            pending['elapsed'] += time.perf_counter() - started
+        return result
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters, len(parameters))
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(super().executemany, sql, seq_of_parameters, None)
+
+    def fetchone(self):
+        row = self._timed_fetch(super().fetchone)
+        if self._pending is not None:
+            if row is None:
+                self._finish()
+            else:
+                self._pending['rows'] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed_fetch(super().fetchmany, self.arraysize if size is None else size)
+        if self._pending is not None:
+            self._pending['rows'] += len(rows)
+            if len(rows) < (self.arraysize if size is None else size):
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed_fetch(super().fetchall)
+        if self._pending is not None:
+            self._pending['rows'] += len(rows)
+            self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed_fetch(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._pending is not None:
+            self._pending['rows'] += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        if self._pending is not None:
+            try:
+                self._finish()
+            except Exception:
+                # 커넥션이 이미 닫혔거나 인터프리터 종료 중이면 기록하지 않습니다.
+                pass
+
+
+class TracingConnection(sqlite3.Connection):
+    """모든 커서를 TracingCursor로 만드는 커넥션입니다. conn.execute 단축 메서드도 추적됩니다."""
+
+    def cursor(self, factory=TracingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def instrument(conn):
+    """
+    커넥션에 trace 콜백과 progress 핸들러를 설치합니다.
+    - trace 콜백: 파라미터가 바인딩된 실제 SQL을 느린 쿼리 로그에 남기기 위해 사용합니다. (log_params=True일 때만)
+    - progress 핸들러: 문장별로 실행한 VM 명령어 수(대략값)를 셉니다.
+    """
+    conn._trace_sql = None
+    conn._progress_ticks = 0
+
+    def on_trace(statement):
+        # sqlite3 모듈이 암묵적으로 보내는 BEGIN과 트리거 안의 문장('-- TRIGGER')은 건너뛰고
+        # 처음 실행된 최상위 문장만 남깁니다.
+        if conn._trace_sql is None and not statement.lstrip().upper().startswith(('BEGIN', '--')):
+            conn._trace_sql = statement
+
+    def on_progress():
+        conn._progress_ticks += 1
+        return 0
+
+    if _config['log_params']:
+        conn.set_trace_callback(on_trace)
+    conn.set_progress_handler(on_progress, PROGRESS_INTERVAL)
+
+
+# --- 공개 API ---
+def enable(slow_ms=100.0, log_path='slow_queries.log', max_bytes=1_000_000, backup_count=5, log_params=False):
+    """
+    쿼리 추적을 켭니다. 커넥션 풀의 커넥션 팩토리를 추적용 커넥션으로 바꾸므로 호출하기 전에는 아무 비용이 없고,
+    이후 커넥션 풀이 새로 여는 커넥션부터 적용되며, 이미 열려 있던 풀 커넥션은 닫고 다시 열도록 합니다.
+    slow_ms 이상 걸린 쿼리와 DB 오류는 log_path의 회전 로그 파일에 기록됩니다.
+    로그에는 SQL 원문과 파라미터 개수만 남기며, 값까지 남기려면 log_params=True로 켭니다.
+    """
+    _config['slow_ms'] = slow_ms
+    _config['log_params'] = log_params
+    _config['enabled'] = True
+    if _handler is None and log_path:
+        _config['log_file'] = (log_path, max_bytes, backup_count)
+        logger.setLevel(logging.WARNING)
+    db_pool.set_connection_factory(TracingConnection)
+    db_pool.add_connect_hook(instrument)
+    db_pool.close_all_pools()
+
+def disable():
+    """쿼리 추적을 끕니다. 이미 모은 통계는 reset_stats()로 지울 수 있습니다."""
+    global _handler
+    _config['enabled'] = False
+    _config['log_file'] = None
+    _config['log_params'] = False
+    db_pool.set_connection_factory(None)
+    db_pool.remove_connect_hook(instrument)
+    if _handler is not None:
+        logger.removeHandler(_handler)
+        _handler.close()
+        _handler = None
+    db_pool.close_all_pools()
+
+def is_enabled():
+    return _config['enabled']
+
+def set_slow_query_threshold(slow_ms):
+    _config['slow_ms'] = slow_ms
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+def get_top_statements(n=10, order_by='total_ms'):
+    """누적 실행 시간(또는 order_by로 지정한 항목) 기준 상위 n개 문장의 통계를 반환합니다."""
+    with _stats_lock:
+        entries = [dict(entry, callers=sorted(entry['callers'])) for entry in _stats.values()]
+    for entry in entries:
+        entry['avg_ms'] = entry['total_ms'] / entry['count'] if entry['count'] else 0.0
+    entries.sort(key=lambda e: e[order_by], reverse=True)
+    return entries[:n]
+
+def print_top_statements(n=10, order_by='total_ms'):
+    entries = get_top_statements(n, order_by)
+    print(f"\n=== 쿼리 통계 (상위 {n}개, 기준: {order_by}) ===")
+    if not entries:
+        print("기록된 쿼리가 없습니다.")
+        return
+    for i, e in enumerate(entries, 1):
+        sql = e['sql'] if len(e['sql']) <= 100 else e['sql'][:97] + "..."
+        print(f"{i:2}. 총 {e['total_ms']:.1f}ms | {e['count']}회 | 평균 {e['avg_ms']:.2f}ms | "
+              f"최대 {e['max_ms']:.2f}ms | 행 {e['rows']} | 오류 {e['errors']}")
+        print(f"    {sql}")
+        print(f"    호출: {', '.join(e['callers'][:3])}{' ...' if len(e['callers']) > 3 else ''}")
@@ -1,22 +1,45 @@
 import sqlite3
 import os
-from typing import List, Tuple, Any, Optional
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
+from typing import List, Tuple, Any, Optional, Iterable, Iterator, Dict, Sequence
+
+def quote_identifier(name: str) -> str:
+    """Quote a table/column name for use in SQL ("my col" -> \"my col\")"""
+    return '"' + name.replace('"', '""') + '"'
 
 class SQLiteTutorial:
-    def __init__(self, db_name: str = "tutorial.db"):
+    def __init__(self, db_name: str = "tutorial.db", statement_cache_size: int = 128):
         """
         Initialize SQLite database connection
         Args:
             db_name: Name of the database file
+            statement_cache_size: Size of both the generated-SQL LRU cache and
+                sqlite3's prepared statement cache (cached_statements)
         """
         self.db_name = db_name
         self.conn = None
         self.cursor = None
+        # Statement builder state, see _statement()
+        self.cached_statements = statement_cache_size
+        self._sql_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._sql_cache_hits = 0
+        self._sql_cache_misses = 0
+        self._table_columns: Dict[str, Dict[str, str]] = {}
+        # Batch (unit-of-work) state, see batch()
+        self.quiet = False
+        self._batch_depth = 0
+        self._pending = 0
+        self._flush_every = None
+        self._flush_interval = None
+        self._last_flush = 0.0
     
     def connect(self):
         """Establish connection to SQLite database"""
         try:
-            self.conn = sqlite3.connect(self.db_name)
+            self.conn = sqlite3.connect(self.db_name, cached_statements=self.cached_statements)
             self.cursor = self.conn.cursor()
             print(f"✅ Successfully connected to {self.db_name}")
         except sqlite3.Error as e:
@@ -28,6 +51,176 @@ class SQLiteTutorial:
             self.conn.close()
             print("✅ Database connection closed")
     
+    def _log(self, message: str):
+        """Print a success message unless per-call printing is silenced (errors are always printed)"""
+        if not self.quiet:
+            print(message)
+    
+    def _commit(self, statements: int = 1):
+        """
+        Commit after a write, or defer the commit while a batch is open
+        Args:
+            statements: Number of statements/rows the write counted for
+        """
+        if self._batch_depth == 0:
+            self.conn.commit()
+            return
+        self._pending += statements
+        if self._flush_every and self._pending >= self._flush_every:
+            self.flush()
+        elif (self._flush_interval is not None
+              and (time.monotonic() - self._last_flush) * 1000 >= self._flush_interval):
+            self.flush()
+    
+    def flush(self):
+        """Commit every write deferred by the current batch"""
+        if self.conn:
+            self.conn.commit()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+    
+    def _columns(self, table_name: str) -> Dict[str, str]:
+        """
+        Return the table's columns as {lowercase name: declared name}, cached per table
+        Raises sqlite3.OperationalError for unknown tables
+        """
+        key = table_name.lower()
+        columns = self._table_columns.get(key)
+        if columns is None:
+            rows = self.conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})").fetchall()
+            if not rows:
+                raise sqlite3.OperationalError(f"no such table: {table_name}")
+            columns = {row[1].lower(): row[1] for row in rows}
+            self._table_columns[key] = columns
+        return columns
+    
+    def _canonical_columns(self, table_name: str, columns: Iterable[str], keep_order: bool = False) -> Tuple[str, ...]:
+        """
+        Validate column names against the table and return their declared names,
+        in table order unless keep_order is set
+        Raises sqlite3.OperationalError for unknown columns
+        """
+        table_columns = self._columns(table_name)
+        requested = []
+        for column in columns:
+            declared = table_columns.get(column.lower())
+            if declared is None:
+                raise sqlite3.OperationalError(f"table {table_name} has no column named {column}")
+            requested.append(declared)
+        if keep_order:
+            return tuple(requested)
+        order = list(table_columns.values())
+        return tuple(sorted(requested, key=order.index))
+    
+    def _statement(self, operation: str, table_name: str, columns: Sequence[str] = (), condition: str = "") -> str:
+        """
+        Return the SQL for (operation, table, columns, condition), memoized in a bounded LRU
+        Columns must already be validated; the same column set always yields the same
+        SQL text, so sqlite3 can reuse its prepared statement.
+        """
+        key = (operation, table_name.lower(), tuple(columns), condition)
+        sql = self._sql_cache.get(key)
+        if sql is not None:
+            self._sql_cache_hits += 1
+            self._sql_cache.move_to_end(key)
+            return sql
+        
+        self._sql_cache_misses += 1
+        self._columns(table_name)  # raises for unknown tables
+        table = quote_identifier(table_name)
+        column_list = ', '.join(quote_identifier(c) for c in columns)
+        if operation == "insert":
+            placeholders = ', '.join('?' for _ in columns)
+            sql = f"INSERT INTO {table} ({column_list}) VALUES ({placeholders})"
+        elif operation == "update":
+            set_clause = ', '.join(f"{quote_identifier(c)} = ?" for c in columns)
+            sql = f"UPDATE {table} SET {set_clause} WHERE {condition}"
+        elif operation == "delete":
+            sql = f"DELETE FROM {table} WHERE {condition}"
+        elif operation == "select":
+            sql = f"SELECT * FROM {table}" + (f" WHERE {condition}" if condition else "")
+        else:
+            raise ValueError(f"Unknown statement operation: {operation}")
+        
+        self._sql_cache[key] = sql
+        if len(self._sql_cache) > self.cached_statements:
+            self._sql_cache.popitem(last=False)
+        return sql
+    
+    def invalidate_schema_cache(self, table_name: Optional[str] = None):
+        """Forget cached columns and SQL for one table (or all tables) after a schema change"""
+        if table_name is None:
+            self._table_columns.clear()
+            self._sql_cache.clear()
+            return
+        key = table_name.lower()
+        self._table_columns.pop(key, None)
+        for cached in [k for k in self._sql_cache if k[1] == key]:
+            del self._sql_cache[cached]
+    
+    def get_statement_cache_stats(self) -> Dict[str, Any]:
+        """
+        Return statement builder cache statistics
+        Returns:
+            Dictionary with hits, misses, hit_rate, size, maxsize and the
+            connection's cached_statements setting
+        """
+        lookups = self._sql_cache_hits + self._sql_cache_misses
+        return {
+            'hits': self._sql_cache_hits,
+            'misses': self._sql_cache_misses,
+            'hit_rate': self._sql_cache_hits / lookups if lookups else 0.0,
+            'size': len(self._sql_cache),
+            'maxsize': self.cached_statements,
+            'cached_statements': self.cached_statements,
+        }
+    
+    @contextmanager
+    def batch(self, flush_every: Optional[int] = 1000, flush_interval_ms: Optional[float] = None,
+              quiet: bool = True) -> Iterator["SQLiteTutorial"]:
+        """
+        Unit-of-work context manager: writes inside the block share transactions
+        instead of committing (and fsyncing) one by one
+        Args:
+            flush_every: Commit after this many statements/rows (None = only at the end)
+            flush_interval_ms: Also commit when this many milliseconds passed since the last
+                commit (checked on each write)
+            quiet: Silence the per-call success messages inside the block
+        Usage:
+            with db.batch(flush_every=5000):
+                for row in rows:
+                    db.insert_data("users", row)
+        On normal exit the remaining writes are committed. If the block raises, the writes
+        since the last automatic flush are rolled back; earlier flushes stay committed.
+        Nested batch() calls join the outer batch.
+        """
+        if self._batch_depth > 0:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+        
+        saved_quiet = self.quiet
+        self._batch_depth = 1
+        self._pending = 0
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval_ms
+        self._last_flush = time.monotonic()
+        self.quiet = quiet
+        try:
+            yield self
+        except BaseException:
+            self.conn.rollback()
+            raise
+        else:
+            self.flush()
+        finally:
+            self._batch_depth = 0
+            self._pending = 0
+            self.quiet = saved_quiet
+    
     def create_table(self, table_name: str, columns: str):
         """
         Create a new table
@@ -36,10 +229,11 @@ class SQLiteTutorial:
             columns: SQL column definitions (e.g., "id INTEGER PRIMARY KEY, name TEXT")
         """
         try:
-            query = f"CREATE TABLE IF NOT EXISTS {table_name} ({columns})"
+            query = f"CREATE TABLE IF NOT EXISTS {quote_identifier(table_name)} ({columns})"
             self.cursor.execute(query)
-            self.conn.commit()
-            print(f"✅ Table '{table_name}' created successfully")
+            self.invalidate_schema_cache(table_name)
+            self._commit()
+            self._log(f"✅ Table '{table_name}' created successfully")
         except sqlite3.Error as e:
             print(f"❌ Error creating table: {e}")
     
@@ -51,34 +245,54 @@ class SQLiteTutorial:
             data: Dictionary with column names as keys and values as values
         """
         try:
-            columns = ', '.join(data.keys())
-            placeholders = ', '.join(['?' for _ in data])
-            query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+            columns = self._canonical_columns(table_name, data)
+            values = {key.lower(): value for key, value in data.items()}
+            query = self._statement("insert", table_name, columns)
             
-            self.cursor.execute(query, list(data.values()))
-            self.conn.commit()
-            print(f"✅ Data inserted into '{table_name}' successfully")
+            self.cursor.execute(query, [values[c.lower()] for c in columns])
+            self._commit()
+            self._log(f"✅ Data inserted into '{table_name}' successfully")
         except sqlite3.Error as e:
             print(f"❌ Error inserting data: {e}")
     
-    def insert_many(self, table_name: str, columns: List[str], data: List[Tuple]):
+    def insert_many(self, table_name: str, columns: List[str], data: Iterable[Tuple],
+                    chunk_size: int = 1000) -> int:
         """
         Insert multiple rows of data
         Args:
             table_name: Name of the table
             columns: List of column names
-            data: List of tuples containing row data
+            data: Any iterable of row tuples (list, generator, file reader, ...);
+                it is consumed in chunks, so it never has to fit in memory
+            chunk_size: Number of rows passed to executemany() at a time
+        Returns:
+            Number of rows inserted
         """
+        total = 0
         try:
-            columns_str = ', '.join(columns)
-            placeholders = ', '.join(['?' for _ in columns])
-            query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
+            # Row tuples follow the given column order, so validate without reordering
+            query = self._statement("insert", table_name, self._canonical_columns(table_name, columns, keep_order=True))
             
-            self.cursor.executemany(query, data)
-            self.conn.commit()
-            print(f"✅ {len(data)} rows inserted into '{table_name}' successfully")
+            rows = iter(data)
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                self.cursor.executemany(query, chunk)
+                total += len(chunk)
+                # Inside a batch every chunk counts towards the auto-flush threshold
+                if self._batch_depth > 0:
+                    self._commit(len(chunk))
+            if self._batch_depth == 0:
+                self.conn.commit()
+            self._log(f"✅ {total} rows inserted into '{table_name}' successfully")
         except sqlite3.Error as e:
+            # Outside a batch, undo the chunks already written so no transaction is left open
+            if self._batch_depth == 0:
+                self.conn.rollback()
+                total = 0
             print(f"❌ Error inserting multiple rows: {e}")
+        return total
     
     def select_all(self, table_name: str) -> List[Tuple]:
         """
@@ -89,7 +303,7 @@ class SQLiteTutorial:
             List of tuples containing all rows
         """
         try:
-            query = f"SELECT * FROM {table_name}"
+            query = self._statement("select", table_name)
             self.cursor.execute(query)
             results = self.cursor.fetchall()
             print(f"✅ Retrieved {len(results)} rows from '{table_name}'")
@@ -109,7 +323,7 @@ class SQLiteTutorial:
             List of tuples containing matching rows
         """
         try:
-            query = f"SELECT * FROM {table_name} WHERE {condition}"
+            query = self._statement("select", table_name, condition=condition)
             if params:
                 self.cursor.execute(query, params)
             else:
@@ -131,16 +345,17 @@ class SQLiteTutorial:
             params: Parameters for the condition
         """
         try:
-            set_clause = ', '.join([f"{col} = ?" for col in set_values.keys()])
-            query = f"UPDATE {table_name} SET {set_clause} WHERE {condition}"
+            columns = self._canonical_columns(table_name, set_values)
+            values = {key.lower(): value for key, value in set_values.items()}
+            query = self._statement("update", table_name, columns, condition)
             
-            all_params = list(set_values.values())
+            all_params = [values[c.lower()] for c in columns]
             if params:
                 all_params.extend(params)
             
             self.cursor.execute(query, all_params)
-            self.conn.commit()
-            print(f"✅ Data updated in '{table_name}' successfully")
+            self._commit()
+            self._log(f"✅ Data updated in '{table_name}' successfully")
         except sqlite3.Error as e:
             print(f"❌ Error updating data: {e}")
     
@@ -153,13 +368,13 @@ class SQLiteTutorial:
             params: Parameters for the condition
         """
         try:
-            query = f"DELETE FROM {table_name} WHERE {condition}"
+            query = self._statement("delete", table_name, condition=condition)
             if params:
                 self.cursor.execute(query, params)
             else:
                 self.cursor.execute(query)
-            self.conn.commit()
-            print(f"✅ Data deleted from '{table_name}' successfully")
+            self._commit()
+            self._log(f"✅ Data deleted from '{table_name}' successfully")
         except sqlite3.Error as e:
             print(f"❌ Error deleting data: {e}")
     
@@ -170,10 +385,11 @@ class SQLiteTutorial:
             table_name: Name of the table to drop
         """
         try:
-            query = f"DROP TABLE IF EXISTS {table_name}"
+            query = f"DROP TABLE IF EXISTS {quote_identifier(table_name)}"
             self.cursor.execute(query)
-            self.conn.commit()
-            print(f"✅ Table '{table_name}' dropped successfully")
+            self.invalidate_schema_cache(table_name)
+            self._commit()
+            self._log(f"✅ Table '{table_name}' dropped successfully")
         except sqlite3.Error as e:
             print(f"❌ Error dropping table: {e}")
     
@@ -186,7 +402,7 @@ class SQLiteTutorial:
             List of tuples containing column information
         """
         try:
-            query = f"PRAGMA table_info({table_name})"
+            query = f"PRAGMA table_info({quote_identifier(table_name)})"
             self.cursor.execute(query)
             results = self.cursor.fetchall()
             print(f"✅ Retrieved table info for '{table_name}'")
@@ -212,11 +428,14 @@ class SQLiteTutorial:
             
             if query.strip().upper().startswith('SELECT'):
                 results = self.cursor.fetchall()
-                print(f"✅ Custom query executed successfully, returned {len(results)} rows")
+                self._log(f"✅ Custom query executed successfully, returned {len(results)} rows")
                 return results
             else:
-                self.conn.commit()
-                print("✅ Custom query executed successfully")
+                # The query may have changed the schema (ALTER/CREATE/DROP)
+                if query.strip().upper().startswith(('ALTER', 'CREATE', 'DROP')):
+                    self.invalidate_schema_cache()
+                self._commit()
+                self._log("✅ Custom query executed successfully")
                 return []
         except sqlite3.Error as e:
             print(f"❌ Error executing custom query: {e}")
@@ -281,6 +500,23 @@ def main():
     all_users = db.select_all("users")
     print_results(all_users, "All Users")
     
+    # 4-1. Batch mode (unit of work)
+    print("\n" + "="*50)
+    print("4-1. BATCH MODE (UNIT OF WORK)")
+    print("="*50)
+    generated = ((f"Batch User {i}", 20 + i % 40, f"batch{i}@example.com") for i in range(10000))
+    start = time.perf_counter()
+    with db.batch(flush_every=5000):
+        inserted = db.insert_many("users", ["name", "age", "email"], generated)
+        for i in range(1000):
+            db.update_data("users", {"age": 99}, "email = ?", (f"batch{i}@example.com",))
+        db.delete_data("users", "email LIKE ?", ("batch%",))
+    print(f"✅ Inserted {inserted} generated rows, updated and deleted them in "
+          f"{time.perf_counter() - start:.3f}s with a handful of commits")
+    stats = db.get_statement_cache_stats()
+    print(f"✅ Statement cache: {stats['hits']} hits / {stats['misses']} misses "
+          f"(hit rate {stats['hit_rate']:.1%}, cached_statements={stats['cached_statements']})")
+    
     # 5. Select with condition
     print("\n" + "="*50)
     print("5. SELECTING WITH CONDITION")